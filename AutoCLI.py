@@ -0,0 +1,223 @@
+"""
+DogeAutoSub — Headless Batch CLI
+=================================
+Run the subtitle pipeline over files, folders or globs without the GUI
+(no PySide6 import), e.g. on a render node or in a nightly job.
+
+Usage:
+    python AutoCLI.py video.mp4
+    python AutoCLI.py D:/episodes --dst Vietnamese --engine mlaas
+    python AutoCLI.py "D:/episodes/*.mkv" --output D:/subs --model large-v3
+    python AutoCLI.py D:/episodes --recursive --report nightly.json
+    python AutoCLI.py D:/episodes --parallel 3
+
+The faster-whisper model is loaded once and kept warm across all files
+(with --cpu-farm, the worker processes keep theirs warm instead).
+A JSON report with per-file timings is written to --report
+(default: <output folder>/autosub_report.json). Each file also gets a
+<name>.report.json with stage timings, real-time factor and peak memory;
+--telemetry-log appends those to a JSONL file for trends across runs.
+
+With --parallel N, N files run at once through the job queue: one decodes
+while another transcribes and a third translates.
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+from modules.constants import MODEL_TYPES
+from modules.job_queue import JobQueue
+from modules.subtitle_args import SubtitleArgs
+from modules.subtitle_pipeline import PipelineResult, SubtitlePipeline, _lang_code
+
+MEDIA_EXTENSIONS = {
+    ".mp4", ".avi", ".mkv", ".mov", ".webm", ".flv", ".wmv",
+    ".m4a", ".mp3", ".wav", ".flac",
+}
+
+
+def collect_inputs(patterns, recursive: bool = False):
+    """Expand files, directories and glob patterns into a sorted list of media files."""
+    found = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            if recursive:
+                for root, _, files in os.walk(pattern):
+                    found.extend(os.path.join(root, f) for f in files)
+            else:
+                found.extend(os.path.join(pattern, f) for f in os.listdir(pattern))
+        elif os.path.isfile(pattern):
+            found.append(pattern)
+        else:
+            found.extend(glob.glob(pattern, recursive=recursive))
+
+    media = {
+        os.path.abspath(p) for p in found
+        if os.path.isfile(p) and os.path.splitext(p)[1].lower() in MEDIA_EXTENSIONS
+    }
+    return sorted(media)
+
+
+def _keep_model_warm(model_size: str, src_language: str, batched: bool):
+    """Hold a reference to the pooled model so it stays loaded between files."""
+    try:
+        from modules.faster_whisper_engine import FasterWhisperRecognizer
+        src_code = _lang_code(src_language or "Auto", "auto")
+        return FasterWhisperRecognizer(
+            model_size=model_size,
+            language=None if src_code == "auto" else src_code,
+            batched=batched,
+        )
+    except Exception as e:
+        print(f"Warning: Could not preload model: {e}")
+        return None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="DogeAutoSub headless batch subtitle generation")
+    parser.add_argument("inputs", nargs="+", help="Media files, folders or glob patterns")
+    parser.add_argument("--output", default=None, help="Output folder (default: next to each input)")
+    parser.add_argument("--src", default="Auto", help="Source language name or code (default: Auto)")
+    parser.add_argument("--dst", default="English", help="Target language name or code (default: English)")
+    parser.add_argument("--model", default="turbo", choices=MODEL_TYPES, help="Whisper model (default: turbo)")
+    parser.add_argument("--engine", default="google", choices=["mlaas", "google", "marian", "whisper"],
+                        help="Translation engine (default: google)")
+    parser.add_argument("--marian-backend", default="transformers", choices=["transformers", "ctranslate2"],
+                        help="MarianMT backend for --engine marian (default: transformers)")
+    parser.add_argument("--volume", type=int, default=3, help="Audio volume boost (default: 3)")
+    parser.add_argument("--sequential", action="store_true", help="Disable batched inference")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore the transcription cache")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="Ignore job journals of interrupted runs and start from zero")
+    parser.add_argument("--no-stream", action="store_true",
+                        help="Translate after transcription instead of while it runs")
+    parser.add_argument("--multilingual", nargs="?", const="", default=None, metavar="LANGS",
+                        help="Detect the language per chunk for code-switched audio; optionally "
+                             "restrict to LANGS, e.g. vi,en (requires --src Auto)")
+    parser.add_argument("--cpu-farm", nargs="?", type=int, const=0, default=None, metavar="N",
+                        help="Without CUDA: transcribe chunks in N worker processes (default N: one per 4 cores)")
+    parser.add_argument("--parallel", type=int, default=1, metavar="N",
+                        help="Files processed at once with overlapping decode/transcribe/translate stages (default: 1)")
+    parser.add_argument("--recursive", action="store_true", help="Recurse into folders / ** globs")
+    parser.add_argument("--ffmpeg", default=None, help="Path to ffmpeg (default: bundled or PATH)")
+    parser.add_argument("--report", default=None, help="Path of the JSON timing report")
+    parser.add_argument("--no-run-reports", action="store_true",
+                        help="Don't write <name>.report.json (stage timings, RTF, peak memory) next to each SRT")
+    parser.add_argument("--telemetry-log", default=None, metavar="PATH",
+                        help="Append every file's run report to this JSONL log")
+    args = parser.parse_args(argv)
+
+    files = collect_inputs(args.inputs, recursive=args.recursive)
+    if not files:
+        print("No media files found.")
+        return 1
+
+    print(f"\n  DogeAutoSub batch: {len(files)} file(s)\n")
+
+    # CPU farm workers hold their own models; a warm copy here would only cost RAM
+    warm = None if args.cpu_farm is not None else _keep_model_warm(args.model, args.src, not args.sequential)
+    results = []
+    batch_start = time.time()
+
+    def make_job(path: str) -> SubtitleArgs:
+        return SubtitleArgs(
+            source_path=path,
+            output_folder=args.output or os.path.dirname(path),
+            src_language=args.src,
+            dst_language=args.dst,
+            model_size=args.model,
+            translate_engine=args.engine,
+            marian_backend=args.marian_backend,
+            volume=args.volume,
+            batched=not args.sequential,
+            use_cache=not args.no_cache,
+            stream_translation=not args.no_stream,
+            resume=not args.no_resume,
+            multilingual=args.multilingual is not None,
+            language_candidates=args.multilingual or "",
+            cpu_farm=args.cpu_farm is not None,
+            cpu_farm_workers=args.cpu_farm or None,
+            write_report=not args.no_run_reports,
+            telemetry_log=args.telemetry_log or "",
+        )
+
+    try:
+        if args.parallel > 1:
+            queue = JobQueue(persist=False, max_parallel_jobs=args.parallel, ffmpeg_path=args.ffmpeg)
+            for path in files:
+                queue.add(make_job(path))
+            last_stage = {}
+
+            def on_update(job):
+                if job.stage and last_stage.get(job.id) != job.stage:
+                    last_stage[job.id] = job.stage
+                    print(f"  [{job.name}] {job.stage}")
+
+            queue.run(on_update=on_update)
+            results = [job.result for job in queue.jobs() if job.result]
+        else:
+            for i, path in enumerate(files, start=1):
+                print(f"\n[{i}/{len(files)}] {path}")
+                pipeline = SubtitlePipeline(
+                    make_job(path),
+                    status_callback=lambda text: print(f"  {text}"),
+                    ffmpeg_path=args.ffmpeg,
+                )
+                job_start = time.time()
+                try:
+                    result = pipeline.run()
+                except Exception as e:
+                    print(f"  Error: {e}")
+                    result = PipelineResult(source_path=path, error=str(e))
+                    result.total_time = time.time() - job_start
+                results.append(result.to_dict())
+    finally:
+        if warm is not None:
+            warm.close()
+
+    failed = sum(1 for r in results if r["error"])
+    report = {
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(batch_start)),
+        "total_time": round(time.time() - batch_start, 3),
+        "settings": {
+            "model": args.model,
+            "src": args.src,
+            "dst": args.dst,
+            "engine": args.engine,
+            "marian_backend": args.marian_backend,
+            "volume": args.volume,
+            "batched": not args.sequential,
+            "multilingual": args.multilingual,
+            "parallel": args.parallel,
+            "cpu_farm": args.cpu_farm,
+        },
+        "files": results,
+        "succeeded": len(results) - failed,
+        "failed": failed,
+    }
+
+    report_path = args.report or os.path.join(
+        args.output or os.path.dirname(files[0]), "autosub_report.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"\n  Done: {report['succeeded']} succeeded, {failed} failed "
+          f"in {report['total_time']:.1f}s")
+    print(f"  Report: {report_path}\n")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    # CPU farm worker processes re-import this entry point on Windows
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+DogeAutoSub — Per-Machine Calibration
+======================================
+Times a short speech sample with different compute types, beam sizes and
+batch sizes (CUDA) or cpu_threads (CPU), and stores the fastest settings
+whose WER stays within the tolerance in modules/cache/tuning_profile.json.
+FasterWhisperRecognizer picks the profile up automatically.
+
+Use a clip of typical content (a minute of dialogue from the kind of video
+you subtitle); only the first --seconds are used.
+
+Usage:
+    python AutoTune.py --sample clip.mp4
+    python AutoTune.py --sample clip.mp4 --model large-v3 --seconds 90 --tolerance 0.03
+    python AutoTune.py --sample clip.wav --reference clip.txt --language en
+    python AutoTune.py --show
+"""
+
+import argparse
+import json
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+from modules.auto_tune import (
+    DEFAULT_SAMPLE_SECONDS,
+    DEFAULT_WER_TOLERANCE,
+    PROFILE_PATH,
+    AutoTuner,
+    save_tuning_profile,
+)
+from modules.chunk_processor import decode_audio_pcm
+from modules.constants import MODEL_TYPES
+
+FFMPEG_PATH = os.path.join(SCRIPT_DIR, "modules", "ffmpeg", "bin", "ffmpeg.exe")
+
+# Same friendly names as FasterWhisperRecognizer
+MODEL_MAPPING = {"turbo": "large-v3-turbo", "large": "large-v3"}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="DogeAutoSub per-machine transcription calibration")
+    parser.add_argument("--sample", help="Speech sample (any media file ffmpeg can read)")
+    parser.add_argument("--model", default="turbo", choices=MODEL_TYPES, help="Whisper model (default: turbo)")
+    parser.add_argument("--device", default=None, choices=["cuda", "cpu"], help="Device (default: auto)")
+    parser.add_argument("--seconds", type=float, default=DEFAULT_SAMPLE_SECONDS,
+                        help=f"Seconds of the sample to use (default: {DEFAULT_SAMPLE_SECONDS:.0f})")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_WER_TOLERANCE,
+                        help=f"Highest acceptable WER against the reference (default: {DEFAULT_WER_TOLERANCE})")
+    parser.add_argument("--reference", default=None,
+                        help="Text file with the sample's transcript (default: most accurate run)")
+    parser.add_argument("--language", default=None, help="Language code of the sample (default: detect)")
+    parser.add_argument("--volume", default="3", help="Audio volume boost, as in the app (default: 3)")
+    parser.add_argument("--show", action="store_true", help="Print the stored profile and exit")
+    args = parser.parse_args(argv)
+
+    if args.show:
+        if not os.path.exists(PROFILE_PATH):
+            print("No tuning profile yet.")
+            return 0
+        with open(PROFILE_PATH, "r", encoding="utf-8") as f:
+            print(json.dumps(json.load(f), indent=2))
+        return 0
+
+    if not args.sample:
+        parser.error("--sample is required (a minute of typical speech)")
+
+    reference = None
+    if args.reference:
+        with open(args.reference, "r", encoding="utf-8") as f:
+            reference = f.read()
+
+    ffmpeg = FFMPEG_PATH if os.path.exists(FFMPEG_PATH) else "ffmpeg"
+    audio = decode_audio_pcm(args.sample, ffmpeg_path=ffmpeg, volume_boost=args.volume, duration=args.seconds)
+    if len(audio) < 10 * 16000:
+        print("Sample is shorter than 10 seconds; use a longer clip.")
+        return 1
+
+    model_size = MODEL_MAPPING.get(args.model.lower(), args.model)
+    tuner = AutoTuner(model_size, device=args.device, wer_tolerance=args.tolerance)
+    profile = tuner.calibrate(audio, reference_text=reference, language=args.language)
+    if profile is None:
+        print(f"\n  No profile saved for {model_size} ({tuner.device})\n")
+        return 1
+    save_tuning_profile(model_size, tuner.device, profile)
+    print(f"\n  Saved profile for {model_size} ({tuner.device}) to {PROFILE_PATH}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
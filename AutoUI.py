@@ -37,7 +37,8 @@ from modules.subtitle_args import SubtitleArgs
 from modules.mlaas_client import MLAASConfig, translate_segments_mlaas, summarize_text_mlaas, get_masked_key, get_api_key
 from modules.updater import APP_VERSION, check_for_update, download_and_apply_update, restart_app
 
-from modules.subtitle_thread import SubtitleThread, ThroughputTracker, _lang_code
+from modules.subtitle_thread import SubtitleQueueThread, ThroughputTracker, _lang_code
+from modules.job_queue import JobQueue
 from modules.meeting_notes_thread import MeetingNotesThread
 from modules.translate_thread import TranslateFileThread
 
@@ -89,6 +90,7 @@ class DogeAutoSub(ui_DogeAutoSub.Ui_MainWindow, QMainWindow):
         self.setupUi(self)
         
         self.input_file_path = None
+        self.input_file_paths = []
         self.output_folder_path = None
         self.docx_path = None
         self.trans_file_path = None
@@ -97,6 +99,9 @@ class DogeAutoSub(ui_DogeAutoSub.Ui_MainWindow, QMainWindow):
         self.translate_thread = None
         self.current_theme = "Dark"
         
+        # ── Persisted subtitle job queue ────────────────────────
+        self.job_queue = JobQueue(ffmpeg_path=FFMPEG_PATH if os.path.exists(FFMPEG_PATH) else None)
+        
         # ── Set window icon ─────────────────────────────────────
         icon_path = os.path.join(SCRIPT_DIR, "icons", "favicon.png")
         if os.path.exists(icon_path):
@@ -167,6 +172,10 @@ class DogeAutoSub(ui_DogeAutoSub.Ui_MainWindow, QMainWindow):
         from PySide6.QtCore import QTimer
         QTimer.singleShot(2000, self._check_for_updates)
         
+        pending = self.job_queue.pending_count()
+        if pending:
+            self.statusLabel.setText(f"{pending} queued job(s) from last session — press Start to resume")
+        
         print(f"DogeAutoSub v{APP_VERSION} initialized successfully")
     
     # ── Dropdown Setup ──────────────────────────────────────────
@@ -235,13 +244,18 @@ class DogeAutoSub(ui_DogeAutoSub.Ui_MainWindow, QMainWindow):
     # ── File Selection ──────────────────────────────────────────
     
     def _select_input_file(self):
-        path, _ = QFileDialog.getOpenFileName(
-            self, "Select Video File", "",
+        paths, _ = QFileDialog.getOpenFileNames(
+            self, "Select Video Files", "",
             "Media Files (*.mp4 *.avi *.mkv *.mov *.webm *.flv *.wmv *.m4a *.mp3 *.wav *.flac)"
         )
-        if path:
+        if paths:
+            path = paths[0]
             self.input_file_path = path
-            self.selectFileBtn.setText(f"🎬  {os.path.basename(path)}")
+            self.input_file_paths = paths
+            if len(paths) == 1:
+                self.selectFileBtn.setText(f"🎬  {os.path.basename(path)}")
+            else:
+                self.selectFileBtn.setText(f"🎬  {len(paths)} files")
             self.filePathLabel.setText(os.path.dirname(path))
             if not self.output_folder_path:
                 self.output_folder_path = os.path.dirname(path)
@@ -269,34 +283,45 @@ class DogeAutoSub(ui_DogeAutoSub.Ui_MainWindow, QMainWindow):
     # ── Subtitle Processing ─────────────────────────────────────
     
     def _start_subtitles(self):
-        if not self.input_file_path:
+        if not self.input_file_paths and not self.job_queue.pending_count():
             QMessageBox.warning(self, "No File", "Please select a video file first.")
             return
         
+        # Selected files are queued; the queue runs several jobs at once
+        for path in self.input_file_paths:
+            self.job_queue.add(SubtitleArgs(
+                source_path=path,
+                output_folder=self.output_folder_path or os.path.dirname(path),
+                src_language=self.source_language_dropdown.currentText(),
+                dst_language=self.target_language_dropdown.currentText(),
+                model_size=self.model_size_dropdown.currentText(),
+                translate_engine=self.target_engine.currentText(),
+                volume=self.boostSlider.value(),
+            ))
+        added = len(self.input_file_paths)
+        self.input_file_paths = []
+        
         if self.subtitle_thread and self.subtitle_thread.isRunning():
+            if added:
+                self.statusLabel.setText(f"Added {added} job(s) to the queue")
+                self._on_job_update()
             return
         
-        args = SubtitleArgs(
-            source_path=self.input_file_path,
-            output_folder=self.output_folder_path or os.path.dirname(self.input_file_path),
-            src_language=self.source_language_dropdown.currentText(),
-            dst_language=self.target_language_dropdown.currentText(),
-            model_size=self.model_size_dropdown.currentText(),
-            translate_engine=self.target_engine.currentText(),
-            volume=self.boostSlider.value(),
-        )
-        
-        self.subtitle_thread = SubtitleThread(args)
+        self.subtitle_thread = SubtitleQueueThread(self.job_queue)
         self.subtitle_thread.task_start.connect(self._on_task_start)
         self.subtitle_thread.task_complete.connect(self._on_task_complete)
         self.subtitle_thread.progress_update.connect(self.progressBar.setValue)
         self.subtitle_thread.status_update.connect(self.statusLabel.setText)
-        self.subtitle_thread.duration_update.connect(self.etaLabel.setText)
+        self.subtitle_thread.job_update.connect(self._on_job_update)
         self.subtitle_thread.start()
     
+    def _on_job_update(self, *_):
+        pending = self.job_queue.pending_count()
+        self.etaLabel.setText(f"{pending} job(s) in queue" if pending else "")
+    
     def _on_task_start(self):
-        self.startButton.setEnabled(False)
-        self.startButton.setText("⏳  Processing…")
+        # Stays enabled so more files can be queued while jobs run
+        self.startButton.setText("➕  ADD TO QUEUE")
         self.statusLabel.setText("Starting…")
         self.progressBar.setValue(0)
         if self.loading_movie:
@@ -525,6 +550,9 @@ class DogeAutoSub(ui_DogeAutoSub.Ui_MainWindow, QMainWindow):
 # ═══════════════════════════════════════════════════════════════
 
 if __name__ == '__main__':
+    # Needed by CPU farm worker processes in the frozen build
+    import multiprocessing
+    multiprocessing.freeze_support()
     try:
         print("Starting DogeAutoSub…")
         app = QApplication(sys.argv)
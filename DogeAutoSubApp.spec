@@ -32,7 +32,7 @@ hiddenimports = [
     'charset_normalizer', 'idna',
     'packaging', 'typing_extensions',
     'filelock', 'fsspec', 'tqdm',
-    'huggingface_hub',
+    'huggingface_hub', 'psutil',
 
     # NOTE: Application modules (ui_DogeAutoSub, modules.*) are intentionally
     # NOT listed here. They are included only as 'datas' (source .py files)
@@ -53,11 +53,23 @@ datas = [
     ('modules/constants.py', 'modules'),
     ('modules/subtitle_args.py', 'modules'),
     ('modules/faster_whisper_engine.py', 'modules'),
+    ('modules/model_pool.py', 'modules'),
+    ('modules/job_journal.py', 'modules'),
+    ('modules/job_queue.py', 'modules'),
+    ('modules/cpu_farm.py', 'modules'),
+    ('modules/auto_tune.py', 'modules'),
+    ('modules/telemetry.py', 'modules'),
     ('modules/chunk_processor.py', 'modules'),
+    ('modules/vad_scheduler.py', 'modules'),
+    ('modules/transcription_cache.py', 'modules'),
+    ('modules/translation_memory.py', 'modules'),
+    ('modules/google_translator.py', 'modules'),
     ('modules/marian_translator.py', 'modules'),
     ('modules/meeting_notes.py', 'modules'),
     ('modules/mlaas_client.py', 'modules'),
     ('modules/updater.py', 'modules'),
+    ('modules/streaming_translation.py', 'modules'),
+    ('modules/subtitle_pipeline.py', 'modules'),
     ('modules/subtitle_thread.py', 'modules'),
     ('modules/meeting_notes_thread.py', 'modules'),
     ('modules/translate_thread.py', 'modules'),
@@ -123,10 +135,11 @@ a = Analysis(
 updatable_modules = {
     'AutoUI',
     'modules', 'modules.ui_DogeAutoSub', 'modules.constants', 'modules.subtitle_args',
-    'modules.faster_whisper_engine', 'modules.chunk_processor',
-    'modules.marian_translator', 'modules.meeting_notes',
+    'modules.faster_whisper_engine', 'modules.model_pool',
+    'modules.job_journal', 'modules.job_queue', 'modules.cpu_farm', 'modules.auto_tune', 'modules.telemetry', 'modules.chunk_processor', 'modules.vad_scheduler', 'modules.transcription_cache',
+    'modules.translation_memory', 'modules.google_translator', 'modules.marian_translator', 'modules.meeting_notes',
     'modules.mlaas_client', 'modules.updater',
-    'modules.subtitle_thread', 'modules.meeting_notes_thread', 'modules.translate_thread'
+    'modules.streaming_translation', 'modules.subtitle_pipeline', 'modules.subtitle_thread', 'modules.meeting_notes_thread', 'modules.translate_thread'
 }
 a.pure = [entry for entry in a.pure if entry[0] not in updatable_modules]
 
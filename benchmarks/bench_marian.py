@@ -0,0 +1,70 @@
+"""
+DogeAutoSub — MarianMT Backend Benchmark
+=========================================
+Compares the transformers (PyTorch) and CTranslate2 (int8) MarianTranslator
+backends on the same synthetic subtitle lines: model load time, translation
+time and lines per second. The translation memory is bypassed.
+
+The first CTranslate2 run includes the one-time model conversion; run twice
+to see the cached load time.
+
+Usage:
+    python benchmarks/bench_marian.py
+    python benchmarks/bench_marian.py --src en --dst vi --lines 500 --max-tokens 4096
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import make_lines
+from modules.marian_translator import MARIAN_BACKENDS, MarianTranslator
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MarianMT backend benchmark")
+    parser.add_argument("--src", default="en", help="Source language (default: en)")
+    parser.add_argument("--dst", default="vi", help="Target language (default: vi)")
+    parser.add_argument("--lines", type=int, default=200, help="Lines to translate (default: 200)")
+    parser.add_argument("--batch-size", type=int, default=None, help="Max sentences per batch (default: auto)")
+    parser.add_argument("--max-tokens", type=int, default=None, help="Padded tokens per batch (default: auto from memory)")
+    parser.add_argument("--backends", default=",".join(MARIAN_BACKENDS),
+                        help="Comma-separated backends (default: all)")
+    args = parser.parse_args()
+
+    lines = make_lines(args.lines)
+    print(f"\n  {args.lines} lines, {args.src} → {args.dst}, batch_size {args.batch_size or 'auto'}, max_tokens {args.max_tokens or 'auto'}\n")
+
+    rows = []
+    for backend in args.backends.split(","):
+        translator = MarianTranslator(args.src, args.dst, backend=backend)
+        start = time.perf_counter()
+        if not translator.load_model():
+            print(f"  {backend}: model failed to load, skipped")
+            continue
+        load_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        out = translator.translate_batch(
+            lines, batch_size=args.batch_size, max_tokens=args.max_tokens, use_memory=False,
+        )
+        elapsed = time.perf_counter() - start
+        assert len(out) == len(lines)
+        rows.append((translator.backend, load_time, elapsed, out[0]))
+
+    print(f"\n  {'backend':>12}  {'load s':>8}  {'translate s':>11}  {'lines/s':>8}")
+    for backend, load_time, elapsed, _ in rows:
+        print(f"  {backend:>12}  {load_time:>8.2f}  {elapsed:>11.2f}  {len(lines) / elapsed:>8.1f}")
+    print()
+    for backend, _, _, sample in rows:
+        print(f"  {backend}: {sample}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+DogeAutoSub — MLAAS Translation Throughput Benchmark
+=====================================================
+Times translate_segments_mlaas against the local stub server at several
+concurrency levels (1 = the old strictly sequential behaviour).
+
+Usage:
+    python benchmarks/bench_mlaas.py
+    python benchmarks/bench_mlaas.py --segments 1000 --latency 0.5 --max-concurrent 6
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mlaas_stub_server import start_stub_server
+from modules.mlaas_client import MLAASConfig, translate_segments_mlaas
+
+
+def make_segments(count: int) -> list:
+    return [
+        {"start": i * 2.0, "end": i * 2.0 + 1.8, "text": f"Subtitle line number {i} for the benchmark."}
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MLAAS translation throughput benchmark")
+    parser.add_argument("--segments", type=int, default=300, help="Segments to translate (default: 300)")
+    parser.add_argument("--latency", type=float, default=0.3, help="Stub latency per request (default: 0.3)")
+    parser.add_argument("--max-concurrent", type=int, default=None, help="Stub 429 threshold")
+    parser.add_argument("--max-lines", type=int, default=None, help="Stub response line cap (forces split-and-retry)")
+    parser.add_argument("--levels", default="1,2,4,8", help="Concurrency levels (default: 1,2,4,8)")
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(
+        latency=args.latency, max_concurrent=args.max_concurrent, max_lines=args.max_lines,
+    )
+    config = MLAASConfig(api_key="stub", base_url=base_url)
+    segments = make_segments(args.segments)
+
+    print(f"\n  {args.segments} segments, {args.latency:.2f}s stub latency\n")
+    print(f"  {'concurrency':>11}  {'seconds':>8}  {'seg/s':>8}  {'requests':>8}  {'429s':>5}  {'conns':>5}")
+    try:
+        for level in (int(x) for x in args.levels.split(",")):
+            server.requests = server.rate_limited = server.connections = 0
+            start = time.perf_counter()
+            out = translate_segments_mlaas(
+                segments, "vi", config, max_concurrency=level, use_memory=False,
+            )
+            elapsed = time.perf_counter() - start
+            assert len(out) == len(segments)
+            assert all(o["text"].startswith("T:") for o in out)
+            print(f"  {level:>11}  {elapsed:>8.2f}  {len(segments) / elapsed:>8.1f}  "
+                  f"{server.requests:>8}  {server.rate_limited:>5}  {server.connections:>5}")
+    finally:
+        server.shutdown()
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+DogeAutoSub — Benchmark Fixtures
+=================================
+Deterministic inputs for benchmarks/run_benchmarks.py, so results from
+different commits measure the same work:
+
+- Audio: 16 kHz mono WAV files of several lengths, either synthetic
+  speech-like signal (voiced syllables with pitch and formants, separated by
+  pauses, so VAD finds speech regions) or a real speech clip looped to length.
+  Files are generated once into benchmarks/fixtures/ and reused.
+- Segments: Whisper-like segments with word timestamps, and overlapping
+  chunk outputs for the deduplication pass.
+
+Usage:
+    python benchmarks/fixtures.py                          # write the default fixtures
+    python benchmarks/fixtures.py --lengths 30,600 --speech-sample clip.mp4
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import wave
+from typing import List, Optional
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SAMPLE_RATE = 16000
+
+# Short clip, a TV episode segment, a long meeting recording
+DEFAULT_LENGTHS = (30, 120, 600)
+
+WORDS = (
+    "the game level boss player team meeting schedule update build release "
+    "please check this again tomorrow we need to fix the lighting before "
+    "review and then send it to the client because they asked for changes"
+).split()
+
+
+# ── Audio ───────────────────────────────────────────────────────
+
+def synthetic_speech(seconds: float, seed: int = 0) -> np.ndarray:
+    """
+    Speech-like float32 signal: utterances of voiced syllables separated by pauses.
+
+    Each syllable is a harmonic series on a gliding pitch, shaped by two
+    formants and a smooth envelope. It is not intelligible, but it has the
+    rhythm and spectrum VAD and the Whisper encoder react to.
+
+    Args:
+        seconds: Length of the signal
+        seed: Random seed (same seed, same samples)
+
+    Returns:
+        16 kHz mono float32 samples
+    """
+    rng = np.random.default_rng(seed)
+    total = int(seconds * SAMPLE_RATE)
+    audio = np.zeros(total, dtype=np.float32)
+
+    t = 0.0
+    while t < seconds:
+        utterance_end = min(seconds, t + rng.uniform(1.5, 6.0))
+        f0_base = rng.uniform(100, 220)
+        while t < utterance_end:
+            length = min(rng.uniform(0.12, 0.30), utterance_end - t)
+            n = int(length * SAMPLE_RATE)
+            if n < 32:
+                break
+            start = int(t * SAMPLE_RATE)
+            time_axis = np.arange(n) / SAMPLE_RATE
+            f0 = f0_base * (1 + rng.uniform(-0.1, 0.1) * time_axis / length)
+            phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+            f1, f2 = rng.uniform(300, 800), rng.uniform(900, 2300)
+            syllable = np.zeros(n)
+            for k in range(1, int(4000 / f0_base)):
+                freq = k * f0_base
+                weight = (np.exp(-((freq - f1) / 150) ** 2)
+                          + 0.7 * np.exp(-((freq - f2) / 200) ** 2) + 0.1 / k)
+                syllable += weight * np.sin(k * phase)
+            syllable *= np.hanning(n)
+            audio[start:start + n] += syllable.astype(np.float32)
+            t += length + rng.uniform(0.02, 0.08)
+        t = utterance_end + rng.uniform(0.3, 1.5)
+
+    audio += rng.normal(0, 0.003, total).astype(np.float32)
+    peak = float(np.max(np.abs(audio))) or 1.0
+    return (audio * (0.3 / peak)).astype(np.float32)
+
+
+def looped_clip(clip: np.ndarray, seconds: float) -> np.ndarray:
+    """Repeat a speech clip to the requested length."""
+    total = int(seconds * SAMPLE_RATE)
+    repeats = -(-total // max(len(clip), 1))
+    return np.tile(clip, repeats)[:total].astype(np.float32)
+
+
+def write_wav(path: str, audio: np.ndarray):
+    """Write float32 samples as a 16-bit mono 16 kHz WAV file."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2")
+    tmp_path = f"{path}.tmp"
+    with wave.open(tmp_path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(pcm.tobytes())
+    os.replace(tmp_path, path)
+
+
+def file_digest(path: str) -> str:
+    """Short SHA-1 of a fixture file (identifies the exact input in results)."""
+    sha = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha.update(block)
+    return sha.hexdigest()[:12]
+
+
+def audio_fixture(
+    seconds: int,
+    speech_sample: Optional[str] = None,
+    seed: int = 0,
+    fixture_dir: str = FIXTURE_DIR,
+) -> str:
+    """
+    Path of an audio fixture, generated on first use.
+
+    Args:
+        seconds: Fixture length
+        speech_sample: Real speech clip to loop instead of synthetic signal
+                       (any media file ffmpeg can read)
+        seed: Seed of the synthetic signal
+
+    Returns:
+        Path to the WAV file
+    """
+    if speech_sample:
+        stem = os.path.splitext(os.path.basename(speech_sample))[0]
+        path = os.path.join(fixture_dir, f"{stem}_{seconds}s.wav")
+    else:
+        path = os.path.join(fixture_dir, f"synthetic_{seconds}s_seed{seed}.wav")
+    if os.path.exists(path):
+        return path
+
+    if speech_sample:
+        from modules.chunk_processor import decode_audio_pcm
+        ffmpeg = os.path.join(ROOT_DIR, "modules", "ffmpeg", "bin", "ffmpeg.exe")
+        clip = decode_audio_pcm(speech_sample, ffmpeg_path=ffmpeg if os.path.exists(ffmpeg) else "ffmpeg")
+        audio = looped_clip(clip, seconds)
+    else:
+        audio = synthetic_speech(seconds, seed=seed)
+    write_wav(path, audio)
+    print(f"Fixture written: {path}")
+    return path
+
+
+# ── Segments ────────────────────────────────────────────────────
+
+def make_segments(count: int, seed: int = 0, with_words: bool = True) -> List[dict]:
+    """
+    Whisper-like segments of 1 to 25 seconds, many longer than a subtitle allows.
+
+    Args:
+        count: Number of segments
+        seed: Random seed
+        with_words: Attach word timestamps (dicts, as after _word_to_dict)
+
+    Returns:
+        Segment dicts in time order
+    """
+    rng = random.Random(seed)
+    segments = []
+    t = 0.0
+    for _ in range(count):
+        n_words = rng.randint(3, 60)
+        word_time = rng.uniform(0.2, 0.45)
+        words = []
+        for i in range(n_words):
+            text = rng.choice(WORDS)
+            if i == n_words - 1 or rng.random() < 0.08:
+                text += rng.choice(".?!")
+            words.append({
+                "start": round(t + i * word_time, 3),
+                "end": round(t + (i + 0.9) * word_time, 3),
+                "word": " " + text,
+                "probability": round(rng.uniform(0.6, 1.0), 3),
+            })
+        segment = {
+            "start": words[0]["start"],
+            "end": words[-1]["end"],
+            "text": "".join(w["word"] for w in words).strip(),
+        }
+        if with_words:
+            segment["words"] = words
+        segments.append(segment)
+        t = words[-1]["end"] + rng.uniform(0.3, 2.0)
+    return segments
+
+
+def make_chunk_overlaps(
+    segments: List[dict],
+    chunk_duration: float = 30.0,
+    overlap: float = 1.0,
+    seed: int = 0,
+) -> List[dict]:
+    """
+    Segments as fixed overlapping chunks would produce them.
+
+    Segments inside an overlap window appear twice: once verbatim, once from
+    the next chunk with slightly shifted timestamps and sometimes a truncated
+    text, like ChunkProcessor's fixed-window fallback yields.
+    """
+    rng = random.Random(seed)
+    out = []
+    step = chunk_duration - overlap
+    for seg in segments:
+        out.append({"start": seg["start"], "end": seg["end"], "text": seg["text"]})
+        boundary = (seg["start"] // step + 1) * step
+        if boundary - overlap <= seg["start"] <= boundary + overlap:
+            jitter = rng.uniform(-0.3, 0.3)
+            text = seg["text"] if rng.random() < 0.7 else seg["text"][: max(1, len(seg["text"]) // 2)]
+            out.append({"start": seg["start"] + jitter, "end": seg["end"] + jitter, "text": text})
+    rng.shuffle(out)
+    return out
+
+
+def make_lines(count: int, seed: int = 0) -> List[str]:
+    """Subtitle-like lines of 3 to 20 words for translation benchmarks."""
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 20))).capitalize() + "."
+        for _ in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate benchmark audio fixtures")
+    parser.add_argument("--lengths", default=",".join(str(s) for s in DEFAULT_LENGTHS),
+                        help="Comma-separated fixture lengths in seconds (default: 30,120,600)")
+    parser.add_argument("--speech-sample", default=None, help="Loop this speech clip instead of synthetic audio")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic audio (default: 0)")
+    args = parser.parse_args()
+
+    for seconds in (int(s) for s in args.lengths.split(",")):
+        path = audio_fixture(seconds, speech_sample=args.speech_sample, seed=args.seed)
+        print(f"  {seconds:>5}s  {file_digest(path)}  {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+DogeAutoSub — Local MLAAS Stand-in Server
+==========================================
+Mimics POST /proxy/anthropic/v1/messages so MLAAS translation throughput can be
+benchmarked offline. Numbered "[N] text" lines are echoed back as
+"[N] <prefix>text" after a simulated model latency. HTTP/1.1 keep-alive is
+supported, and a concurrency cap answers excess requests with 429 + Retry-After.
+A line cap truncates long responses (stop_reason "max_tokens") to exercise the
+client's split-and-retry path.
+
+Usage:
+    python benchmarks/mlaas_stub_server.py                   # port 8765, 300 ms latency
+    python benchmarks/mlaas_stub_server.py --latency 0.5 --max-concurrent 4
+
+From code:
+    server, base_url = start_stub_server(latency=0.2)
+    config = MLAASConfig(api_key="stub", base_url=base_url)
+    ...
+    server.shutdown()
+"""
+
+import argparse
+import http.server
+import json
+import re
+import threading
+import time
+from typing import Optional, Tuple
+
+LINE_PATTERN = re.compile(r"^\[(\d+)\]\s*(.*)$")
+
+
+class StubMLAASServer(http.server.ThreadingHTTPServer):
+    """Threaded HTTP server holding the stub's knobs and counters."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        latency: float = 0.3,
+        per_line_latency: float = 0.0,
+        max_concurrent: Optional[int] = None,
+        max_lines: Optional[int] = None,
+        prefix: str = "T:",
+    ):
+        super().__init__(address, StubMLAASHandler)
+        self.max_lines = max_lines
+        self.latency = latency
+        self.per_line_latency = per_line_latency
+        self.max_concurrent = max_concurrent
+        self.prefix = prefix
+        self.requests = 0
+        self.rate_limited = 0
+        self.connections = 0
+        self.peak_concurrent = 0
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def enter(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            if self.max_concurrent is not None and self._active >= self.max_concurrent:
+                self.rate_limited += 1
+                return False
+            self._active += 1
+            self.peak_concurrent = max(self.peak_concurrent, self._active)
+            return True
+
+    def leave(self):
+        with self._lock:
+            self._active -= 1
+
+
+class StubMLAASHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        super().setup()
+        with self.server._lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict, headers: Optional[dict] = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length)
+
+        if not self.path.endswith("/v1/messages"):
+            self._send_json(404, {"detail": "Not found"})
+            return
+
+        if not self.server.enter():
+            self._send_json(429, {"detail": "Too many requests"}, {"Retry-After": "0.2"})
+            return
+
+        try:
+            payload = json.loads(raw.decode("utf-8"))
+            prompt = payload["messages"][-1]["content"]
+            lines = [
+                f"[{m.group(1)}] {self.server.prefix}{m.group(2)}"
+                for m in (LINE_PATTERN.match(l.strip()) for l in prompt.splitlines())
+                if m
+            ]
+            if not lines:
+                # Single-text translation: last paragraph of the prompt
+                lines = [self.server.prefix + prompt.rsplit("\n\n", 1)[-1]]
+
+            stop_reason = "end_turn"
+            if self.server.max_lines is not None and len(lines) > self.server.max_lines:
+                lines = lines[:self.server.max_lines]
+                stop_reason = "max_tokens"
+
+            time.sleep(self.server.latency + self.server.per_line_latency * len(lines))
+            text = "\n".join(lines)
+            self._send_json(200, {
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": stop_reason,
+                "usage": {"input_tokens": len(prompt) // 4, "output_tokens": len(text) // 4},
+            })
+        except Exception as e:
+            self._send_json(400, {"detail": str(e)})
+        finally:
+            self.server.leave()
+
+
+def start_stub_server(
+    port: int = 0,
+    latency: float = 0.3,
+    per_line_latency: float = 0.0,
+    max_concurrent: Optional[int] = None,
+    max_lines: Optional[int] = None,
+) -> Tuple[StubMLAASServer, str]:
+    """
+    Start the stub server on a background thread.
+
+    Returns:
+        Tuple of (server, base_url); call server.shutdown() when done
+    """
+    server = StubMLAASServer(
+        ("127.0.0.1", port),
+        latency=latency,
+        per_line_latency=per_line_latency,
+        max_concurrent=max_concurrent,
+        max_lines=max_lines,
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, bound_port = server.server_address[:2]
+    return server, f"http://{host}:{bound_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local MLAAS stand-in server")
+    parser.add_argument("--port", type=int, default=8765, help="Port (default: 8765)")
+    parser.add_argument("--latency", type=float, default=0.3, help="Seconds per request (default: 0.3)")
+    parser.add_argument("--per-line-latency", type=float, default=0.0, help="Extra seconds per line")
+    parser.add_argument("--max-concurrent", type=int, default=None, help="Answer 429 above this many in-flight requests")
+    parser.add_argument("--max-lines", type=int, default=None, help="Truncate responses to this many lines")
+    args = parser.parse_args()
+
+    server = StubMLAASServer(
+        ("127.0.0.1", args.port),
+        latency=args.latency,
+        per_line_latency=args.per_line_latency,
+        max_concurrent=args.max_concurrent,
+        max_lines=args.max_lines,
+    )
+    print(f"\n  MLAAS stub listening on http://127.0.0.1:{args.port}  (Ctrl+C to stop)\n")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n  Stub server stopped.")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,480 @@
+"""
+DogeAutoSub — Benchmark Suite
+==============================
+Times the transcription and translation pipeline on fixed inputs and writes
+a results file tagged with the git commit, so runs on different commits
+(or machines) can be compared:
+
+- chunking:  ChunkProcessor single-pass vs chunked mode on audio fixtures
+             (needs faster-whisper and ffmpeg; stage spans from telemetry)
+- split:     FasterWhisperRecognizer._split_long_segments
+- dedup:     ChunkProcessor._deduplicate_segments
+- srt:       save_as_srt and IncrementalSrtWriter
+- marian:    MarianTranslator.translate_batch per backend (needs transformers)
+- mlaas:     translate_segments_mlaas against benchmarks/mlaas_stub_server.py
+
+Suites whose dependencies are missing are recorded as skipped. Fixtures are
+deterministic (see benchmarks/fixtures.py); the results file stores their
+digests so a comparison only lines up identical inputs.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --quick --suites split,dedup,srt,mlaas
+    python benchmarks/run_benchmarks.py --model small --lengths 30,600 --speech-sample clip.mp4
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/OLD.json [NEW.json]
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from fixtures import (
+    DEFAULT_LENGTHS,
+    audio_fixture,
+    file_digest,
+    make_chunk_overlaps,
+    make_lines,
+    make_segments,
+)
+
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+RESULTS_FORMAT_VERSION = 1
+SUITES = ("chunking", "split", "dedup", "srt", "marian", "mlaas")
+
+# Changes smaller than this are reported as noise in --compare
+NOISE_THRESHOLD = 0.05
+
+
+# ── Helpers ─────────────────────────────────────────────────────
+
+@contextlib.contextmanager
+def quiet(enabled: bool = True):
+    """Silence the pipeline's progress prints while timing."""
+    if not enabled:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def measure(fn: Callable[[], object], repeat: int, items: int, verbose: bool = False) -> dict:
+    """
+    Run fn repeat times (after one warm-up run) and summarize wall times.
+
+    Args:
+        fn: Work to time
+        repeat: Timed runs
+        items: Units of work per run (segments, lines, ...) for per_sec
+
+    Returns:
+        Dict with seconds (median), min, runs, items, per_sec
+    """
+    with quiet(not verbose):
+        fn()
+        times = []
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+    median = statistics.median(times)
+    return {
+        "seconds": round(median, 6),
+        "min": round(min(times), 6),
+        "runs": len(times),
+        "items": items,
+        "per_sec": round(items / median, 2) if median > 0 else None,
+    }
+
+
+def git_info() -> dict:
+    """Commit the benchmark ran on (dirty if the tree had local changes)."""
+    def git(*args):
+        return subprocess.run(
+            ["git", *args], cwd=ROOT_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    try:
+        return {
+            "commit": git("rev-parse", "--short", "HEAD"),
+            "subject": git("log", "-1", "--format=%s"),
+            "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        }
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": "unknown", "subject": "", "dirty": None}
+
+
+def package_versions() -> dict:
+    versions = {}
+    for name in ("numpy", "faster_whisper", "ctranslate2", "torch", "transformers"):
+        try:
+            module = __import__(name)
+            versions[name] = getattr(module, "__version__", "unknown")
+        except ImportError:
+            versions[name] = None
+    return versions
+
+
+def find_ffmpeg() -> Optional[str]:
+    bundled = os.path.join(ROOT_DIR, "modules", "ffmpeg", "bin", "ffmpeg.exe")
+    if os.path.exists(bundled):
+        return bundled
+    return shutil.which("ffmpeg")
+
+
+# ── Suites ──────────────────────────────────────────────────────
+
+def bench_chunking(args) -> Dict[str, dict]:
+    """ChunkProcessor single-pass vs chunked mode on each audio fixture."""
+    from modules.faster_whisper_engine import FASTER_WHISPER_AVAILABLE, FasterWhisperRecognizer
+    from modules.chunk_processor import ChunkProcessor
+    from modules.telemetry import RunTelemetry
+
+    if not FASTER_WHISPER_AVAILABLE:
+        return {"chunking": {"skipped": "faster-whisper not installed"}}
+    ffmpeg = find_ffmpeg()
+    if ffmpeg is None:
+        return {"chunking": {"skipped": "ffmpeg not found"}}
+
+    with quiet(not args.verbose):
+        recognizer = FasterWhisperRecognizer(
+            model_size=args.model, language=args.language or None, use_profile=args.use_profile,
+        )
+    results = {}
+    try:
+        for seconds in args.lengths:
+            path = audio_fixture(seconds, speech_sample=args.speech_sample)
+            digest = file_digest(path)
+            for mode, use_chunking in (("single", False), ("chunked", True)):
+                runs = []
+                for _ in range(max(1, args.pipeline_repeat)):
+                    temp_dir = tempfile.mkdtemp(prefix="bench_")
+                    telemetry = RunTelemetry()
+                    processor = ChunkProcessor(
+                        temp_dir=temp_dir, ffmpeg_path=ffmpeg,
+                        use_chunking=use_chunking, telemetry=telemetry,
+                    )
+                    start = time.perf_counter()
+                    try:
+                        with quiet(not args.verbose):
+                            segments, _ = processor.process_parallel(path, recognizer)
+                    finally:
+                        shutil.rmtree(temp_dir, ignore_errors=True)
+                    elapsed = time.perf_counter() - start
+                    telemetry.set(audio_duration=seconds, segments=len(segments))
+                    runs.append((elapsed, len(segments), telemetry.report()))
+
+                runs.sort(key=lambda r: r[0])
+                elapsed, segments_count, report = runs[len(runs) // 2]
+                name = f"chunking/{mode}/{seconds}s"
+                results[name] = {
+                    "seconds": round(elapsed, 3),
+                    "min": round(runs[0][0], 3),
+                    "runs": len(runs),
+                    "items": seconds,
+                    "per_sec": round(seconds / elapsed, 2),
+                    "rtf": round(elapsed / seconds, 4),
+                    "segments": segments_count,
+                    "spans": report["spans"],
+                    "peak_rss_mb": report["peak_rss_mb"],
+                    "peak_vram_mb": report["peak_vram_mb"],
+                    "fixture": digest,
+                }
+                print(f"  {name:<28} {elapsed:>8.2f}s  RTF {elapsed / seconds:.3f}  {segments_count} segments")
+    finally:
+        recognizer.close()
+    results["chunking/config"] = {
+        "model": recognizer.model_size,
+        "device": recognizer.device,
+        "compute_type": recognizer.compute_type,
+        "beam_size": recognizer.beam_size,
+        "batch_size": recognizer.batch_size,
+        "language": args.language or None,
+        "speech_sample": os.path.basename(args.speech_sample) if args.speech_sample else None,
+    }
+    return results
+
+
+def bench_split(args) -> Dict[str, dict]:
+    """_split_long_segments on segments with and without word timestamps."""
+    from modules.faster_whisper_engine import FasterWhisperRecognizer
+
+    # The method only needs the instance as a namespace; skip model loading
+    recognizer = object.__new__(FasterWhisperRecognizer)
+    results = {}
+    for with_words in (True, False):
+        segments = make_segments(args.segments, with_words=with_words)
+        name = f"split/{'words' if with_words else 'chars'}/{args.segments}seg"
+        results[name] = measure(
+            lambda: recognizer._split_long_segments(segments), args.repeat, len(segments), args.verbose,
+        )
+        results[name]["output"] = len(recognizer._split_long_segments(segments))
+    return results
+
+
+def bench_dedup(args) -> Dict[str, dict]:
+    """_deduplicate_segments on fixed-window chunk outputs with overlaps."""
+    from modules.chunk_processor import ChunkProcessor
+
+    processor = ChunkProcessor(temp_dir=tempfile.mkdtemp(prefix="bench_"))
+    try:
+        segments = make_chunk_overlaps(make_segments(args.segments, with_words=False))
+        name = f"dedup/{len(segments)}seg"
+        result = measure(lambda: processor._deduplicate_segments(segments), args.repeat, len(segments), args.verbose)
+        result["output"] = len(processor._deduplicate_segments(segments))
+        return {name: result}
+    finally:
+        shutil.rmtree(processor.temp_dir, ignore_errors=True)
+
+
+def bench_srt(args) -> Dict[str, dict]:
+    """save_as_srt and IncrementalSrtWriter (appends of 10 cues, then finalize)."""
+    from modules.subtitle_pipeline import IncrementalSrtWriter, save_as_srt
+
+    segments = make_segments(args.segments, with_words=False)
+    temp_dir = tempfile.mkdtemp(prefix="bench_")
+    path = os.path.join(temp_dir, "bench.srt")
+
+    def incremental():
+        writer = IncrementalSrtWriter(path)
+        for i in range(0, len(segments), 10):
+            writer.append(segments[i:i + 10])
+        writer.finalize(segments)
+
+    try:
+        return {
+            f"srt/save/{len(segments)}seg": measure(
+                lambda: save_as_srt(segments, path), args.repeat, len(segments), args.verbose,
+            ),
+            f"srt/incremental/{len(segments)}seg": measure(
+                incremental, args.repeat, len(segments), args.verbose,
+            ),
+        }
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def bench_marian(args) -> Dict[str, dict]:
+    """MarianTranslator.translate_batch per backend (translation memory bypassed)."""
+    try:
+        from modules.marian_translator import MARIAN_AVAILABLE, MarianTranslator
+    except ImportError:
+        MARIAN_AVAILABLE = False
+    if not MARIAN_AVAILABLE:
+        return {"marian": {"skipped": "transformers not installed"}}
+
+    lines = make_lines(args.lines)
+    results = {}
+    for backend in args.marian_backends:
+        name = f"marian/{backend}/{args.src}-{args.dst}/{len(lines)}lines"
+        translator = MarianTranslator(args.src, args.dst, backend=backend)
+        start = time.perf_counter()
+        with quiet(not args.verbose):
+            loaded = translator.load_model()
+        load_time = time.perf_counter() - start
+        if not loaded:
+            results[name] = {"skipped": "model failed to load"}
+            continue
+        if translator.backend != backend:
+            results[name] = {"skipped": f"fell back to {translator.backend}"}
+            continue
+        results[name] = measure(
+            lambda: translator.translate_batch(lines, use_memory=False),
+            args.pipeline_repeat, len(lines), args.verbose,
+        )
+        results[name]["load_seconds"] = round(load_time, 3)
+        print(f"  {name:<40} {results[name]['per_sec']:>8.1f} lines/s")
+    return results
+
+
+def bench_mlaas(args) -> Dict[str, dict]:
+    """translate_segments_mlaas against the local stub server."""
+    from mlaas_stub_server import start_stub_server
+    from modules.mlaas_client import MLAASConfig, TRANSLATION_MAX_CONCURRENCY, translate_segments_mlaas
+
+    server, base_url = start_stub_server(latency=args.stub_latency)
+    config = MLAASConfig(api_key="stub", base_url=base_url)
+    segments = make_segments(args.segments, with_words=False)
+    results = {}
+    try:
+        for level in sorted({1, TRANSLATION_MAX_CONCURRENCY}):
+            server.requests = 0
+            name = f"mlaas/concurrency{level}/{len(segments)}seg"
+            results[name] = measure(
+                lambda: translate_segments_mlaas(
+                    segments, "vi", config, max_concurrency=level, use_memory=False,
+                ),
+                args.pipeline_repeat, len(segments), args.verbose,
+            )
+            # Warm-up plus timed runs
+            results[name]["requests_per_run"] = server.requests // (args.pipeline_repeat + 1)
+            results[name]["stub_latency"] = args.stub_latency
+            print(f"  {name:<40} {results[name]['per_sec']:>8.1f} seg/s")
+    finally:
+        server.shutdown()
+    return results
+
+
+SUITE_FUNCTIONS = {
+    "chunking": bench_chunking,
+    "split": bench_split,
+    "dedup": bench_dedup,
+    "srt": bench_srt,
+    "marian": bench_marian,
+    "mlaas": bench_mlaas,
+}
+
+
+# ── Comparison ──────────────────────────────────────────────────
+
+def latest_results(exclude: Optional[str] = None) -> Optional[str]:
+    paths = sorted(
+        (p for p in glob.glob(os.path.join(RESULTS_DIR, "*.json")) if p != exclude),
+        key=os.path.getmtime,
+    )
+    return paths[-1] if paths else None
+
+
+def compare(base_path: str, new_path: str):
+    """Print the change in median time of every benchmark present in both files."""
+    with open(base_path, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    with open(new_path, "r", encoding="utf-8") as f:
+        new = json.load(f)
+
+    print(f"\n  base: {base['git']['commit']} {base['git']['subject'][:60]}")
+    print(f"  new:  {new['git']['commit']} {new['git']['subject'][:60]}")
+    if base.get("host", {}).get("node") != new.get("host", {}).get("node"):
+        print("  warning: results come from different machines")
+    print(f"\n  {'benchmark':<42} {'base s':>10} {'new s':>10} {'change':>8}")
+
+    for name, entry in new["results"].items():
+        old = base["results"].get(name)
+        if not old or "seconds" not in old or "seconds" not in entry:
+            continue
+        if old.get("fixture") != entry.get("fixture"):
+            print(f"  {name:<42} {'(different fixture)':>30}")
+            continue
+        change = entry["seconds"] / old["seconds"] - 1 if old["seconds"] else 0.0
+        note = "" if abs(change) < NOISE_THRESHOLD else (" faster" if change < 0 else " slower")
+        print(f"  {name:<42} {old['seconds']:>10.4f} {entry['seconds']:>10.4f} {change:>+7.1%}{note}")
+    print()
+
+
+# ── Main ────────────────────────────────────────────────────────
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="DogeAutoSub benchmark suite")
+    parser.add_argument("--suites", default=",".join(SUITES), help=f"Comma-separated suites (default: {','.join(SUITES)})")
+    parser.add_argument("--quick", action="store_true", help="Small inputs for a fast smoke run")
+    parser.add_argument("--lengths", default=None,
+                        help="Audio fixture lengths in seconds (default: 30,120,600; quick: 30)")
+    parser.add_argument("--speech-sample", default=None,
+                        help="Loop this speech clip for the audio fixtures instead of synthetic audio")
+    parser.add_argument("--model", default="tiny", help="Whisper model for the chunking suite (default: tiny)")
+    parser.add_argument("--language", default="en",
+                        help="Language pinned for the chunking suite ('' to detect; default: en)")
+    parser.add_argument("--use-profile", action="store_true",
+                        help="Use the AutoTune.py profile (default: fixed settings, comparable across machines)")
+    parser.add_argument("--segments", type=int, default=None, help="Segments for split/dedup/srt/mlaas (default: 2000; quick: 200)")
+    parser.add_argument("--lines", type=int, default=None, help="Lines for the marian suite (default: 200; quick: 50)")
+    parser.add_argument("--src", default="en", help="Marian source language (default: en)")
+    parser.add_argument("--dst", default="vi", help="Marian target language (default: vi)")
+    parser.add_argument("--marian-backends", default="transformers,ctranslate2", help="Marian backends to time")
+    parser.add_argument("--stub-latency", type=float, default=0.05, help="MLAAS stub latency per request (default: 0.05)")
+    parser.add_argument("--repeat", type=int, default=None, help="Timed runs of micro-benchmarks (default: 5; quick: 3)")
+    parser.add_argument("--pipeline-repeat", type=int, default=1, help="Timed runs of chunking/marian/mlaas (default: 1)")
+    parser.add_argument("--output", default=None, help="Results file (default: benchmarks/results/<commit>-<time>.json)")
+    parser.add_argument("--compare", nargs="+", metavar="RESULTS", default=None,
+                        help="Compare two results files (or one against the latest) and exit")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline's own output")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        base = args.compare[0]
+        new = args.compare[1] if len(args.compare) > 1 else latest_results(exclude=os.path.abspath(base))
+        if not new:
+            parser.error("no second results file to compare against")
+        compare(base, new)
+        return 0
+
+    args.lengths = [int(s) for s in (args.lengths or ("30" if args.quick else ",".join(map(str, DEFAULT_LENGTHS)))).split(",")]
+    args.segments = args.segments or (200 if args.quick else 2000)
+    args.lines = args.lines or (50 if args.quick else 200)
+    args.repeat = args.repeat or (3 if args.quick else 5)
+    args.marian_backends = [b.strip() for b in args.marian_backends.split(",") if b.strip()]
+    suites = [s.strip() for s in args.suites.split(",") if s.strip()]
+    unknown = [s for s in suites if s not in SUITE_FUNCTIONS]
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(unknown)}")
+
+    git = git_info()
+    print(f"\n  DogeAutoSub benchmarks @ {git['commit']}{' (dirty)' if git['dirty'] else ''}\n")
+    results: Dict[str, dict] = {}
+    for suite in suites:
+        print(f"[{suite}]")
+        start = time.perf_counter()
+        try:
+            suite_results = SUITE_FUNCTIONS[suite](args)
+        except Exception as e:
+            print(f"  failed: {e}")
+            suite_results = {suite: {"error": str(e)}}
+        for name, entry in suite_results.items():
+            if "skipped" in entry:
+                print(f"  skipped: {entry['skipped']}")
+            elif suite not in ("chunking", "marian", "mlaas") and "seconds" in entry:
+                print(f"  {name:<40} {entry['seconds'] * 1000:>9.2f} ms  {entry['per_sec']:>10.0f}/s")
+        results.update(suite_results)
+        print(f"  ({time.perf_counter() - start:.1f}s)\n")
+
+    report = {
+        "version": RESULTS_FORMAT_VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git": git,
+        "host": {
+            "node": platform.node(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+        },
+        "packages": package_versions(),
+        "settings": {
+            "suites": suites,
+            "quick": args.quick,
+            "lengths": args.lengths,
+            "segments": args.segments,
+            "lines": args.lines,
+            "repeat": args.repeat,
+            "pipeline_repeat": args.pipeline_repeat,
+        },
+        "results": results,
+    }
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{git['commit']}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"  Results: {output}")
+    print(f"  Compare: python benchmarks/run_benchmarks.py --compare <older results> {output}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
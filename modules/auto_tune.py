@@ -0,0 +1,347 @@
+"""
+Per-machine auto-tuning for DogeAutoSub.
+Times a short speech sample across compute types, beam sizes, batch sizes
+(CUDA) and cpu_threads (CPU), keeps the fastest configuration whose word
+error rate against a reference stays within a tolerance, and stores it in a
+local profile that FasterWhisperRecognizer uses by default.
+
+The reference transcript is either supplied or produced by the most
+accurate configuration (highest-precision compute type, beam 5). The search
+tunes one setting at a time, starting from the defaults, instead of timing
+the full grid.
+"""
+
+import json
+import os
+import platform
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from faster_whisper import WhisperModel, BatchedInferencePipeline
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False
+
+try:
+    import torch
+    CUDA_AVAILABLE = torch.cuda.is_available()
+except ImportError:
+    CUDA_AVAILABLE = False
+
+PROFILE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "cache", "tuning_profile.json"
+)
+PROFILE_FORMAT_VERSION = 1
+
+DEFAULT_SAMPLE_SECONDS = 60.0
+DEFAULT_WER_TOLERANCE = 0.05
+
+# Search space, most accurate first
+COMPUTE_TYPES = {
+    "cuda": ["float16", "int8_float16", "int8"],
+    "cpu": ["float32", "int8_float32", "int8"],
+}
+BEAM_SIZES = [5, 2, 1]
+BATCH_SIZES = [8, 16, 24, 32]
+
+# Defaults the search starts from (match FasterWhisperRecognizer)
+DEFAULT_BEAM_SIZE = 5
+DEFAULT_BATCH_SIZE = 16
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+# ── Word error rate ─────────────────────────────────────────────
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall((text or "").lower())
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """
+    Word error rate of hypothesis against reference (case and punctuation ignored).
+
+    For languages written without spaces the "words" are whole runs of
+    characters, which makes the rate coarser but still comparable between runs.
+
+    Returns:
+        (substitutions + deletions + insertions) / reference words
+    """
+    ref, hyp = _words(reference), _words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    # Levenshtein distance over words, one row at a time
+    previous = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, start=1):
+        current = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, start=1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (r != h),
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+
+# ── Profile ─────────────────────────────────────────────────────
+
+def machine_signature() -> dict:
+    """Hardware the profile was measured on; a different machine invalidates it."""
+    signature = {"cpu_count": os.cpu_count() or 0, "machine": platform.machine()}
+    if CUDA_AVAILABLE:
+        try:
+            signature["gpu"] = torch.cuda.get_device_name(0)
+        except Exception:
+            pass
+    return signature
+
+
+def _profile_key(model_size: str, device: str) -> str:
+    return f"{model_size}|{device}"
+
+
+def _read_profiles(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != PROFILE_FORMAT_VERSION:
+        return {}
+    return data
+
+
+def load_tuning_profile(
+    model_size: str,
+    device: str,
+    path: Optional[str] = None,
+) -> Optional[dict]:
+    """
+    Tuned settings for a model on this machine.
+
+    Args:
+        model_size: faster-whisper model name (e.g. "large-v3-turbo")
+        device: "cuda" or "cpu"
+        path: Profile file (default: modules/cache/tuning_profile.json)
+
+    Returns:
+        Dict with compute_type, beam_size, batch_size, cpu_threads, or None
+        if the model was never tuned or the hardware changed since
+    """
+    data = _read_profiles(path or PROFILE_PATH)
+    if not data or data.get("machine") != machine_signature():
+        return None
+    return data.get("profiles", {}).get(_profile_key(model_size, device))
+
+
+def save_tuning_profile(
+    model_size: str,
+    device: str,
+    profile: dict,
+    path: Optional[str] = None,
+):
+    """Store tuned settings for a model (other models' profiles are kept)."""
+    path = path or PROFILE_PATH
+    data = _read_profiles(path)
+    if data.get("machine") != machine_signature():
+        data = {}
+    data["version"] = PROFILE_FORMAT_VERSION
+    data["machine"] = machine_signature()
+    data.setdefault("profiles", {})[_profile_key(model_size, device)] = profile
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+# ── Calibration ─────────────────────────────────────────────────
+
+class _Trial:
+    """Timed transcription of the sample with one configuration."""
+
+    def __init__(self, config: dict, seconds: float, text: str):
+        self.config = config
+        self.seconds = seconds
+        self.text = text
+        self.wer = 0.0
+
+
+class AutoTuner:
+    """Finds the fastest accurate-enough settings for one model on this machine."""
+
+    def __init__(
+        self,
+        model_size: str,
+        device: Optional[str] = None,
+        wer_tolerance: float = DEFAULT_WER_TOLERANCE,
+        download_root: Optional[str] = None,
+    ):
+        """
+        Initialize AutoTuner.
+
+        Args:
+            model_size: faster-whisper model name (e.g. "large-v3-turbo")
+            device: "cuda" or "cpu" (auto-detected if None)
+            wer_tolerance: Highest acceptable WER against the reference
+            download_root: Model download directory
+        """
+        if not FASTER_WHISPER_AVAILABLE:
+            raise ImportError(
+                "faster-whisper is not installed. "
+                "Install with: pip install faster-whisper"
+            )
+        self.model_size = model_size
+        self.device = device or ("cuda" if CUDA_AVAILABLE else "cpu")
+        self.wer_tolerance = wer_tolerance
+        if download_root is None:
+            download_root = os.path.join(os.path.dirname(__file__), "models", "faster_whisper")
+        self.download_root = download_root
+        self.trials: List[_Trial] = []
+        self._language: Optional[str] = None
+        self._models: Dict[Tuple[str, int], object] = {}
+
+    def _model(self, compute_type: str, cpu_threads: int):
+        key = (compute_type, cpu_threads)
+        if key not in self._models:
+            # One model at a time keeps VRAM use at a single copy
+            self._models.clear()
+            self._models[key] = WhisperModel(
+                self.model_size,
+                device=self.device,
+                compute_type=compute_type,
+                cpu_threads=cpu_threads,
+                download_root=self.download_root,
+            )
+        return self._models[key]
+
+    def _run(self, audio, config: dict) -> _Trial:
+        model = self._model(config["compute_type"], config["cpu_threads"])
+        options = dict(
+            language=self._language,
+            beam_size=config["beam_size"],
+            vad_filter=True,
+            word_timestamps=True,
+        )
+        if self.device == "cuda":
+            transcriber = BatchedInferencePipeline(model=model)
+            options["batch_size"] = config["batch_size"]
+        else:
+            transcriber = model
+
+        start = time.perf_counter()
+        segments, info = transcriber.transcribe(audio, **options)
+        text = " ".join(seg.text.strip() for seg in segments)
+        elapsed = time.perf_counter() - start
+        if self._language is None:
+            self._language = info.language
+        return _Trial(dict(config), elapsed, text)
+
+    def _measure(self, audio, config: dict, reference: str) -> _Trial:
+        # Short warm-up so model/CUDA initialization isn't timed
+        self._run(audio[:5 * 16000], config)
+        trial = self._run(audio, config)
+        trial.wer = word_error_rate(reference, trial.text)
+        self.trials.append(trial)
+        ok = "ok" if trial.wer <= self.wer_tolerance else "rejected"
+        settings = ", ".join(f"{k}={v}" for k, v in config.items())
+        print(f"  {settings}: {trial.seconds:.2f}s, WER {trial.wer:.3f} ({ok})")
+        return trial
+
+    def _best_of(self, audio, configs: List[dict], reference: str, current: _Trial) -> _Trial:
+        """Fastest accepted trial among configs and the current best."""
+        best = current
+        for config in configs:
+            if config == current.config:
+                continue
+            try:
+                trial = self._measure(audio, config, reference)
+            except Exception as e:
+                print(f"  {config}: failed ({e})")
+                continue
+            if trial.wer <= self.wer_tolerance and trial.seconds < best.seconds:
+                best = trial
+        return best
+
+    def calibrate(
+        self,
+        audio,
+        reference_text: Optional[str] = None,
+        language: Optional[str] = None,
+    ) -> Optional[dict]:
+        """
+        Tune compute type, beam size and batch size / cpu_threads on a sample.
+
+        Args:
+            audio: 16 kHz mono float32 samples of speech (about a minute)
+            reference_text: Known transcript; None uses the most accurate configuration's output
+            language: Language of the sample (None to detect once)
+
+        Returns:
+            Profile dict (also see save_tuning_profile), or None when even the
+            reference run misses the WER tolerance against reference_text
+        """
+        self._language = language
+        duration = len(audio) / 16000
+        cores = os.cpu_count() or 1
+        default_threads = 0 if self.device == "cuda" else min(4, cores)
+
+        config = {
+            "compute_type": COMPUTE_TYPES[self.device][0],
+            "beam_size": DEFAULT_BEAM_SIZE,
+            "batch_size": DEFAULT_BATCH_SIZE,
+            "cpu_threads": default_threads,
+        }
+        print(f"Calibrating {self.model_size} on {self.device} with {duration:.0f}s of audio "
+              f"(WER tolerance {self.wer_tolerance:.0%})")
+
+        # Reference run: most accurate settings
+        print("Reference:")
+        self._run(audio[:5 * 16000], config)
+        best = self._run(audio, config)
+        reference = reference_text if reference_text is not None else best.text
+        best.wer = word_error_rate(reference, best.text)
+        self.trials.append(best)
+        print(f"  {config}: {best.seconds:.2f}s, WER {best.wer:.3f}")
+
+        print("Compute type:")
+        best = self._best_of(audio, [
+            dict(best.config, compute_type=ct) for ct in COMPUTE_TYPES[self.device]
+        ], reference, best)
+
+        print("Beam size:")
+        best = self._best_of(audio, [
+            dict(best.config, beam_size=b) for b in BEAM_SIZES
+        ], reference, best)
+
+        if self.device == "cuda":
+            print("Batch size:")
+            best = self._best_of(audio, [
+                dict(best.config, batch_size=b) for b in BATCH_SIZES
+            ], reference, best)
+        else:
+            print("CPU threads:")
+            threads = sorted({t for t in (2, 4, cores // 2, cores) if 0 < t <= cores})
+            best = self._best_of(audio, [
+                dict(best.config, cpu_threads=t) for t in threads
+            ], reference, best)
+
+        self._models.clear()
+        if best.wer > self.wer_tolerance:
+            print(f"Warning: No configuration within WER tolerance {self.wer_tolerance:.0%} "
+                  f"(best {best.wer:.3f}); keeping the default settings")
+            return None
+        profile = dict(
+            best.config,
+            rtf=round(best.seconds / max(duration, 1e-6), 4),
+            wer=round(best.wer, 4),
+            sample_seconds=round(duration, 1),
+            tuned_at=time.strftime("%Y-%m-%dT%H:%M:%S"),
+        )
+        print(f"Fastest within tolerance: {best.config} (RTF {profile['rtf']:.3f}, WER {best.wer:.3f})")
+        return profile
@@ -6,13 +6,35 @@ Enables parallel extraction and transcription for accurate progress tracking.
 
 import os
 import math
+import queue
 import subprocess
 import tempfile
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Callable, List, Optional, Tuple
+from typing import Callable, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from modules.job_journal import JobJournal
+from modules.telemetry import timed
+from modules.vad_scheduler import VAD_AVAILABLE, get_speech_regions, plan_vad_chunks
+
+# Whisper expects 16 kHz mono audio
+SAMPLE_RATE = 16000
+# Bytes read from the ffmpeg pipe per call (must be even: s16le samples)
+PCM_READ_BLOCK = 1 << 20
+# Auto-detected language is pinned for the whole job above this confidence;
+# below it each transcription call detects on its own as before
+LANGUAGE_PIN_CONFIDENCE = 0.5
+# Multi-language mode: shorter chunks so a language switch is caught sooner
+MULTILINGUAL_CHUNK_SECONDS = 15.0
 
 
 class ChunkStatus(Enum):
@@ -32,6 +54,7 @@ class AudioChunk:
     start_time: float
     end_time: float
     audio_path: Optional[str] = None
+    audio: Optional["np.ndarray"] = field(default=None, repr=False)
     status: ChunkStatus = ChunkStatus.PENDING
     segments: List[dict] = field(default_factory=list)
     error: Optional[str] = None
@@ -42,6 +65,36 @@ class AudioChunk:
         return self.end_time - self.start_time
 
 
+class _BufferBudget:
+    """Byte budget for extracted-but-untranscribed audio (back-pressure for the producer)."""
+    
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self.used = 0
+        self._cancelled = False
+        self._cond = threading.Condition()
+    
+    def acquire(self, cost: int, stop: threading.Event) -> bool:
+        """Block until cost fits. A single oversized chunk is admitted when the buffer is empty."""
+        with self._cond:
+            while not self._cancelled and not stop.is_set():
+                if self.used == 0 or self.used + cost <= self.capacity:
+                    self.used += cost
+                    return True
+                self._cond.wait(timeout=0.5)
+            return False
+    
+    def release(self, cost: int):
+        with self._cond:
+            self.used = max(0, self.used - cost)
+            self._cond.notify_all()
+    
+    def cancel(self):
+        with self._cond:
+            self._cancelled = True
+            self._cond.notify_all()
+
+
 def get_audio_duration_ffprobe(
     source_path: str,
     ffprobe_path: Optional[str] = None,
@@ -80,6 +133,104 @@ def get_audio_duration_ffprobe(
         return None
 
 
+def decode_audio_pcm(
+    source_path: str,
+    ffmpeg_path: str = "ffmpeg",
+    volume_boost: str = "3",
+    start_time: float = 0.0,
+    duration: Optional[float] = None,
+    expected_duration: Optional[float] = None,
+) -> "np.ndarray":
+    """
+    Decode audio straight from an ffmpeg stdout pipe into a float32 array.
+    
+    ffmpeg emits 16 kHz mono s16le PCM which is converted block by block into
+    a buffer preallocated from the expected duration, so no WAV file touches
+    the disk and faster-whisper does not have to decode the audio a second time.
+    
+    Args:
+        source_path: Path to the media file
+        ffmpeg_path: Path to ffmpeg executable
+        volume_boost: Audio volume boost factor
+        start_time: Seek offset in seconds
+        duration: Length to decode in seconds (None for until end of file)
+        expected_duration: Duration hint used to size the buffer when duration is None
+        
+    Returns:
+        1-D float32 array of samples in [-1.0, 1.0]
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("numpy is required for in-memory audio decoding")
+    
+    cmd = [
+        ffmpeg_path,
+        "-hide_banner",
+        "-loglevel", "error",
+        "-nostdin",
+    ]
+    if start_time > 0:
+        cmd.extend(["-ss", str(start_time)])
+    cmd.extend(["-i", source_path])
+    if duration is not None and duration > 0:
+        cmd.extend(["-t", str(duration)])
+    cmd.extend([
+        "-ac", "1",
+        "-ar", str(SAMPLE_RATE),
+        "-filter:a", f"volume={volume_boost}",
+        "-vn",
+        "-f", "s16le",
+        "-acodec", "pcm_s16le",
+        "pipe:1",
+    ])
+    
+    # Preallocate for the expected length (+1 s slack); grows if the probe was short
+    estimate = duration if duration else (expected_duration or 60.0)
+    capacity = int(estimate * SAMPLE_RATE) + SAMPLE_RATE
+    samples = np.empty(capacity, dtype=np.float32)
+    filled = 0
+    
+    raw = bytearray(PCM_READ_BLOCK)
+    view = memoryview(raw)
+    carry = 0  # Odd trailing byte from the previous read
+    scale = np.float32(1.0 / 32768.0)
+    
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stderr_chunks = []
+    stderr_reader = threading.Thread(
+        target=lambda: stderr_chunks.append(proc.stderr.read()), daemon=True,
+    )
+    stderr_reader.start()
+    
+    try:
+        while True:
+            n = proc.stdout.readinto(view[carry:])
+            if not n:
+                break
+            available = carry + n
+            count = available // 2
+            if filled + count > capacity:
+                capacity = max(filled + count, int(capacity * 1.5))
+                grown = np.empty(capacity, dtype=np.float32)
+                grown[:filled] = samples[:filled]
+                samples = grown
+            pcm = np.frombuffer(raw, dtype=np.int16, count=count)
+            np.multiply(pcm, scale, out=samples[filled:filled + count], casting="unsafe")
+            filled += count
+            carry = available - count * 2
+            if carry:
+                raw[0] = raw[available - 1]
+    finally:
+        proc.stdout.close()
+        returncode = proc.wait()
+        stderr_reader.join(timeout=5)
+    
+    if returncode != 0:
+        stderr = b"".join(c for c in stderr_chunks if c).decode("utf-8", errors="replace")
+        raise RuntimeError(f"FFmpeg decode failed (exit {returncode}): {stderr.strip()}")
+    
+    return samples[:filled]
+
+
 class ChunkProcessor:
     """
     Manages parallel chunk extraction and transcription.
@@ -87,9 +238,11 @@ class ChunkProcessor:
     Processing flow:
     1. Probe total duration with ffprobe
     2. Single-pass mode (default): Process entire file with native VAD
-    3. Chunked mode (optional): Split into chunks for very long files
-    4. Extract chunks in parallel (I/O bound)
-    5. Transcribe chunks sequentially (GPU bound)
+    3. Chunked mode (optional): Split into chunks for very long files,
+       cut inside VAD-detected silences (fixed overlapping windows as fallback)
+    4. Extract chunks in parallel (I/O bound) on a producer thread
+    5. Transcribe chunks sequentially (GPU bound) as soon as each is extracted,
+       with extraction throttled by a buffer budget
     6. Merge all segments with corrected timestamps
     """
     
@@ -102,6 +255,13 @@ class ChunkProcessor:
         ffmpeg_path: Optional[str] = None,
         volume_boost: str = "3",
         use_chunking: bool = False,  # Default to False - let faster-whisper use native VAD
+        in_memory: bool = True,
+        max_buffered_mb: float = 256.0,
+        vad_chunking: bool = True,
+        multilingual: bool = False,
+        language_candidates: Optional[List[str]] = None,
+        cpu_farm=None,
+        telemetry=None,
     ):
         """
         Initialize ChunkProcessor.
@@ -115,12 +275,34 @@ class ChunkProcessor:
             volume_boost: Audio volume boost factor
             use_chunking: If False, process entire file at once (default, recommended)
                          If True, split into chunks (for very long files)
+            in_memory: Decode audio through an ffmpeg pipe into memory instead of
+                       writing a temporary WAV (falls back to WAV on failure)
+            max_buffered_mb: Budget for extracted audio waiting to be transcribed
+                             (RAM in in-memory mode, temp disk space otherwise)
+            vad_chunking: In chunked mode, cut chunks inside silences found by VAD
+                          instead of fixed overlapping windows
+            multilingual: Detect the language of every chunk and transcribe each
+                          chunk in its own language (code-switched meetings).
+                          Implies chunked mode; segments get a 'language' key
+            language_candidates: Languages a multilingual job may contain
+                                 (e.g. ["vi", "en"]); None allows any
+            cpu_farm: CpuFarm that transcribes VAD-aligned chunks in parallel
+                      worker processes (chunked mode); None transcribes in-process
+            telemetry: RunTelemetry that receives probe, decode, vad,
+                       detect_language, transcribe and split spans
         """
         self.chunk_duration = chunk_duration
         self.overlap = overlap
         self.max_extract_workers = max_extract_workers
         self.volume_boost = volume_boost
         self.use_chunking = use_chunking
+        self.in_memory = in_memory and NUMPY_AVAILABLE
+        self.max_buffered_mb = max_buffered_mb
+        self.vad_chunking = vad_chunking
+        self.multilingual = multilingual
+        self.language_candidates = [c.lower() for c in language_candidates] if language_candidates else None
+        self.cpu_farm = cpu_farm
+        self.telemetry = telemetry
         
         # Setup paths
         if temp_dir is None:
@@ -141,6 +323,17 @@ class ChunkProcessor:
         # Processing state
         self.chunks: List[AudioChunk] = []
         self.total_duration: float = 0.0
+        # Decoded audio of the last single-pass run (None when the WAV fallback was used)
+        self.audio: Optional["np.ndarray"] = None
+        # VAD speech regions of the last VAD-aligned schedule
+        self.speech_regions: Optional[List[Tuple[float, float]]] = None
+        # (source_path, audio) decoded ahead of process_parallel by prefetch_audio
+        self._prefetched: Optional[Tuple[str, Union[str, "np.ndarray"]]] = None
+    
+    def _probe_duration(self, source_path: str) -> float:
+        """Duration of the source in seconds (0.0 if ffprobe fails)."""
+        with timed(self.telemetry, "probe"):
+            return get_audio_duration_ffprobe(source_path) or 0.0
     
     def create_chunk_schedule(self, source_path: str) -> List[AudioChunk]:
         """
@@ -153,7 +346,7 @@ class ChunkProcessor:
             List of AudioChunk objects
         """
         # Get total duration
-        self.total_duration = get_audio_duration_ffprobe(source_path) or 0.0
+        self.total_duration = self._probe_duration(source_path)
         
         if self.total_duration <= 0:
             print("Warning: Could not determine duration, using single chunk")
@@ -183,19 +376,89 @@ class ChunkProcessor:
         
         return self.chunks
     
-    def extract_chunk(self, source_path: str, chunk: AudioChunk) -> str:
+    def create_vad_chunk_schedule(self, source_path: str) -> Optional[List[AudioChunk]]:
+        """
+        Create chunks whose boundaries fall inside silences detected by Silero VAD.
+        
+        The full audio is decoded once in memory; each chunk holds a view into
+        that buffer, so no per-chunk extraction, overlap or deduplication is needed.
+        
+        Args:
+            source_path: Path to the source media file
+            
+        Returns:
+            List of AudioChunk objects, or None if VAD scheduling is unavailable
+        """
+        if not (self.in_memory and VAD_AVAILABLE):
+            return None
+        
+        self.total_duration = self._probe_duration(source_path)
+        audio = self.load_full_audio(source_path)
+        if isinstance(audio, str):
+            return None
+        
+        if self.total_duration <= 0:
+            self.total_duration = len(audio) / SAMPLE_RATE
+        
+        try:
+            with timed(self.telemetry, "vad"):
+                regions = get_speech_regions(audio)
+        except Exception as e:
+            print(f"VAD scheduling failed ({e}), using fixed chunks")
+            return None
+        self.speech_regions = regions
+        
+        target = min(self.chunk_duration, MULTILINGUAL_CHUNK_SECONDS) if self.multilingual else self.chunk_duration
+        bounds = plan_vad_chunks(regions, self.total_duration, target_duration=target)
+        print(f"Creating VAD-aligned schedule: {len(bounds)} chunks from "
+              f"{len(regions)} speech regions in {self.total_duration:.1f}s audio")
+        
+        self.chunks = []
+        for i, (start, end) in enumerate(bounds):
+            chunk = AudioChunk(index=i, start_time=start, end_time=end)
+            chunk.audio = audio[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)]
+            chunk.status = ChunkStatus.EXTRACTED
+            self.chunks.append(chunk)
+        
+        return self.chunks
+    
+    def extract_chunk(self, source_path: str, chunk: AudioChunk) -> Optional[str]:
         """
         Extract a single audio chunk using ffmpeg with fast seek.
         
+        In in-memory mode the samples are stored on chunk.audio; otherwise
+        a WAV file is written to the temp dir.
+        
         Args:
             source_path: Path to source media file
             chunk: AudioChunk object with timing info
             
         Returns:
-            Path to extracted chunk audio file
+            Path to extracted chunk audio file (None when decoded in memory)
         """
+        if chunk.audio is not None:
+            # Already sliced from the decoded audio (VAD-aligned schedule)
+            chunk.status = ChunkStatus.EXTRACTED
+            return None
+        
         chunk.status = ChunkStatus.EXTRACTING
         
+        if self.in_memory:
+            try:
+                with timed(self.telemetry, "decode"):
+                    chunk.audio = decode_audio_pcm(
+                        source_path,
+                        ffmpeg_path=self.ffmpeg_path,
+                        volume_boost=self.volume_boost,
+                        start_time=chunk.start_time,
+                        duration=chunk.duration if chunk.end_time > chunk.start_time else None,
+                    )
+                chunk.status = ChunkStatus.EXTRACTED
+                print(f"Extracted chunk {chunk.index + 1}: {chunk.start_time:.1f}s - {chunk.end_time:.1f}s")
+                return None
+            except Exception as e:
+                print(f"In-memory decode of chunk {chunk.index} failed ({e}), falling back to WAV")
+        
         # Generate unique chunk filename
         chunk_filename = f"chunk_{chunk.index:04d}_{int(chunk.start_time):06d}.wav"
         chunk_path = os.path.join(self.temp_dir, chunk_filename)
@@ -232,7 +495,8 @@ class ChunkProcessor:
         ])
         
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            with timed(self.telemetry, "decode"):
+                result = subprocess.run(cmd, capture_output=True, text=True, check=True)
             chunk.audio_path = chunk_path
             chunk.status = ChunkStatus.EXTRACTED
             print(f"Extracted chunk {chunk.index + 1}: {chunk.start_time:.1f}s - {chunk.end_time:.1f}s")
@@ -285,44 +549,199 @@ class ChunkProcessor:
         
         return deduped
     
+    def _detect_job_language(
+        self,
+        recognizer,
+        audio,
+        speech_regions: Optional[List[Tuple[float, float]]] = None,
+    ) -> Optional[str]:
+        """
+        Detect the language once for the whole job from a few speech windows.
+        
+        Returns:
+            Language to pass to every transcription call, or None to let each
+            call detect on its own (language set by the user, WAV fallback,
+            recognizer without fast detection, or low confidence)
+        """
+        if getattr(recognizer, "language", None) or isinstance(audio, str) or audio is None:
+            return None
+        if not hasattr(recognizer, "detect_language"):
+            return None
+        options = {}
+        if self.cpu_farm is not None:
+            # Run the language head in a farm worker; the parent keeps no model loaded
+            options["probabilities"] = self.cpu_farm.language_probabilities
+        with timed(self.telemetry, "detect_language"):
+            language, confidence = recognizer.detect_language(audio, speech_regions=speech_regions, **options)
+        if language and confidence >= LANGUAGE_PIN_CONFIDENCE:
+            return language
+        return None
+    
+    def _detect_chunk_language(
+        self,
+        recognizer,
+        chunk: AudioChunk,
+        previous: Optional[str],
+        job_language: Optional[str] = None,
+        probabilities: Optional[Callable] = None,
+    ) -> Optional[str]:
+        """
+        Detect one chunk's language from a single encoder pass (multilingual mode).
+        
+        Probabilities are restricted to language_candidates when set. An
+        uncertain chunk (short interjection, laughter) keeps the previous
+        chunk's language instead of flipping. When detection fails or finds
+        no candidate, the chunk falls back to the previous chunk's language,
+        then the job's detected language, then the first candidate.
+        
+        Args:
+            recognizer: FasterWhisperRecognizer
+            chunk: Chunk with its audio loaded
+            previous: Language of the previous chunk
+            job_language: Language detected for the job so far
+            probabilities: Language head to use (default: the CPU farm's, else the recognizer's)
+        
+        Returns:
+            Language for the chunk, or None to let Whisper detect it
+        """
+        fallback = previous or job_language
+        if fallback is None and self.language_candidates:
+            fallback = self.language_candidates[0]
+        if probabilities is None:
+            if self.cpu_farm is not None:
+                # Run the language head in a farm worker; the parent keeps no model loaded
+                probabilities = self.cpu_farm.language_probabilities
+            else:
+                probabilities = getattr(recognizer, "language_probabilities", None)
+        if chunk.audio is None or probabilities is None:
+            return fallback
+        try:
+            with timed(self.telemetry, "detect_language"):
+                probs = probabilities(chunk.audio[:30 * SAMPLE_RATE])
+        except Exception as e:
+            print(f"Language detection failed for chunk {chunk.index + 1} ({e})")
+            return fallback
+        if self.language_candidates:
+            probs = [(lang, p) for lang, p in probs if lang in self.language_candidates]
+            total = sum(p for _, p in probs)
+            probs = [(lang, p / total) for lang, p in probs] if total > 0 else []
+        if not probs:
+            return fallback
+        language, confidence = max(probs, key=lambda lp: lp[1])
+        if confidence < LANGUAGE_PIN_CONFIDENCE and previous:
+            return previous
+        return language
+    
     def process_parallel(
         self,
         source_path: str,
         recognizer,
         progress_callback: Optional[Callable[[int, int, str, float], None]] = None,
+        segment_callback: Optional[Callable[[List[dict], Optional[str]], None]] = None,
+        journal_key: Optional[str] = None,
     ) -> Tuple[List[dict], Optional[str]]:
         """
-        Process audio with parallel extraction and sequential transcription.
+        Process audio with parallel extraction pipelined into sequential transcription.
         
         Args:
             source_path: Path to source media file
             recognizer: FasterWhisperRecognizer instance
             progress_callback: Callback(completed_chunks, total_chunks, stage, eta_seconds)
+            segment_callback: Callback(segments, language) with finalized segments
+                              as they are produced (per segment in single-pass mode,
+                              per chunk in chunked mode), before the final merge
+            journal_key: Key of the job (source fingerprint + settings). When set,
+                         finished work is journaled in the temp dir and a re-run
+                         with the same key resumes after the last finished chunk
             
         Returns:
             Tuple of (merged segments, detected language)
         """
         start_time = time.time()
+        journal = None
+        if journal_key:
+            try:
+                journal = JobJournal(journal_key)
+            except Exception as e:
+                print(f"Warning: Job journal unavailable: {e}")
         
         # For faster-whisper: Use single-pass processing with native VAD
         # This properly detects sentence boundaries using silence detection
-        if not self.use_chunking:
+        multilingual = self.multilingual and not getattr(recognizer, "language", None)
+        if self.multilingual and not multilingual:
+            print("Multi-language mode ignored: source language is set explicitly")
+        
+        if not (self.use_chunking or multilingual):
             print("Single-pass mode - faster-whisper will use native VAD for sentence boundaries")
             
             # Get total duration for stats
-            self.total_duration = get_audio_duration_ffprobe(source_path) or 0.0
+            self.total_duration = self._probe_duration(source_path)
             print(f"Video duration: {self.total_duration:.1f}s")
             
             if progress_callback:
                 progress_callback(0, 1, "Extracting audio", 0)
             
-            # Extract full audio
-            full_audio = self._extract_full_audio(source_path)
+            # Decode full audio (in memory when possible, WAV file otherwise)
+            full_audio = self.load_full_audio(source_path)
+            
+            # Resume after the last journaled segment (needs the in-memory array to slice)
+            resumed, resume_at, language = [], 0.0, None
+            if journal is not None:
+                try:
+                    state = journal.open({"mode": "single", "duration": round(self.total_duration, 3)})
+                    if state.segments and not isinstance(full_audio, str):
+                        resumed, language = state.segments, state.language
+                        resume_at = resumed[-1]["end"]
+                        print(f"Resuming from job journal at {resume_at:.1f}s ({len(resumed)} segments done)")
+                        if segment_callback:
+                            segment_callback(resumed, language)
+                    elif state.segments:
+                        # Can't slice a WAV path; start over with a fresh journal
+                        journal.complete()
+                        journal = JobJournal(journal_key)
+                        journal.open({"mode": "single", "duration": round(self.total_duration, 3)})
+                except Exception as e:
+                    print(f"Warning: Could not read job journal: {e}")
+                    journal = None
+            
+            def on_segments(new_segments, lang):
+                if journal is not None:
+                    journal.record_segments(new_segments, lang)
+                if segment_callback:
+                    segment_callback(new_segments, lang)
+            
+            if not language:
+                if progress_callback:
+                    progress_callback(0, 1, "Detecting language...", 0)
+                language = self._detect_job_language(recognizer, full_audio)
             
             if progress_callback:
                 progress_callback(0, 1, "Transcribing with VAD...", 0)
             
-            segments, language = recognizer.transcribe(full_audio)
+            if resume_at > 0:
+                remaining = full_audio[int(resume_at * SAMPLE_RATE):]
+                if len(remaining) >= SAMPLE_RATE // 2:
+                    with timed(self.telemetry, "transcribe"):
+                        new_segments, lang = recognizer.transcribe_chunk(
+                            remaining, time_offset=resume_at, segment_callback=on_segments,
+                            language=language,
+                        )
+                else:
+                    new_segments, lang = [], None
+                segments = resumed + new_segments
+                language = language or lang
+            else:
+                with timed(self.telemetry, "transcribe"):
+                    segments, detected = recognizer.transcribe(
+                        full_audio, segment_callback=on_segments, language=language,
+                    )
+                language = language or detected
+            
+            if journal is not None:
+                if segments:
+                    journal.complete()
+                else:
+                    journal.close()
             
             total_time = time.time() - start_time
             print(f"Single-pass complete: {len(segments)} segments in {total_time:.1f}s")
@@ -335,11 +754,18 @@ class ChunkProcessor:
             
             return segments, language
         
-        # Chunked mode (for very long files)
-        print("Chunked mode - splitting audio for parallel processing")
+        # Chunked mode (for very long files, and per-chunk languages)
+        if multilingual:
+            print("Multi-language mode - detecting the language of every chunk")
+        else:
+            print("Chunked mode - splitting audio for parallel processing")
         
-        # Create chunk schedule
-        self.create_chunk_schedule(source_path)
+        # Create chunk schedule (cut inside silences when VAD is available)
+        vad_aligned = False
+        if self.vad_chunking:
+            vad_aligned = self.create_vad_chunk_schedule(source_path) is not None
+        if not vad_aligned:
+            self.create_chunk_schedule(source_path)
         total_chunks = len(self.chunks)
         
         if total_chunks == 0:
@@ -348,80 +774,180 @@ class ChunkProcessor:
         
         print(f"Processing {total_chunks} chunks from: {source_path}")
         
-        # Phase 1: Parallel extraction
-        extracted_chunks = []
+        # Chunks finished by an interrupted earlier run are taken from the journal
+        resumed_chunks = {}
+        if journal is not None:
+            try:
+                state = journal.open({
+                    "mode": "chunked",
+                    "schedule": [[round(c.start_time, 3), round(c.end_time, 3)] for c in self.chunks],
+                })
+                resumed_chunks = state.chunks
+            except Exception as e:
+                print(f"Warning: Could not read job journal: {e}")
+                journal = None
+        
+        # Phase 1+2: Pipelined extraction (I/O bound) and transcription (GPU bound).
+        # Extraction workers run ahead of the transcriber only as far as the
+        # buffer budget allows, so chunk N is transcribed as soon as it is ready.
         chunk_times = []  # Track processing times for ETA
+        all_segments = []
+        detected_language = None
+        completed = 0
+        
+        for chunk in self.chunks:
+            record = resumed_chunks.get(chunk.index)
+            if record is None:
+                continue
+            chunk.segments = record["segments"]
+            chunk.status = ChunkStatus.COMPLETED
+            all_segments.extend(chunk.segments)
+            if detected_language is None and record.get("language"):
+                detected_language = record["language"]
+            if segment_callback and chunk.segments:
+                segment_callback(chunk.segments, record.get("language"))
+            completed += 1
+        if resumed_chunks:
+            print(f"Resuming from job journal: {completed}/{total_chunks} chunks already done")
+        
+        # One detection up front keeps every chunk in the same language
+        # (VAD-aligned schedules have the full audio decoded already)
+        job_language = detected_language
+        chunk_language = None
+        language_seconds = {}  # multilingual: speech seconds per language
+        if multilingual:
+            job_language = None
+        elif job_language is None and vad_aligned and completed < total_chunks:
+            job_language = self._detect_job_language(recognizer, self.audio, self.speech_regions)
+            detected_language = job_language
+        
+        if self.cpu_farm is not None and vad_aligned and completed < total_chunks:
+            farm_segments, farm_language = self._transcribe_on_farm(
+                recognizer, detected_language, multilingual, journal,
+                progress_callback, segment_callback, completed, total_chunks,
+            )
+            all_segments.extend(farm_segments)
+            if detected_language is None:
+                detected_language = farm_language
+            # Chunks the farm failed on are left for the in-process loop below
+            completed = sum(1 for c in self.chunks if c.status == ChunkStatus.COMPLETED)
         
         if progress_callback:
-            progress_callback(0, total_chunks, "Extracting audio chunks", 0)
+            progress_callback(completed, total_chunks, "Extracting audio chunks", 0)
         
-        with ThreadPoolExecutor(max_workers=self.max_extract_workers) as executor:
-            future_to_chunk = {
-                executor.submit(self.extract_chunk, source_path, chunk): chunk
-                for chunk in self.chunks
-            }
-            
-            for future in as_completed(future_to_chunk):
-                chunk = future_to_chunk[future]
+        budget = _BufferBudget(int(self.max_buffered_mb * 1024 * 1024))
+        ready: "queue.Queue" = queue.Queue(maxsize=max(2, self.max_extract_workers * 2))
+        stop = threading.Event()
+        producer = threading.Thread(
+            target=self._produce_chunks,
+            args=(source_path, ready, budget, stop),
+            name="ChunkExtractor",
+            daemon=True,
+        )
+        producer.start()
+        
+        try:
+            while True:
+                item = ready.get()
+                if item is None:
+                    break
+                chunk, future, cost = item
+                
                 try:
                     future.result()
-                    extracted_chunks.append(chunk)
                 except Exception as e:
+                    chunk.status = ChunkStatus.FAILED
+                    chunk.error = str(e)
                     print(f"Chunk {chunk.index} extraction failed: {e}")
-        
-        # Sort by index for sequential transcription
-        extracted_chunks.sort(key=lambda c: c.index)
-        
-        # Phase 2: Sequential transcription (GPU bound)
-        all_segments = []
-        detected_language = None
-        completed = 0
-        
-        for chunk in extracted_chunks:
-            if chunk.audio_path is None:
-                continue
-            
-            chunk.status = ChunkStatus.TRANSCRIBING
-            chunk_start_time = time.time()
-            
-            if progress_callback:
-                # Calculate ETA based on average chunk time
-                if chunk_times:
-                    avg_time = sum(chunk_times) / len(chunk_times)
-                    remaining = (total_chunks - completed) * avg_time
-                else:
-                    remaining = 0
-                progress_callback(completed, total_chunks, f"Transcribing chunk {chunk.index + 1}/{total_chunks}", remaining)
-            
-            try:
-                # Transcribe with time offset
-                segments, lang = recognizer.transcribe_chunk(
-                    chunk.audio_path,
-                    time_offset=chunk.start_time,
-                )
-                
-                chunk.segments = segments
-                chunk.status = ChunkStatus.COMPLETED
-                all_segments.extend(segments)
-                
-                if detected_language is None and lang:
-                    detected_language = lang
+                    self._release_chunk_audio(chunk)
+                    budget.release(cost)
+                    completed += 1
+                    continue
                 
-                # Track timing
-                chunk_time = time.time() - chunk_start_time
-                chunk_times.append(chunk_time)
-                completed += 1
+                chunk.status = ChunkStatus.TRANSCRIBING
+                chunk_start_time = time.time()
                 
-                print(f"Transcribed chunk {chunk.index + 1}/{total_chunks} in {chunk_time:.1f}s")
+                if progress_callback:
+                    # Calculate ETA based on average chunk time
+                    if chunk_times:
+                        avg_time = sum(chunk_times) / len(chunk_times)
+                        remaining = (total_chunks - completed) * avg_time
+                    else:
+                        remaining = 0
+                    progress_callback(completed, total_chunks, f"Transcribing chunk {chunk.index + 1}/{total_chunks}", remaining)
                 
-            except Exception as e:
-                chunk.status = ChunkStatus.FAILED
-                chunk.error = str(e)
-                print(f"Error transcribing chunk {chunk.index}: {e}")
-                completed += 1
+                try:
+                    # Transcribe with time offset
+                    if multilingual:
+                        chunk_language = self._detect_chunk_language(
+                            recognizer, chunk, chunk_language, detected_language,
+                        )
+                    with timed(self.telemetry, "transcribe"):
+                        segments, lang = recognizer.transcribe_chunk(
+                            chunk.audio if chunk.audio is not None else chunk.audio_path,
+                            time_offset=chunk.start_time,
+                            language=chunk_language if multilingual else job_language,
+                        )
+                    if multilingual:
+                        chunk_language = lang or chunk_language
+                        for seg in segments:
+                            seg["language"] = chunk_language
+                    
+                    chunk.segments = segments
+                    chunk.status = ChunkStatus.COMPLETED
+                    all_segments.extend(segments)
+                    
+                    if detected_language is None and lang:
+                        detected_language = lang
+                    
+                    if journal is not None:
+                        journal.record_chunk(chunk.index, segments, lang)
+                    if segment_callback and segments:
+                        segment_callback(segments, lang)
+                    
+                    # Track timing
+                    chunk_time = time.time() - chunk_start_time
+                    chunk_times.append(chunk_time)
+                    
+                    print(f"Transcribed chunk {chunk.index + 1}/{total_chunks} in {chunk_time:.1f}s")
+                    
+                except Exception as e:
+                    chunk.status = ChunkStatus.FAILED
+                    chunk.error = str(e)
+                    print(f"Error transcribing chunk {chunk.index}: {e}")
+                finally:
+                    # Free the buffered audio right away so the producer can continue
+                    self._release_chunk_audio(chunk)
+                    budget.release(cost)
+                    completed += 1
+        finally:
+            stop.set()
+            budget.cancel()
+            # Drain so a producer blocked on a full queue can exit
+            while producer.is_alive():
+                try:
+                    ready.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            producer.join()
+        
+        if multilingual:
+            # Report the language with the most speech as the job language
+            for seg in all_segments:
+                lang = seg.get("language")
+                if lang:
+                    language_seconds[lang] = language_seconds.get(lang, 0.0) + seg["end"] - seg["start"]
+            if language_seconds:
+                detected_language = max(language_seconds, key=language_seconds.get)
+                summary = ", ".join(f"{lang} {secs:.0f}s" for lang, secs in
+                                    sorted(language_seconds.items(), key=lambda kv: -kv[1]))
+                print(f"Languages spoken: {summary}")
         
-        # Phase 3: Merge and deduplicate
-        merged_segments = self._deduplicate_segments(all_segments)
+        # Phase 3: Merge (VAD-aligned chunks do not overlap, so only fixed windows need deduplication)
+        if vad_aligned:
+            merged_segments = sorted(all_segments, key=lambda s: s["start"])
+        else:
+            merged_segments = self._deduplicate_segments(all_segments)
         
         # Re-index segments
         for i, seg in enumerate(merged_segments, start=1):
@@ -436,8 +962,208 @@ class ChunkProcessor:
         # Cleanup temp files
         self._cleanup_chunks()
         
+        if journal is not None:
+            if any(c.status == ChunkStatus.FAILED for c in self.chunks):
+                # Keep it so a re-run retries only the failed chunks
+                journal.close()
+            else:
+                journal.complete()
+        
         return merged_segments, detected_language
     
+    def _transcribe_on_farm(
+        self,
+        recognizer,
+        language: Optional[str],
+        multilingual: bool,
+        journal: Optional[JobJournal],
+        progress_callback,
+        segment_callback,
+        completed: int,
+        total_chunks: int,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Transcribe the pending VAD-aligned chunks on the CPU farm.
+        
+        All chunks are submitted at once; results are consumed in index order
+        so callbacks see segments in time order. The parent shifts chunk-relative
+        timestamps and splits long segments. A chunk whose worker fails is
+        left unfinished for the in-process transcription loop.
+        
+        In multilingual mode every chunk's language is chosen up front with
+        _detect_chunk_language (candidates, low-confidence fallback), the
+        language heads running in parallel on the workers.
+        
+        Args:
+            language: Job language (fixed, or the fallback in multilingual mode)
+        
+        Returns:
+            Tuple of (segments of the finished chunks, first detected language)
+        """
+        pending = [c for c in self.chunks if c.status != ChunkStatus.COMPLETED and c.audio is not None]
+        chunk_languages = {c.index: language for c in pending}
+        if multilingual:
+            detections = {
+                c.index: self.cpu_farm.submit_language_probabilities(c.audio[:30 * SAMPLE_RATE])
+                for c in pending
+            }
+            previous = None
+            for c in pending:
+                previous = self._detect_chunk_language(
+                    recognizer, c, previous, language,
+                    probabilities=lambda _samples, future=detections[c.index]: future.result(),
+                )
+                chunk_languages[c.index] = previous
+        beam_size = getattr(recognizer, "beam_size", 5)
+        futures = {
+            c.index: self.cpu_farm.submit(c.audio, language=chunk_languages[c.index], beam_size=beam_size)
+            for c in pending
+        }
+        print(f"CPU farm: {len(pending)} chunks queued on {self.cpu_farm.workers} workers")
+        
+        start = time.time()
+        farm_segments: List[dict] = []
+        first_language = None
+        finished = 0
+        for chunk in pending:
+            try:
+                # Waiting on the workers is the farm's transcription time
+                with timed(self.telemetry, "transcribe"):
+                    raw, lang = futures[chunk.index].result()
+            except Exception as e:
+                print(f"CPU farm failed on chunk {chunk.index + 1} ({e}); retrying in-process")
+                continue
+            
+            for seg in raw:
+                seg["start"] += chunk.start_time
+                seg["end"] += chunk.start_time
+                for word in seg.get("words") or []:
+                    word["start"] += chunk.start_time
+                    word["end"] += chunk.start_time
+            with timed(self.telemetry, "split"):
+                segments = recognizer._split_long_segments(raw)
+            lang = chunk_languages[chunk.index] or lang
+            if multilingual:
+                for seg in segments:
+                    seg["language"] = lang
+            
+            chunk.segments = segments
+            chunk.status = ChunkStatus.COMPLETED
+            farm_segments.extend(segments)
+            first_language = first_language or lang
+            if journal is not None:
+                journal.record_chunk(chunk.index, segments, lang)
+            if segment_callback and segments:
+                segment_callback(segments, lang)
+            self._release_chunk_audio(chunk)
+            
+            completed += 1
+            finished += 1
+            if progress_callback:
+                remaining = (len(pending) - finished) * (time.time() - start) / finished
+                progress_callback(completed, total_chunks,
+                                  f"Transcribed chunk {chunk.index + 1}/{total_chunks} on CPU farm", remaining)
+        
+        return farm_segments, first_language
+    
+    def _produce_chunks(
+        self,
+        source_path: str,
+        ready: "queue.Queue",
+        budget: "_BufferBudget",
+        stop: threading.Event,
+    ):
+        """Submit chunk extractions in index order, blocking while the buffer budget is full."""
+        bytes_per_second = SAMPLE_RATE * (4 if self.in_memory else 2)  # float32 in RAM / s16 WAV on disk
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_extract_workers) as executor:
+                for chunk in self.chunks:
+                    if chunk.status == ChunkStatus.COMPLETED:
+                        continue  # resumed from the job journal
+                    duration = chunk.duration if chunk.duration > 0 else self.chunk_duration
+                    cost = int(duration * bytes_per_second)
+                    if not budget.acquire(cost, stop):
+                        break
+                    future = executor.submit(self.extract_chunk, source_path, chunk)
+                    while not stop.is_set():
+                        try:
+                            ready.put((chunk, future, cost), timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+                    if stop.is_set():
+                        break
+        finally:
+            while True:
+                try:
+                    ready.put(None, timeout=0.1)
+                    break
+                except queue.Full:
+                    if stop.is_set():
+                        break
+    
+    def _release_chunk_audio(self, chunk: AudioChunk):
+        """Drop a chunk's extracted audio (array or temp file) once it is transcribed."""
+        chunk.audio = None
+        if chunk.audio_path and os.path.exists(chunk.audio_path):
+            try:
+                os.remove(chunk.audio_path)
+            except Exception as e:
+                print(f"Warning: Could not remove temp file {chunk.audio_path}: {e}")
+        chunk.audio_path = None
+    
+    def prefetch_audio(self, source_path: str) -> bool:
+        """
+        Decode the full audio ahead of process_parallel.
+        
+        Lets a job scheduler run the CPU-bound decode while the GPU is still
+        busy with another job; process_parallel then picks up the result.
+        Does nothing in fixed-window chunked mode, which decodes per chunk.
+        
+        Args:
+            source_path: Path to the source media file
+            
+        Returns:
+            True if audio was decoded
+        """
+        chunked = self.use_chunking or self.multilingual
+        if chunked and not (self.vad_chunking and VAD_AVAILABLE and self.in_memory):
+            return False
+        self.total_duration = self._probe_duration(source_path)
+        self._prefetched = (source_path, self.load_full_audio(source_path))
+        return True
+    
+    def load_full_audio(self, source_path: str) -> Union[str, "np.ndarray"]:
+        """
+        Decode the full audio track for single-pass transcription.
+        
+        Returns:
+            float32 sample array when in-memory decoding succeeds,
+            otherwise the path to an extracted WAV file
+        """
+        if self._prefetched is not None:
+            prefetched_path, audio = self._prefetched
+            self._prefetched = None
+            if prefetched_path == source_path:
+                return audio
+        
+        self.audio = None
+        if self.in_memory:
+            try:
+                with timed(self.telemetry, "decode"):
+                    self.audio = decode_audio_pcm(
+                        source_path,
+                        ffmpeg_path=self.ffmpeg_path,
+                        volume_boost=self.volume_boost,
+                        expected_duration=self.total_duration or None,
+                    )
+                print(f"Decoded audio in memory: {len(self.audio) / SAMPLE_RATE:.1f}s")
+                return self.audio
+            except Exception as e:
+                print(f"In-memory decode failed ({e}), falling back to WAV extraction")
+        with timed(self.telemetry, "decode"):
+            return self._extract_full_audio(source_path)
+    
     def _extract_full_audio(self, source_path: str) -> str:
         """Extract full audio for single-chunk mode."""
         audio_path = os.path.join(self.temp_dir, "full_audio.wav")
@@ -462,6 +1188,7 @@ class ChunkProcessor:
     def _cleanup_chunks(self):
         """Remove temporary chunk files."""
         for chunk in self.chunks:
+            chunk.audio = None
             if chunk.audio_path and os.path.exists(chunk.audio_path):
                 try:
                     os.remove(chunk.audio_path)
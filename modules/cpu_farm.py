@@ -0,0 +1,242 @@
+"""
+Multi-process CPU transcription for DogeAutoSub.
+On machines without CUDA a single WhisperModel leaves most cores idle, so
+the CPU farm runs a pool of worker processes, each holding its own int8
+model with a few intra-op threads, and transcribes VAD-aligned chunks in
+parallel. The parent shifts, splits and merges the segments by timestamp.
+
+Workers are spawned once and kept (with their models loaded) for later jobs.
+"""
+
+import atexit
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+# CTranslate2 scales well up to ~4 intra-op threads per model on CPU;
+# beyond that, more processes beat more threads
+CPU_FARM_THREADS_PER_WORKER = 4
+# Each int8 worker holds its own model copy; cap the count to bound RAM
+CPU_FARM_MAX_WORKERS = 16
+
+# ── Worker process state ────────────────────────────────────────
+
+_worker_model = None
+
+
+def plan_cpu_farm(
+    cores: Optional[int] = None,
+    threads_per_worker: int = CPU_FARM_THREADS_PER_WORKER,
+    max_workers: int = CPU_FARM_MAX_WORKERS,
+) -> Tuple[int, int]:
+    """
+    Split the machine's cores into worker processes.
+
+    Args:
+        cores: Logical cores to use (default: os.cpu_count())
+        threads_per_worker: cpu_threads of each worker's model
+        max_workers: Upper bound on worker processes
+
+    Returns:
+        Tuple of (workers, cpu_threads per worker)
+    """
+    cores = cores or os.cpu_count() or 1
+    threads = max(1, min(threads_per_worker, cores))
+    workers = max(1, min(max_workers, cores // threads))
+    # Leftover cores go to the workers as extra threads
+    return workers, max(threads, cores // workers)
+
+
+def _init_worker(model_size: str, compute_type: str, cpu_threads: int, download_root: Optional[str]):
+    """Load the worker's model once per process."""
+    global _worker_model
+    from faster_whisper import WhisperModel
+    _worker_model = WhisperModel(
+        model_size,
+        device="cpu",
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+        num_workers=1,
+        download_root=download_root,
+    )
+
+
+def _transcribe_in_worker(audio, language: Optional[str], beam_size: int) -> Tuple[List[dict], Optional[str]]:
+    """Transcribe one chunk in a worker; returns plain segment dicts relative to the chunk."""
+    segments_gen, info = _worker_model.transcribe(
+        audio,
+        language=language,
+        beam_size=beam_size,
+        vad_filter=True,
+        vad_parameters=dict(min_silence_duration_ms=500),
+        word_timestamps=True,
+    )
+    segments = []
+    for segment in segments_gen:
+        segments.append({
+            "start": segment.start,
+            "end": segment.end,
+            "text": segment.text.strip(),
+            "words": [
+                {"start": w.start, "end": w.end, "word": w.word, "probability": w.probability}
+                for w in (segment.words or [])
+            ],
+        })
+    return segments, info.language
+
+
+def _language_probabilities_in_worker(samples) -> List[Tuple[str, float]]:
+    """Whisper's language head on up to 30 s of samples (encoder only)."""
+    from faster_whisper.audio import pad_or_trim
+    extractor = _worker_model.feature_extractor
+    features = pad_or_trim(extractor(samples)[:, :extractor.nb_max_frames])
+    encoder_output = _worker_model.encode(features)
+    results = _worker_model.model.detect_language(encoder_output)[0]
+    # Tokens look like "<|en|>"
+    return [(token[2:-2], probability) for token, probability in results]
+
+
+class CpuFarm:
+    """Pool of worker processes, each with its own int8 WhisperModel."""
+
+    def __init__(
+        self,
+        model_size: str,
+        workers: Optional[int] = None,
+        cpu_threads: Optional[int] = None,
+        compute_type: str = "int8",
+        download_root: Optional[str] = None,
+    ):
+        """
+        Initialize CpuFarm (processes start on first use).
+
+        Args:
+            model_size: faster-whisper model name (e.g. "large-v3-turbo")
+            workers: Worker processes (default: cores / cpu_threads)
+            cpu_threads: Intra-op threads per worker (default: 4)
+            compute_type: CTranslate2 compute type of the workers
+            download_root: Model download directory
+        """
+        planned_workers, planned_threads = plan_cpu_farm(
+            threads_per_worker=cpu_threads or CPU_FARM_THREADS_PER_WORKER,
+        )
+        self.model_size = model_size
+        self.workers = workers or planned_workers
+        if cpu_threads is None:
+            # Spread the cores over an explicitly chosen worker count
+            cpu_threads = planned_threads if not workers else max(1, (os.cpu_count() or 1) // workers)
+        self.cpu_threads = cpu_threads
+        self.compute_type = compute_type
+        if download_root is None:
+            download_root = os.path.join(os.path.dirname(__file__), "models", "faster_whisper")
+        self.download_root = download_root
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                print(f"Starting CPU farm: {self.workers} workers x {self.cpu_threads} threads "
+                      f"({self.model_size}, {self.compute_type})")
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    initializer=_init_worker,
+                    initargs=(self.model_size, self.compute_type, self.cpu_threads, self.download_root),
+                )
+            return self._executor
+
+    def submit(self, audio, language: Optional[str] = None, beam_size: int = 5) -> Future:
+        """
+        Queue a chunk for transcription.
+
+        Args:
+            audio: 16 kHz mono float32 samples of the chunk
+            language: Language code, or None to detect in the worker
+            beam_size: Beam size
+
+        Returns:
+            Future resolving to (segments relative to the chunk, language)
+        """
+        return self._get_executor().submit(_transcribe_in_worker, audio, language, beam_size)
+    
+    def submit_language_probabilities(self, samples) -> Future:
+        """
+        Queue Whisper's language head on up to 30 s of samples.
+
+        Returns:
+            Future resolving to (language code, probability) pairs
+        """
+        return self._get_executor().submit(_language_probabilities_in_worker, samples)
+
+    def language_probabilities(self, samples) -> List[Tuple[str, float]]:
+        """
+        Run Whisper's language head in a worker (see FasterWhisperRecognizer.detect_language).
+        
+        Returns:
+            (language code, probability) pairs, most likely first
+        """
+        return self.submit_language_probabilities(samples).result()
+
+    def close(self):
+        """Stop the worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+# ── Shared instances ─────────────────────────────────────────────
+
+_FarmKey = Tuple[str, int, str]
+_farms: Dict[_FarmKey, CpuFarm] = {}
+_farm_users: Dict[_FarmKey, int] = {}
+_farms_lock = threading.Lock()
+
+
+def acquire_cpu_farm(
+    model_size: str,
+    workers: Optional[int] = None,
+    compute_type: str = "int8",
+) -> CpuFarm:
+    """
+    Return the process-wide CPU farm for a model (created on first use).
+    
+    Farms are reference counted: concurrent jobs share a farm, and a farm is
+    only shut down while no job holds it. Idle farms of other settings are
+    closed when a new one starts, so one set of workers holds models in RAM.
+    Pair every call with release_cpu_farm.
+    
+    Args:
+        model_size: faster-whisper model name (e.g. "large-v3-turbo")
+        workers: Worker processes (None = one per 4 cores)
+        compute_type: CTranslate2 compute type of the workers (tuned profile or int8)
+    """
+    key = (model_size, workers or 0, compute_type)
+    with _farms_lock:
+        farm = _farms.get(key)
+        if farm is None:
+            for other in [k for k in _farms if _farm_users.get(k, 0) == 0]:
+                _farm_users.pop(other, None)
+                _farms.pop(other).close()
+            farm = _farms[key] = CpuFarm(model_size, workers=workers, compute_type=compute_type)
+        _farm_users[key] = _farm_users.get(key, 0) + 1
+        return farm
+
+
+def release_cpu_farm(farm: CpuFarm):
+    """Give a farm back; its workers stay loaded for the next job."""
+    with _farms_lock:
+        for key, candidate in _farms.items():
+            if candidate is farm:
+                _farm_users[key] = max(0, _farm_users.get(key, 0) - 1)
+                return
+
+
+@atexit.register
+def _shutdown_farms():
+    with _farms_lock:
+        for farm in _farms.values():
+            farm.close()
+        _farms.clear()
+        _farm_users.clear()
@@ -6,11 +6,24 @@ Uses CTranslate2 for GPU-accelerated transcription with 4x+ speed improvement.
 
 import os
 import sys
-from typing import Callable, List, Optional, Tuple
+import time
+from typing import Callable, List, Optional, Tuple, Union
+
+from modules.auto_tune import load_tuning_profile
+from modules.model_pool import ModelKey, WhisperModelPool, get_model_pool, model_key
+from modules.telemetry import timed
+from modules.vad_scheduler import (
+    SAMPLE_RATE,
+    VAD_AVAILABLE,
+    get_speech_regions,
+    plan_speech_windows,
+)
 
 # Check for faster-whisper availability
 try:
+    import numpy as np
     from faster_whisper import WhisperModel, BatchedInferencePipeline
+    from faster_whisper.audio import pad_or_trim
     FASTER_WHISPER_AVAILABLE = True
 except ImportError:
     FASTER_WHISPER_AVAILABLE = False
@@ -29,6 +42,29 @@ except ImportError:
     VRAM_GB = 0
 
 
+# VRAM requirements (approximate) for float16
+MODEL_VRAM_GB = {
+    "tiny": 1.0,
+    "base": 1.5,
+    "small": 2.5,
+    "medium": 5.0,
+    "large": 10.0,
+    "large-v2": 10.0,
+    "large-v3": 10.0,
+    "large-v3-turbo": 6.0,
+    "turbo": 6.0,
+    "distil-large-v3": 6.0,
+}
+
+# Fast language detection: encoder-only passes over a few windows of speech
+LANGUAGE_DETECT_WINDOWS = 3
+LANGUAGE_DETECT_WINDOW_SECONDS = 30.0
+# VAD runs over this much audio at a time until enough speech is found
+LANGUAGE_DETECT_SCAN_SECONDS = 120.0
+# A file path is decoded only this far (enough for the windows after an intro)
+LANGUAGE_DETECT_DECODE_SECONDS = 600.0
+
+
 def get_optimal_compute_type(model_size: str, device: str) -> str:
     """
     Determine optimal compute type based on available resources.
@@ -40,21 +76,7 @@ def get_optimal_compute_type(model_size: str, device: str) -> str:
     if device == "cpu":
         return "int8"
     
-    # VRAM requirements (approximate) for float16
-    vram_requirements = {
-        "tiny": 1.0,
-        "base": 1.5,
-        "small": 2.5,
-        "medium": 5.0,
-        "large": 10.0,
-        "large-v2": 10.0,
-        "large-v3": 10.0,
-        "large-v3-turbo": 6.0,
-        "turbo": 6.0,
-        "distil-large-v3": 6.0,
-    }
-    
-    required = vram_requirements.get(model_size.lower(), 5.0)
+    required = MODEL_VRAM_GB.get(model_size.lower(), 5.0)
     
     if VRAM_GB >= required * 1.2:  # 20% headroom
         return "float16"
@@ -64,6 +86,32 @@ def get_optimal_compute_type(model_size: str, device: str) -> str:
         return "int8"
 
 
+def estimate_model_memory_gb(model_size: str, compute_type: str) -> float:
+    """Rough memory footprint of a loaded model, used for pool budgeting."""
+    required = MODEL_VRAM_GB.get(model_size.lower(), 5.0)
+    if compute_type.startswith("int8"):
+        return required * 0.5
+    return required
+
+
+def _word_to_dict(word) -> dict:
+    """Convert a faster-whisper Word (or an already-converted dict) to a plain dict."""
+    if isinstance(word, dict):
+        return dict(word)
+    return {
+        "start": word.start,
+        "end": word.end,
+        "word": word.word,
+        "probability": getattr(word, "probability", None),
+    }
+
+
+def _default_ffmpeg() -> str:
+    """Bundled ffmpeg if present, else ffmpeg from PATH."""
+    bundled = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ffmpeg", "bin", "ffmpeg.exe")
+    return bundled if os.path.exists(bundled) else "ffmpeg"
+
+
 class FasterWhisperRecognizer:
     """
     GPU-optimized Whisper transcription using faster-whisper (CTranslate2).
@@ -73,6 +121,7 @@ class FasterWhisperRecognizer:
     - Built-in VAD filtering to skip silence
     - Batched inference for additional speedup
     - Auto compute type selection based on VRAM
+    - Models are borrowed from a process-wide pool and stay warm between jobs
     """
     
     def __init__(
@@ -82,6 +131,10 @@ class FasterWhisperRecognizer:
         device: Optional[str] = None,
         compute_type: Optional[str] = None,
         download_root: Optional[str] = None,
+        pool: Optional[WhisperModelPool] = None,
+        batched: bool = True,
+        use_profile: bool = True,
+        load: bool = True,
     ):
         """
         Initialize FasterWhisperRecognizer.
@@ -92,6 +145,14 @@ class FasterWhisperRecognizer:
             device: "cuda" or "cpu" (auto-detected if None)
             compute_type: "float16", "int8_float16", or "int8" (auto-selected if None)
             download_root: Custom model download directory
+            pool: Model pool to borrow from (process-wide pool if None)
+            batched: Transcribe with BatchedInferencePipeline when available (CUDA)
+            use_profile: Use settings measured by AutoTune.py for this model and
+                         device (compute type, beam size, batch size, cpu_threads);
+                         an explicit compute_type still wins
+            load: Borrow the model from the pool now; False defers it until the
+                  first call that needs it (e.g. CPU farm jobs that only retry
+                  failed chunks in-process)
         """
         if not FASTER_WHISPER_AVAILABLE:
             raise ImportError(
@@ -100,6 +161,10 @@ class FasterWhisperRecognizer:
             )
         
         self.language = language if language != "auto" else None
+        self.use_batched = batched
+        self._pooled = None
+        # RunTelemetry of the current job (segment splitting is timed as "split")
+        self.telemetry = None
         
         # Map friendly names to faster-whisper model names
         model_mapping = {
@@ -114,8 +179,19 @@ class FasterWhisperRecognizer:
         else:
             self.device = device
         
+        # Tuned settings for this machine, if AutoTune.py was run
+        profile = load_tuning_profile(self.model_size, self.device) if use_profile else None
+        self.beam_size = (profile or {}).get("beam_size", 5)
+        self.batch_size = (profile or {}).get("batch_size", 16)
+        cpu_threads = (profile or {}).get("cpu_threads", 0)
+        self._cpu_threads = cpu_threads
+        
         # Auto-select compute type
-        if compute_type is None:
+        if compute_type is None and profile and profile.get("compute_type"):
+            self.compute_type = profile["compute_type"]
+            print(f"Using tuned profile: {self.compute_type}, beam {self.beam_size}, "
+                  f"batch {self.batch_size}" + (f", {cpu_threads} threads" if cpu_threads else ""))
+        elif compute_type is None:
             self.compute_type = get_optimal_compute_type(self.model_size, self.device)
         else:
             self.compute_type = compute_type
@@ -124,98 +200,249 @@ class FasterWhisperRecognizer:
         if download_root is None:
             download_root = os.path.join(os.path.dirname(__file__), "models", "faster_whisper")
         os.makedirs(download_root, exist_ok=True)
+        self._download_root = download_root
         
-        print(f"Loading faster-whisper model: {self.model_size}")
-        print(f"  Device: {self.device}, Compute type: {self.compute_type}")
-        
+        self._pool = pool or get_model_pool()
+        self.model = None
+        self.batched_model = None
+        if load:
+            self.ensure_loaded()
+    
+    @property
+    def pool_key(self) -> ModelKey:
+        """Model pool key of this recognizer (jobs with equal keys share the model)."""
+        return model_key(self.model_size, self.device, self.compute_type)
+    
+    def ensure_loaded(self):
+        """Borrow the model from the pool if this recognizer doesn't hold it yet."""
+        if self._pooled is not None:
+            return
         try:
-            self.model = WhisperModel(
+            self._pooled = self._pool.acquire(
                 self.model_size,
-                device=self.device,
-                compute_type=self.compute_type,
-                download_root=download_root,
+                self.device,
+                self.compute_type,
+                download_root=self._download_root,
+                memory_gb=estimate_model_memory_gb(self.model_size, self.compute_type),
+                cpu_threads=self._cpu_threads,
             )
-            
-            # Create batched pipeline for additional speedup
-            if self.device == "cuda":
-                self.batched_model = BatchedInferencePipeline(model=self.model)
-            else:
-                self.batched_model = None
-                
-            print("faster-whisper model loaded successfully")
-            
         except Exception as e:
             print(f"Error loading faster-whisper model: {e}")
             raise
+        
+        self.model = self._pooled.model
+        # Batched pipeline for additional speedup (CUDA only)
+        self.batched_model = self._pooled.batched_model
+    
+    def close(self):
+        """Release the shared model back to the pool (it stays warm for the next job)."""
+        if self._pooled is not None:
+            self._pool.release(self._pooled)
+            self._pooled = None
+            self.model = None
+            self.batched_model = None
+    
+    def __enter__(self):
+        return self
     
-    def detect_language(self, audio_path: str) -> Optional[str]:
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def detect_language(
+        self,
+        audio: Union[str, "np.ndarray"],
+        max_windows: int = LANGUAGE_DETECT_WINDOWS,
+        window_seconds: float = LANGUAGE_DETECT_WINDOW_SECONDS,
+        speech_regions: Optional[List[Tuple[float, float]]] = None,
+        probabilities: Optional[Callable[["np.ndarray"], List[Tuple[str, float]]]] = None,
+        ffmpeg_path: Optional[str] = None,
+    ) -> Tuple[Optional[str], float]:
         """
-        Detect the language spoken in the audio.
+        Detect the spoken language from a few windows of speech.
+        
+        Only the encoder runs, once per window; no text is decoded. The first
+        max_windows * window_seconds of speech found by VAD are packed into
+        windows and the per-language probabilities are summed across them,
+        so a music intro or a single off-language line does not decide the
+        result.
         
         Args:
-            audio_path: Path to audio file
+            audio: Path to audio file, or 16 kHz mono float32 samples
+            max_windows: Number of speech windows to vote over
+            window_seconds: Seconds of speech per window (30 s = one encoder input)
+            speech_regions: Precomputed VAD regions in seconds (scanned if None)
+            probabilities: Language head to run on each window (default: this
+                           recognizer's model; the CPU farm passes its workers')
+            ffmpeg_path: ffmpeg used to decode the start of a file path
+                         (default: bundled or PATH)
             
         Returns:
-            Detected language code or None on error
+            Tuple of (language code, confidence 0-1); (None, 0.0) on error
         """
         try:
-            segments, info = self.model.transcribe(
-                audio_path,
-                beam_size=1,
-                vad_filter=True,
-            )
-            # Consume generator to get info
-            _ = list(segments)
-            detected = info.language
-            print(f"Detected language: {detected} (probability: {info.language_probability:.2f})")
-            return detected
+            start = time.time()
+            if isinstance(audio, str):
+                # Only the start of the file: the windows come from the first speech
+                from modules.chunk_processor import decode_audio_pcm
+                audio = decode_audio_pcm(
+                    audio,
+                    ffmpeg_path=ffmpeg_path or _default_ffmpeg(),
+                    volume_boost="1",
+                    duration=LANGUAGE_DETECT_DECODE_SECONDS,
+                )
+                if speech_regions is not None:
+                    decoded = len(audio) / SAMPLE_RATE
+                    speech_regions = [(s, min(e, decoded)) for s, e in speech_regions if s < decoded]
+            if probabilities is None:
+                self.ensure_loaded()
+                if not self.model.model.is_multilingual:
+                    return "en", 1.0
+                probabilities = self.language_probabilities
+            elif self.model_size.endswith(".en"):
+                return "en", 1.0
+            
+            windows = self._speech_windows(audio, max_windows, window_seconds, speech_regions)
+            if not windows:
+                return None, 0.0
+            
+            votes = {}
+            for pieces in windows:
+                samples = np.concatenate([
+                    audio[int(s * SAMPLE_RATE):int(e * SAMPLE_RATE)] for s, e in pieces
+                ])
+                for language, probability in probabilities(samples):
+                    votes[language] = votes.get(language, 0.0) + probability
+            
+            detected = max(votes, key=votes.get)
+            confidence = votes[detected] / len(windows)
+            print(f"Detected language: {detected} (confidence: {confidence:.2f}, "
+                  f"{len(windows)} speech windows in {time.time() - start:.1f}s)")
+            return detected, confidence
         except Exception as e:
             print(f"Error during language detection: {e}")
-            return None
+            return None, 0.0
+    
+    def language_probabilities(self, samples: "np.ndarray") -> List[Tuple[str, float]]:
+        """
+        Run the encoder on up to 30 s of samples and read Whisper's language head.
+        
+        Returns:
+            (language code, probability) pairs, most likely first
+        """
+        self.ensure_loaded()
+        extractor = self.model.feature_extractor
+        features = pad_or_trim(extractor(samples)[:, :extractor.nb_max_frames])
+        encoder_output = self.model.encode(features)
+        results = self.model.model.detect_language(encoder_output)[0]
+        # Tokens look like "<|en|>"
+        return [(token[2:-2], probability) for token, probability in results]
+    
+    def _speech_windows(
+        self,
+        audio: "np.ndarray",
+        max_windows: int,
+        window_seconds: float,
+        speech_regions: Optional[List[Tuple[float, float]]],
+    ) -> List[List[Tuple[float, float]]]:
+        """Pick detection windows from VAD speech (plain leading windows without VAD)."""
+        duration = len(audio) / SAMPLE_RATE
+        if speech_regions is None and VAD_AVAILABLE:
+            # Only scan as far as needed; VAD over a whole feature film takes a while
+            needed = max_windows * window_seconds
+            block = int(LANGUAGE_DETECT_SCAN_SECONDS * SAMPLE_RATE)
+            speech_regions, found, offset = [], 0.0, 0
+            while offset < len(audio) and found < needed:
+                base = offset / SAMPLE_RATE
+                for s, e in get_speech_regions(audio[offset:offset + block]):
+                    speech_regions.append((base + s, base + e))
+                    found += e - s
+                offset += block
+        
+        if speech_regions:
+            return plan_speech_windows(speech_regions, window_seconds, max_windows)
+        
+        return [
+            [(i * window_seconds, min((i + 1) * window_seconds, duration))]
+            for i in range(max_windows)
+            if i * window_seconds < duration
+        ]
     
     def transcribe(
         self,
-        audio_path: str,
+        audio_path: Union[str, "np.ndarray"],
         ffmpeg_path: Optional[str] = None,  # Kept for API compatibility
         progress_callback: Optional[Callable[[int], None]] = None,
         use_vad: bool = True,
-        batch_size: int = 16,
+        batch_size: Optional[int] = None,
         max_segment_length: float = 10.0,  # Max seconds per subtitle segment
+        batched: Optional[bool] = None,
+        segment_callback: Optional[Callable[[List[dict], Optional[str]], None]] = None,
+        language: Optional[str] = None,
     ) -> Tuple[List[dict], Optional[str]]:
         """
         Transcribe audio using faster-whisper.
         
         Args:
-            audio_path: Path to audio file
+            audio_path: Path to audio file, or 16 kHz mono float32 samples
             ffmpeg_path: Unused, kept for API compatibility
             progress_callback: Callback function for progress updates (0-100)
             use_vad: Enable Voice Activity Detection to skip silence
-            batch_size: Batch size for batched inference (GPU only)
+            batch_size: Batch size for batched inference (GPU only, None = tuned/default 16)
             max_segment_length: Maximum length of a subtitle segment in seconds
+            batched: Use the batched pipeline (None = recognizer default).
+                     The sequential path is kept for parity testing and CPU.
+            segment_callback: Called with (split segments, detected language) as each
+                              segment is finalized, while decoding continues
+            language: Language for this call (None = recognizer language / auto-detect)
             
         Returns:
             Tuple of (segments list, detected language code)
         """
         try:
-            if not os.path.exists(audio_path):
-                print(f"Error: Audio file not found at {audio_path}")
-                return [], None
+            if isinstance(audio_path, str):
+                if not os.path.exists(audio_path):
+                    print(f"Error: Audio file not found at {audio_path}")
+                    return [], None
+                print(f"Transcribing: {audio_path}")
+            else:
+                print(f"Transcribing in-memory audio: {len(audio_path) / 16000:.1f}s")
             
-            print(f"Transcribing: {audio_path}")
+            self.ensure_loaded()
             
-            # Use regular model (not batched) for word-level timestamps
-            # Word timestamps are needed for proper sentence segmentation
-            segments_gen, info = self.model.transcribe(
-                audio_path,
-                language=self.language,
-                beam_size=5,
-                vad_filter=use_vad,
-                vad_parameters=dict(min_silence_duration_ms=500),
-                word_timestamps=True,  # Enable word-level timestamps for sentence splitting
-            )
+            # Word timestamps are needed for proper sentence segmentation.
+            # The batched pipeline produces them too (faster-whisper >= 1.1) but
+            # requires VAD to cut the audio into batchable windows.
+            if batched is None:
+                batched = self.use_batched
+            language = language or self.language
+            batch_size = batch_size or self.batch_size
+            use_batched = batched and use_vad and self.batched_model is not None
+            
+            if use_batched:
+                segments_gen, info = self.batched_model.transcribe(
+                    audio_path,
+                    language=language,
+                    beam_size=self.beam_size,
+                    batch_size=batch_size,
+                    vad_filter=True,
+                    vad_parameters=dict(min_silence_duration_ms=500),
+                    word_timestamps=True,
+                )
+            else:
+                segments_gen, info = self.model.transcribe(
+                    audio_path,
+                    language=language,
+                    beam_size=self.beam_size,
+                    vad_filter=use_vad,
+                    vad_parameters=dict(min_silence_duration_ms=500),
+                    word_timestamps=True,  # Enable word-level timestamps for sentence splitting
+                )
+            mode = f"batched (batch_size={batch_size})" if use_batched else "sequential"
+            print(f"  Inference mode: {mode}")
             
-            # Convert generator to list and track progress
-            raw_segments = []
+            # Consume the generator, splitting each segment as soon as it is final
+            raw_count = 0
+            segments = []
             detected_language = info.language
             
             # Estimate total duration for progress (if available)
@@ -228,18 +455,21 @@ class FasterWhisperRecognizer:
                     "text": segment.text.strip(),
                     "words": segment.words if hasattr(segment, 'words') else None,
                 }
-                raw_segments.append(seg_dict)
+                raw_count += 1
+                
+                # Split long segments into subtitle-appropriate lengths
+                with timed(self.telemetry, "split"):
+                    split = self._split_long_segments([seg_dict], max_segment_length)
+                segments.extend(split)
+                if segment_callback and split:
+                    segment_callback(split, detected_language)
                 
                 # Update progress based on segment end time
                 if progress_callback and estimated_duration and estimated_duration > 0:
                     progress = min(75, int((segment.end / estimated_duration) * 75))
                     progress_callback(progress)
             
-            print(f"Raw transcription: {len(raw_segments)} segments")
-            
-            # Split long segments into subtitle-appropriate lengths
-            segments = self._split_long_segments(raw_segments, max_segment_length)
-            
+            print(f"Raw transcription: {raw_count} segments")
             print(f"After splitting: {len(segments)} segments, language: {detected_language}")
             
             if progress_callback:
@@ -263,6 +493,7 @@ class FasterWhisperRecognizer:
         Split long segments into subtitle-appropriate lengths.
         
         Uses word-level timestamps when available to split at natural breaks.
+        Split segments keep their words (as plain dicts) under the 'words' key.
         
         Args:
             segments: List of segment dicts with optional 'words' key
@@ -281,11 +512,14 @@ class FasterWhisperRecognizer:
             words = seg.get("words")
             # If segment is short enough, keep as-is, but only if not too short
             if (duration <= max_length and len(text) <= max_chars and duration >= MIN_SEGMENT_LENGTH and len(text) >= MIN_SEGMENT_CHARS):
-                result.append({
+                kept = {
                     "start": seg["start"],
                     "end": seg["end"],
                     "text": text,
-                })
+                }
+                if words:
+                    kept["words"] = [_word_to_dict(w) for w in words]
+                result.append(kept)
                 continue
             
             # If we have word timestamps, use them for intelligent splitting
@@ -302,6 +536,7 @@ class FasterWhisperRecognizer:
                     
                     if current_start is None:
                         current_start = word_start
+                    word_dict = _word_to_dict(word)
                     
                     potential_text = current_text + word_text
                     potential_duration = word_end - current_start
@@ -321,26 +556,32 @@ class FasterWhisperRecognizer:
                             "start": current_start,
                             "end": current_end,
                             "text": current_text.strip(),
+                            "words": current_words,
                         })
                         # Start new segment with this word
                         current_start = word_start
                         current_text = word_text
                         current_end = word_end
+                        current_words = [word_dict]
                     elif ends_sentence and potential_duration > max_length * 0.5:
                         # Split at sentence end if segment is getting long
                         current_text = potential_text
                         current_end = word_end
+                        current_words.append(word_dict)
                         result.append({
                             "start": current_start,
                             "end": current_end,
                             "text": current_text.strip(),
+                            "words": current_words,
                         })
                         current_start = None
                         current_text = ""
                         current_end = None
+                        current_words = []
                     else:
                         current_text = potential_text
                         current_end = word_end
+                        current_words.append(word_dict)
                 
                 # Don't forget the last segment
                 if current_text.strip():
@@ -348,12 +589,17 @@ class FasterWhisperRecognizer:
                         "start": current_start,
                         "end": current_end,
                         "text": current_text.strip(),
+                        "words": current_words,
                     })
             else:
                 # No word timestamps - split by character count with estimated timing
                 words_list = text.split()
                 if not words_list:
-                    result.append(seg)
+                    result.append({
+                        "start": seg["start"],
+                        "end": seg["end"],
+                        "text": text,
+                    })
                     continue
                     
                 chars_per_second = len(text) / max(duration, 0.1)
@@ -386,34 +632,55 @@ class FasterWhisperRecognizer:
     
     def transcribe_chunk(
         self,
-        audio_path: str,
+        audio_path: Union[str, "np.ndarray"],
         time_offset: float = 0.0,
         progress_callback: Optional[Callable[[int], None]] = None,
+        segment_callback: Optional[Callable[[List[dict], Optional[str]], None]] = None,
+        language: Optional[str] = None,
     ) -> Tuple[List[dict], Optional[str]]:
         """
         Transcribe an audio chunk and apply time offset to segments.
         
         Args:
-            audio_path: Path to the chunk audio file
+            audio_path: Path to the chunk audio file, or its float32 samples
             time_offset: Time offset to add to all segment timestamps
             progress_callback: Callback for progress updates
+            segment_callback: Called with finalized, already offset segments
+                              (see transcribe)
+            language: Language for this chunk (None = recognizer language / auto-detect)
             
         Returns:
             Tuple of (segments with adjusted timestamps, detected language)
         """
-        segments, language = self.transcribe(audio_path, progress_callback=progress_callback)
+        def shift(segments):
+            if time_offset > 0:
+                for seg in segments:
+                    seg["start"] += time_offset
+                    seg["end"] += time_offset
+                    for word in seg.get("words") or []:
+                        word["start"] += time_offset
+                        word["end"] += time_offset
+        
+        if segment_callback is None:
+            segments, detected = self.transcribe(
+                audio_path, progress_callback=progress_callback, language=language,
+            )
+            shift(segments)
+            return segments, detected
         
-        # Apply time offset to segments
-        if time_offset > 0:
-            for seg in segments:
-                seg["start"] += time_offset
-                seg["end"] += time_offset
+        # Offset each batch as it is finalized so the callback sees absolute times
+        def on_segments(new_segments, detected):
+            shift(new_segments)
+            segment_callback(new_segments, detected)
         
-        return segments, language
+        return self.transcribe(
+            audio_path, progress_callback=progress_callback,
+            segment_callback=on_segments, language=language,
+        )
     
     def translate(
         self,
-        audio_path: str,
+        audio_path: Union[str, "np.ndarray"],
         target_language: str,
         ffmpeg_path: Optional[str] = None,
         progress_callback: Optional[Callable[[int], None]] = None,
@@ -425,7 +692,7 @@ class FasterWhisperRecognizer:
         For other target languages, use external translation after transcription.
         
         Args:
-            audio_path: Path to audio file
+            audio_path: Path to audio file, or 16 kHz mono float32 samples
             target_language: Target language (only "en" supported natively)
             ffmpeg_path: Unused, kept for API compatibility
             progress_callback: Callback for progress updates
@@ -441,7 +708,8 @@ class FasterWhisperRecognizer:
                 segments, _ = self.transcribe(audio_path, progress_callback=progress_callback)
                 return segments
             
-            print(f"Translating audio to English: {audio_path}")
+            print("Translating audio to English")
+            self.ensure_loaded()
             
             segments_gen, info = self.model.transcribe(
                 audio_path,
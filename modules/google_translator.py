@@ -0,0 +1,146 @@
+"""
+Batched, concurrent Google Translate for DogeAutoSub.
+Packs many lines into newline-joined requests under the web endpoint's
+character limit, sends them from a small thread pool with retry and back-off,
+and reassembles the results in the original order.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Optional
+
+try:
+    from deep_translator import GoogleTranslator
+    GOOGLE_TRANSLATE_AVAILABLE = True
+except ImportError:
+    GOOGLE_TRANSLATE_AVAILABLE = False
+
+# deep_translator rejects payloads of 5000+ characters
+GOOGLE_MAX_CHARS = 4500
+GOOGLE_CONCURRENCY = 4
+GOOGLE_MAX_RETRIES = 3
+GOOGLE_RETRY_BACKOFF = 1.0  # seconds, doubled per retry
+
+
+def pack_char_batches(texts: List[str], max_chars: int = GOOGLE_MAX_CHARS) -> List[List[int]]:
+    """
+    Group consecutive line indices into newline-joined payloads under max_chars.
+
+    Lines that contain a newline themselves (multi-line SRT cues) or are
+    longer than max_chars get a batch of their own, since the line count of
+    the response is what maps translations back.
+
+    Returns:
+        List of batches, each a list of indices into texts
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_chars = 0
+
+    for i, text in enumerate(texts):
+        if "\n" in text or len(text) >= max_chars:
+            if current:
+                batches.append(current)
+                current, current_chars = [], 0
+            batches.append([i])
+            continue
+
+        cost = len(text) + 1  # joining newline
+        if current and current_chars + cost > max_chars:
+            batches.append(current)
+            current, current_chars = [], 0
+        current.append(i)
+        current_chars += cost
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def translate_texts_google(
+    texts: List[str],
+    src_lang: Optional[str],
+    dst_lang: str,
+    progress_callback: Optional[Callable[[int], None]] = None,
+    max_workers: int = GOOGLE_CONCURRENCY,
+    max_chars: int = GOOGLE_MAX_CHARS,
+    max_retries: int = GOOGLE_MAX_RETRIES,
+) -> List[str]:
+    """
+    Translate lines with Google Translate using batched, concurrent requests.
+
+    Args:
+        texts: Non-empty source lines
+        src_lang: Source language code (None or "auto" to detect)
+        dst_lang: Target language code
+        progress_callback: Optional callback with percent complete (0-100)
+        max_workers: Requests in flight at once
+        max_chars: Character limit per request
+        max_retries: Retries per request before giving up
+
+    Returns:
+        Translations aligned with texts (source line where translation failed)
+    """
+    if not GOOGLE_TRANSLATE_AVAILABLE:
+        print("Google Translate not available, returning original text")
+        return list(texts)
+    if not texts:
+        return []
+
+    source = src_lang if src_lang and src_lang != "auto" else "auto"
+    local = threading.local()
+
+    def _translator():
+        # One client per worker thread; requests sessions aren't shared
+        if getattr(local, "translator", None) is None:
+            local.translator = GoogleTranslator(source=source, target=dst_lang)
+        return local.translator
+
+    def _request(payload: str) -> str:
+        delay = GOOGLE_RETRY_BACKOFF
+        for attempt in range(max_retries + 1):
+            try:
+                return _translator().translate(payload) or ""
+            except Exception as e:
+                if attempt == max_retries:
+                    raise
+                print(f"Google translate retry {attempt + 1}/{max_retries} in {delay:.0f}s: {e}")
+                time.sleep(delay)
+                delay *= 2
+        return ""
+
+    def _translate_batch(lines: List[str]) -> List[str]:
+        if len(lines) == 1:
+            return [_request(lines[0]) or lines[0]]
+        out = _request("\n".join(lines)).split("\n")
+        if len(out) != len(lines):
+            # Google merged or split lines; translate this batch line by line
+            print(f"Warning: Google returned {len(out)} lines for {len(lines)}; retrying line by line")
+            return [_request(line) or line for line in lines]
+        return [o.strip() or line for o, line in zip(out, lines)]
+
+    batches = pack_char_batches(texts, max_chars=max_chars)
+    print(f"Translating {len(texts)} lines via Google in {len(batches)} requests "
+          f"(<= {max_chars} chars each, concurrency {max_workers})")
+
+    translations = list(texts)
+    done = 0
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            executor.submit(_translate_batch, [texts[i] for i in batch]): batch
+            for batch in batches
+        }
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                for i, text in zip(batch, future.result()):
+                    translations[i] = text
+            except Exception as e:
+                print(f"Google translate error ({len(batch)} lines left untranslated): {e}")
+
+            done += len(batch)
+            if progress_callback:
+                progress_callback(int((done / len(texts)) * 100))
+
+    return translations
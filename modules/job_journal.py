@@ -0,0 +1,159 @@
+"""
+Job journal for resumable transcription in DogeAutoSub.
+An append-only JSON-lines file in the temp dir recording every finished
+chunk (chunked mode) or batch of finalized segments (single-pass mode), so a
+job interrupted by a crash or GPU driver reset resumes where it stopped when
+the same source is re-run with the same settings.
+
+Line 1 is a header describing the job; each following line is one record.
+A torn last line (crash mid-write) is ignored on load.
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+JOURNAL_FORMAT_VERSION = 1
+
+DEFAULT_JOURNAL_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "temp", "journals"
+)
+
+# Journals of jobs that were never re-run are removed after this long
+JOURNAL_MAX_AGE_SECONDS = 7 * 24 * 3600
+
+
+@dataclass
+class JournalState:
+    """What an existing journal says was already done."""
+    chunks: Dict[int, dict] = field(default_factory=dict)  # index -> {"segments", "language"}
+    segments: List[dict] = field(default_factory=list)     # single-pass mode, in order
+    language: Optional[str] = None
+
+
+class JobJournal:
+    """Append-only record of finished transcription work for one job."""
+
+    def __init__(self, key: str, journal_dir: Optional[str] = None):
+        """
+        Initialize JobJournal.
+
+        Args:
+            key: Job key (source fingerprint + settings, see make_cache_key)
+            journal_dir: Directory for journal files (default: modules/temp/journals)
+        """
+        self.journal_dir = journal_dir or DEFAULT_JOURNAL_DIR
+        self.path = os.path.join(self.journal_dir, f"{key}.jsonl")
+        self._file = None
+        os.makedirs(self.journal_dir, exist_ok=True)
+        self._prune_stale()
+
+    def open(self, header: dict) -> JournalState:
+        """
+        Load the previous run's progress and open the journal for appending.
+
+        If no journal exists or its header differs (e.g. a different chunk
+        schedule), a fresh journal is started.
+
+        Args:
+            header: Job description that must match for a resume
+
+        Returns:
+            JournalState (empty when starting fresh)
+        """
+        header = dict(header, version=JOURNAL_FORMAT_VERSION)
+        state = self._load(header)
+
+        if state is None:
+            state = JournalState()
+            self._file = open(self.path, "w", encoding="utf-8")
+            self._write(header)
+        else:
+            self._file = open(self.path, "a", encoding="utf-8")
+        return state
+
+    def _load(self, header: dict) -> Optional[JournalState]:
+        if not os.path.exists(self.path):
+            return None
+        state = JournalState()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.read().split("\n")
+        except OSError:
+            return None
+        try:
+            if json.loads(lines[0]) != header:
+                print("Job journal does not match the current settings; starting over")
+                return None
+        except (ValueError, IndexError):
+            return None
+
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # empty or torn last line
+            if record.get("type") == "chunk":
+                state.chunks[record["index"]] = record
+            elif record.get("type") == "segments":
+                state.segments.extend(record["segments"])
+            if record.get("language") and not state.language:
+                state.language = record["language"]
+
+        # Drop a torn tail so appends start on a fresh line
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("\n".join(l for l in lines if l.strip() and self._is_json(l)) + "\n")
+        return state
+
+    @staticmethod
+    def _is_json(line: str) -> bool:
+        try:
+            json.loads(line)
+            return True
+        except ValueError:
+            return False
+
+    def _write(self, record: dict):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def record_chunk(self, index: int, segments: List[dict], language: Optional[str]):
+        """Record a transcribed chunk (chunked mode)."""
+        if self._file is not None:
+            self._write({"type": "chunk", "index": index, "segments": segments, "language": language})
+
+    def record_segments(self, segments: List[dict], language: Optional[str]):
+        """Record finalized segments (single-pass mode)."""
+        if self._file is not None:
+            self._write({"type": "segments", "segments": segments, "language": language})
+
+    def close(self):
+        """Close the file, keeping it for a later resume."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def complete(self):
+        """Job finished; the journal is no longer needed."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def _prune_stale(self):
+        cutoff = time.time() - JOURNAL_MAX_AGE_SECONDS
+        try:
+            names = os.listdir(self.journal_dir)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.journal_dir, name)
+            try:
+                if name.endswith(".jsonl") and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,361 @@
+"""
+Persisted multi-file job queue for DogeAutoSub.
+Runs several SubtitleArgs jobs at once and lets their stages overlap:
+audio decode on a few CPU workers, transcription serialized per Whisper
+model (one job on the GPU model at a time), translation on network
+workers. While job A transcribes, job B decodes and job C translates.
+
+The queue is stored as JSON in modules/cache/job_queue.json so queued work
+survives a restart; jobs that were running when the app closed are queued
+again and resume from their job journal.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, fields
+from typing import Callable, Dict, Hashable, List, Optional
+
+from modules.subtitle_args import SubtitleArgs
+from modules.subtitle_pipeline import PipelineResult, SubtitlePipeline
+
+DEFAULT_QUEUE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "cache", "job_queue.json"
+)
+
+QUEUE_FORMAT_VERSION = 1
+
+# Jobs in flight at once; each holds at most one stage resource at a time
+DEFAULT_PARALLEL_JOBS = 3
+DEFAULT_DECODE_WORKERS = 2
+DEFAULT_TRANSLATE_WORKERS = 2
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+
+
+class StageResources:
+    """
+    Stage gates shared by concurrently running pipelines.
+
+    decode: bounded CPU slots for ffmpeg decode + VAD
+    transcribe: one lock per model pool key (model, device, compute type),
+                so a model instance from the pool only ever runs one
+                transcription at a time
+    translate: bounded slots for network / MarianMT translation
+    """
+
+    def __init__(
+        self,
+        decode_workers: int = DEFAULT_DECODE_WORKERS,
+        translate_workers: int = DEFAULT_TRANSLATE_WORKERS,
+    ):
+        self._decode = threading.BoundedSemaphore(max(1, decode_workers))
+        self._translate = threading.BoundedSemaphore(max(1, translate_workers))
+        self._models: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _gate(self, stage: str, key: Optional[Hashable]):
+        if stage == "decode":
+            return self._decode
+        if stage == "translate":
+            return self._translate
+        if stage == "transcribe":
+            with self._lock:
+                return self._models.setdefault(key, threading.Lock())
+        raise ValueError(f"Unknown stage: {stage}")
+
+    @contextmanager
+    def stage(self, stage: str, key: Optional[Hashable] = None):
+        """
+        Hold the resource for a stage.
+
+        Args:
+            stage: "decode", "transcribe" or "translate"
+            key: Model pool key for "transcribe" (FasterWhisperRecognizer.pool_key)
+        """
+        gate = self._gate(stage, key)
+        gate.acquire()
+        try:
+            yield
+        finally:
+            gate.release()
+
+
+@dataclass
+class QueuedJob:
+    """One entry of the job queue."""
+    id: str
+    args: dict
+    status: str = STATUS_QUEUED
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    progress: int = 0
+    stage: str = ""
+    error: Optional[str] = None
+    result: Optional[dict] = None
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.args.get("source_path", ""))
+
+    def subtitle_args(self) -> SubtitleArgs:
+        # Ignore keys written by a newer version
+        known = {f.name for f in fields(SubtitleArgs)}
+        return SubtitleArgs(**{k: v for k, v in self.args.items() if k in known})
+
+
+class JobQueue:
+    """Persisted queue of subtitle jobs with stage-aware parallel execution."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        persist: bool = True,
+        max_parallel_jobs: int = DEFAULT_PARALLEL_JOBS,
+        decode_workers: int = DEFAULT_DECODE_WORKERS,
+        translate_workers: int = DEFAULT_TRANSLATE_WORKERS,
+        ffmpeg_path: Optional[str] = None,
+    ):
+        """
+        Initialize JobQueue.
+
+        Args:
+            path: Queue file (default: modules/cache/job_queue.json)
+            persist: Load and save the queue file (False for one-off batches)
+            max_parallel_jobs: Jobs running at once
+            decode_workers: Jobs decoding audio at once
+            translate_workers: Jobs translating at once
+            ffmpeg_path: Path to ffmpeg (default: bundled or PATH)
+        """
+        self.path = path or DEFAULT_QUEUE_PATH
+        self.persist = persist
+        self.max_parallel_jobs = max(1, max_parallel_jobs)
+        self.resources = StageResources(decode_workers, translate_workers)
+        self.ffmpeg_path = ffmpeg_path
+        self._jobs: List[QueuedJob] = []
+        self._lock = threading.RLock()
+        self._wake = threading.Condition(self._lock)
+        self._workers: List[threading.Thread] = []
+        self._stopping = False
+        self._run_start = 0.0
+        if self.persist:
+            self._load()
+
+    # ── Persistence ─────────────────────────────────────────────
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read job queue ({e}); starting empty")
+            return
+
+        known = {f.name for f in fields(QueuedJob)}
+        for item in data.get("jobs", []):
+            job = QueuedJob(**{k: v for k, v in item.items() if k in known})
+            if job.status == STATUS_RUNNING:
+                # Interrupted by a restart; the job journal lets it resume
+                job.status = STATUS_QUEUED
+                job.progress = 0
+                job.stage = ""
+            self._jobs.append(job)
+
+        pending = sum(1 for j in self._jobs if j.status == STATUS_QUEUED)
+        if pending:
+            print(f"Job queue: {pending} queued job(s) restored from {self.path}")
+
+    def _save_locked(self):
+        if not self.persist:
+            return
+        data = {
+            "version": QUEUE_FORMAT_VERSION,
+            "jobs": [asdict(job) for job in self._jobs],
+        }
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Could not save job queue: {e}")
+
+    # ── Queue management ────────────────────────────────────────
+
+    def add(self, args: SubtitleArgs) -> str:
+        """
+        Queue a job and return its id (starts right away if the queue is running).
+
+        A job identical to one already queued or running is not added again:
+        both would write the same SRT and share one job journal. The id of
+        the existing job is returned instead.
+        """
+        job = QueuedJob(id=uuid.uuid4().hex[:12], args=asdict(args))
+        with self._lock:
+            for existing in self._jobs:
+                if existing.status in (STATUS_QUEUED, STATUS_RUNNING) and existing.args == job.args:
+                    print(f"Job queue: {existing.name} is already queued")
+                    return existing.id
+            self._jobs.append(job)
+            self._save_locked()
+            self._wake.notify_all()
+        return job.id
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that has not started yet."""
+        with self._lock:
+            for job in self._jobs:
+                if job.id == job_id and job.status == STATUS_QUEUED:
+                    job.status = STATUS_CANCELLED
+                    self._save_locked()
+                    return True
+        return False
+
+    def clear_finished(self):
+        """Drop done, failed and cancelled jobs from the queue."""
+        with self._lock:
+            self._jobs = [j for j in self._jobs if j.status in (STATUS_QUEUED, STATUS_RUNNING)]
+            self._save_locked()
+
+    def jobs(self) -> List[QueuedJob]:
+        """Snapshot of all jobs in queue order."""
+        with self._lock:
+            return [QueuedJob(**asdict(job)) for job in self._jobs]
+
+    def pending_count(self) -> int:
+        """Jobs queued or running."""
+        with self._lock:
+            return sum(1 for j in self._jobs if j.status in (STATUS_QUEUED, STATUS_RUNNING))
+
+    def overall_progress(self) -> int:
+        """Percent complete over the jobs of the current run (0-100)."""
+        with self._lock:
+            active = [
+                j for j in self._jobs
+                if j.status in (STATUS_QUEUED, STATUS_RUNNING)
+                or (j.status != STATUS_CANCELLED and (j.finished or 0) >= self._run_start)
+            ]
+            if not active:
+                return 100
+            done = sum(100 if j.status in (STATUS_DONE, STATUS_FAILED) else j.progress for j in active)
+            return int(done / len(active))
+
+    # ── Execution ───────────────────────────────────────────────
+
+    def run(
+        self,
+        on_update: Optional[Callable[[QueuedJob], None]] = None,
+        stop_when_empty: bool = True,
+    ):
+        """
+        Process queued jobs until the queue is empty (or stop() is called).
+
+        Args:
+            on_update: Called from worker threads with a snapshot of a job
+                       whenever its status, stage or progress changes
+            stop_when_empty: Return once no job is queued or running; False
+                             keeps waiting for jobs added later
+        """
+        with self._lock:
+            self._stopping = False
+            self._run_start = time.time()
+        workers = [
+            threading.Thread(
+                target=self._worker, args=(on_update, stop_when_empty),
+                name=f"JobQueueWorker-{i + 1}", daemon=True,
+            )
+            for i in range(self.max_parallel_jobs)
+        ]
+        self._workers = workers
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    def stop(self):
+        """Let running jobs finish but start no new ones."""
+        with self._lock:
+            self._stopping = True
+            self._wake.notify_all()
+
+    def _next_job(self, stop_when_empty: bool) -> Optional[QueuedJob]:
+        with self._lock:
+            while not self._stopping:
+                for job in self._jobs:
+                    if job.status == STATUS_QUEUED:
+                        job.status = STATUS_RUNNING
+                        job.started = time.time()
+                        job.error = None
+                        self._save_locked()
+                        return job
+                # Stay available while other jobs run: jobs added meanwhile
+                # should still run in parallel
+                running = any(j.status == STATUS_RUNNING for j in self._jobs)
+                if stop_when_empty and not running:
+                    return None
+                self._wake.wait(timeout=1.0)
+            return None
+
+    def _worker(self, on_update, stop_when_empty: bool):
+        while True:
+            job = self._next_job(stop_when_empty)
+            if job is None:
+                return
+            self._run_job(job, on_update)
+
+    def _run_job(self, job: QueuedJob, on_update):
+        def notify():
+            if on_update:
+                with self._lock:
+                    snapshot = QueuedJob(**asdict(job))
+                on_update(snapshot)
+
+        def on_status(text):
+            job.stage = text
+            notify()
+
+        def on_progress(value):
+            if value != job.progress:
+                job.progress = value
+                notify()
+
+        print(f"\n[queue] Starting {job.name}")
+        notify()
+        start = time.time()
+        try:
+            pipeline = SubtitlePipeline(
+                job.subtitle_args(),
+                status_callback=on_status,
+                progress_callback=on_progress,
+                ffmpeg_path=self.ffmpeg_path,
+                resources=self.resources,
+            )
+            result = pipeline.run()
+            status, error = STATUS_DONE, None
+        except Exception as e:
+            print(f"[queue] {job.name} failed: {e}")
+            result = PipelineResult(source_path=job.args.get("source_path", ""), error=str(e))
+            result.total_time = time.time() - start
+            status, error = STATUS_FAILED, str(e)
+
+        with self._lock:
+            job.status = status
+            job.error = error
+            job.result = result.to_dict()
+            job.finished = time.time()
+            job.progress = 100
+            self._save_locked()
+            self._wake.notify_all()
+        print(f"[queue] {job.name}: {status} in {time.time() - start:.1f}s")
+        notify()
@@ -4,9 +4,12 @@ Extracted from AutoUI.py for cleaner code organization.
 """
 
 import os
+import shutil
 import sys
 from typing import Callable, List, Optional
 
+from modules.translation_memory import get_translation_memory, translate_with_memory
+
 try:
     import torch
     TORCH_AVAILABLE = True
@@ -32,22 +35,92 @@ except ImportError as e:
     MARIAN_AVAILABLE = False
     print(f"MarianMT not available: {e}")
 
+# CTranslate2 ships with faster-whisper; used for the int8 Marian backend
+try:
+    import ctranslate2
+    CT2_AVAILABLE = True
+except ImportError:
+    CT2_AVAILABLE = False
+
+MARIAN_BACKENDS = ("transformers", "ctranslate2")
+MARIAN_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "marian_cache")
+CT2_QUANTIZATION = "int8"
+
+# Tokenizer files copied next to the converted model so it loads offline
+_CT2_TOKENIZER_FILES = ("source.spm", "target.spm", "vocab.json", "tokenizer_config.json", "special_tokens_map.json")
+
+# Dynamic batching: padded source tokens (batch count × longest line) per batch
+MARIAN_MAX_BATCH_SENTENCES = 64
+MARIAN_CPU_MAX_TOKENS = 2048
+MARIAN_GPU_TOKENS_PER_GB = 2048  # of free VRAM
+MARIAN_GPU_MAX_TOKENS = 16384
+
+
+def plan_length_batches(lengths: List[int], max_tokens: int, max_sentences: int) -> List[List[int]]:
+    """
+    Group indices into length-sorted batches under a padded token budget.
+
+    Indices are sorted longest first, so a batch's padded size is its first
+    line's length times its count; a line longer than max_tokens gets a batch
+    of its own.
+
+    Args:
+        lengths: Token length of each text
+        max_tokens: Max padded tokens (count × longest) per batch
+        max_sentences: Max texts per batch
+
+    Returns:
+        List of batches, each a list of indices into lengths
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+    batches: List[List[int]] = []
+    current: List[int] = []
+    longest = 0
+    for i in order:
+        if current and (len(current) + 1 > max_sentences or (len(current) + 1) * longest > max_tokens):
+            batches.append(current)
+            current = []
+        if not current:
+            longest = max(1, lengths[i])
+        current.append(i)
+    if current:
+        batches.append(current)
+    return batches
+
 
 class MarianTranslator:
     """MarianMT translation engine for offline translation."""
     
-    def __init__(self, src_lang: str, tgt_lang: str):
+    def __init__(self, src_lang: str, tgt_lang: str, backend: str = "transformers"):
+        """
+        Initialize MarianTranslator.
+
+        Args:
+            src_lang: Source language code
+            tgt_lang: Target language code
+            backend: "transformers" (PyTorch) or "ctranslate2" (int8, converted once and cached)
+        """
         if not MARIAN_AVAILABLE:
             raise ImportError("MarianMT requires transformers library and Python 3.8+")
+        if backend not in MARIAN_BACKENDS:
+            raise ValueError(f"Unknown Marian backend '{backend}', expected one of {MARIAN_BACKENDS}")
+        if backend == "ctranslate2" and not CT2_AVAILABLE:
+            print("Warning: ctranslate2 not installed, using transformers backend")
+            backend = "transformers"
         
         self.src_lang = src_lang
         self.tgt_lang = tgt_lang
+        self.backend = backend
+        self.ct2_translator = None
         self.model = None
+        self.model_name = None
         self.tokenizer = None
         self._pipeline = None
         self.tgt_token = None
         self._fallback_pipeline = None
         self._fallback_model_name = None
+        self._fallback_model = None
+        self._fallback_tokenizer = None
         
         self.lang_mapping = {
             'en': 'en', 'vi': 'vi', 'zh': 'zh', 'ja': 'ja',
@@ -65,8 +138,18 @@ class MarianTranslator:
         tgt = self.lang_mapping.get(self.tgt_lang, self.tgt_lang)
         return f"Helsinki-NLP/opus-mt-mul-{tgt}"
     
+    def is_loaded(self) -> bool:
+        return self.tokenizer is not None and (self.model is not None or self.ct2_translator is not None)
+    
     def load_model(self, progress_callback: Optional[Callable] = None) -> bool:
         """Load the MarianMT model and tokenizer."""
+        if self.backend == "ctranslate2":
+            for name in (self._get_model_name(), self._get_fallback_model_name()):
+                if self._load_ct2_model(name, progress_callback):
+                    return True
+            print("CTranslate2 Marian backend unavailable for this pair; using transformers")
+            self.backend = "transformers"
+        
         try:
             model_name = self._get_model_name()
             print(f"Loading MarianMT model: {model_name}")
@@ -74,7 +157,7 @@ class MarianTranslator:
             if progress_callback:
                 progress_callback(0.1)
             
-            cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "marian_cache")
+            cache_dir = MARIAN_CACHE_DIR
             
             self.tokenizer = MarianTokenizer.from_pretrained(model_name, cache_dir=cache_dir)
             
@@ -82,6 +165,7 @@ class MarianTranslator:
                 progress_callback(0.5)
             
             self.model = MarianMTModel.from_pretrained(model_name, cache_dir=cache_dir)
+            self.model_name = model_name
             
             if progress_callback:
                 progress_callback(0.8)
@@ -107,6 +191,56 @@ class MarianTranslator:
             print(f"Failed to load MarianMT model: {e}")
             return self._try_fallback_model()
     
+    def _ct2_model_dir(self, model_name: str) -> str:
+        return os.path.join(MARIAN_CACHE_DIR, "ct2", f"{model_name.replace('/', '--')}-{CT2_QUANTIZATION}")
+    
+    def _convert_to_ct2(self, model_name: str, ct2_dir: str):
+        """Download the Hugging Face model and convert it to CTranslate2 (one-time)."""
+        from huggingface_hub import snapshot_download
+        
+        print(f"Converting {model_name} to CTranslate2 {CT2_QUANTIZATION} (one-time)…")
+        src_dir = snapshot_download(
+            model_name,
+            cache_dir=MARIAN_CACHE_DIR,
+            allow_patterns=["*.json", "*.spm", "*.bin", "*.safetensors", "*.txt"],
+        )
+        copy_files = [f for f in _CT2_TOKENIZER_FILES if os.path.exists(os.path.join(src_dir, f))]
+        
+        # Convert into a temp dir so an interrupted conversion is never picked up
+        tmp_dir = f"{ct2_dir}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        converter = ctranslate2.converters.TransformersConverter(src_dir, copy_files=copy_files)
+        converter.convert(tmp_dir, quantization=CT2_QUANTIZATION, force=True)
+        shutil.rmtree(ct2_dir, ignore_errors=True)
+        os.replace(tmp_dir, ct2_dir)
+    
+    def _load_ct2_model(self, model_name: str, progress_callback: Optional[Callable] = None) -> bool:
+        """Load (converting on first use) a CTranslate2 int8 Marian model."""
+        try:
+            ct2_dir = self._ct2_model_dir(model_name)
+            if not os.path.exists(os.path.join(ct2_dir, "model.bin")):
+                self._convert_to_ct2(model_name, ct2_dir)
+            
+            if progress_callback:
+                progress_callback(0.5)
+            
+            self.tokenizer = MarianTokenizer.from_pretrained(ct2_dir)
+            device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+            compute_type = "int8_float16" if device == "cuda" else CT2_QUANTIZATION
+            self.ct2_translator = ctranslate2.Translator(ct2_dir, device=device, compute_type=compute_type)
+            self.model_name = model_name
+            self._setup_target_token()
+            
+            if progress_callback:
+                progress_callback(1.0)
+            
+            print(f"MarianMT model loaded with CTranslate2 ({device}, {compute_type}): {model_name}")
+            return True
+        except Exception as e:
+            print(f"Failed to load CTranslate2 MarianMT model {model_name}: {e}")
+            self.ct2_translator = None
+            return False
+    
     def _setup_target_token(self):
         """Configure forced BOS token for target language."""
         try:
@@ -119,10 +253,13 @@ class MarianTranslator:
                 token_id = None
             
             if isinstance(token_id, int) and token_id >= 0 and token_id != getattr(self.tokenizer, 'unk_token_id', -1):
-                self.model.config.forced_bos_token_id = token_id
                 self.tgt_token = special
+                if self.model is None:
+                    # CTranslate2: the target token is passed as a source prefix only
+                    return
+                self.model.config.forced_bos_token_id = token_id
                 print(f"Set forced_bos_token_id: '{special}' -> id {token_id}")
-            elif hasattr(self.tokenizer, 'lang_code_to_id') and tgt in getattr(self.tokenizer, 'lang_code_to_id', {}):
+            elif self.model is not None and hasattr(self.tokenizer, 'lang_code_to_id') and tgt in getattr(self.tokenizer, 'lang_code_to_id', {}):
                 self.model.config.forced_bos_token_id = self.tokenizer.lang_code_to_id[tgt]
                 print(f"Set forced_bos_token_id via lang_code_to_id for '{tgt}'")
         except Exception as e:
@@ -134,14 +271,8 @@ class MarianTranslator:
             fallback_model = self._get_fallback_model_name()
             print(f"Trying fallback model: {fallback_model}")
             
-            self.tokenizer = MarianTokenizer.from_pretrained(fallback_model)
-            self.model = MarianMTModel.from_pretrained(fallback_model)
-            
-            if TORCH_AVAILABLE and torch.cuda.is_available():
-                try:
-                    self.model = self.model.to('cuda')
-                except RuntimeError:
-                    pass
+            self.model, self.tokenizer = self._load_fallback_components()
+            self.model_name = fallback_model
             
             print("Fallback MarianMT model loaded successfully")
             return True
@@ -149,15 +280,130 @@ class MarianTranslator:
             print(f"Fallback model also failed: {e2}")
             return False
     
-    def translate_batch(self, texts: List[str], batch_size: int = 4, progress_cb: Optional[Callable] = None) -> List[str]:
-        """Translate a batch of texts with pipeline-first approach and fallbacks."""
-        if not self.model or not self.tokenizer:
+    def _load_fallback_components(self):
+        """
+        Load the multilingual fallback model and tokenizer once.
+
+        Shared by _try_fallback_model and the identity-translation fallback
+        pipeline; returns the primary instances if they already are the fallback.
+        """
+        fallback_model = self._get_fallback_model_name()
+        if self.model_name == fallback_model and self.model is not None:
+            return self.model, self.tokenizer
+        if self._fallback_model is None:
+            tokenizer = MarianTokenizer.from_pretrained(fallback_model)
+            model = MarianMTModel.from_pretrained(fallback_model)
+            if TORCH_AVAILABLE and torch.cuda.is_available():
+                try:
+                    model = model.to('cuda')
+                except RuntimeError:
+                    pass
+            self._fallback_model, self._fallback_tokenizer = model, tokenizer
+        return self._fallback_model, self._fallback_tokenizer
+    
+    def _build_pipeline(self, model, tokenizer):
+        """Wrap an already loaded model/tokenizer in a translation pipeline (no second load)."""
+        from transformers import pipeline
+        src = self.lang_mapping.get(self.src_lang, self.src_lang)
+        tgt = self.lang_mapping.get(self.tgt_lang, self.tgt_lang)
+        task = f"translation_{src}_to_{tgt}"
+        device = 0 if (TORCH_AVAILABLE and torch.cuda.is_available() and next(model.parameters()).is_cuda) else -1
+        try:
+            return pipeline(task, model=model, tokenizer=tokenizer, device=device)
+        except Exception:
+            return pipeline("translation", model=model, tokenizer=tokenizer, device=device)
+    
+    def auto_max_tokens(self) -> int:
+        """Padded source tokens per batch, sized from free VRAM on GPU (fixed budget on CPU)."""
+        on_gpu = False
+        if self.ct2_translator is not None:
+            on_gpu = self.ct2_translator.device == "cuda"
+        elif self.model is not None and TORCH_AVAILABLE and torch.cuda.is_available():
+            on_gpu = next(self.model.parameters()).is_cuda
+        if not on_gpu:
+            return MARIAN_CPU_MAX_TOKENS
+        try:
+            free_bytes, _ = torch.cuda.mem_get_info()
+        except Exception:
+            return MARIAN_CPU_MAX_TOKENS
+        budget = int(free_bytes / (1024 ** 3) * MARIAN_GPU_TOKENS_PER_GB)
+        return max(MARIAN_CPU_MAX_TOKENS, min(budget, MARIAN_GPU_MAX_TOKENS))
+    
+    def translate_batch(self, texts: List[str], batch_size: Optional[int] = None, progress_cb: Optional[Callable] = None,
+                        use_memory: bool = True, max_tokens: Optional[int] = None) -> List[str]:
+        """
+        Translate a batch of texts, skipping duplicates and lines already in translation memory.
+
+        Texts are grouped by token length so each batch stays within a padded
+        token budget; results come back in the original order.
+
+        Args:
+            texts: Source lines
+            batch_size: Max sentences per batch (default: MARIAN_MAX_BATCH_SENTENCES)
+            progress_cb: Optional callback with fraction complete (0.0-1.0)
+            use_memory: Consult and update the translation memory
+            max_tokens: Padded source tokens per batch (default: auto_max_tokens())
+
+        Returns:
+            Translations aligned with texts
+        """
+        if not self.is_loaded():
             raise RuntimeError("Model not loaded. Call load_model() first.")
 
+        max_tokens = max_tokens or self.auto_max_tokens()
+        max_sentences = batch_size or MARIAN_MAX_BATCH_SENTENCES
+        model_name = self.model_name or self._get_model_name()
+        if self.ct2_translator is not None:
+            translate_fn = lambda pending: self._translate_ct2(pending, max_tokens, progress_cb)
+            model_name = f"{model_name}@ct2-{CT2_QUANTIZATION}"
+        else:
+            translate_fn = lambda pending: self._translate_uncached(pending, max_tokens, max_sentences, progress_cb)
+
+        return translate_with_memory(
+            texts,
+            translate_fn,
+            engine="marian",
+            model=model_name,
+            src=self.src_lang,
+            dst=self.tgt_lang,
+            memory=get_translation_memory() if use_memory else None,
+        )
+
+    def _translate_ct2(self, texts: List[str], max_tokens: int, progress_cb: Optional[Callable] = None) -> List[str]:
+        """Translate texts with the CTranslate2 backend (which length-sorts each submission itself)."""
         translated = []
+        # Submitted in slices only so progress can be reported
+        step = 256
+        total = max(1, len(texts))
+        for i in range(0, len(texts), step):
+            batch = texts[i:i + step]
+            if self.tgt_token:
+                batch = [f"{self.tgt_token} {t}" for t in batch]
+            tokens = [
+                self.tokenizer.convert_ids_to_tokens(self.tokenizer.encode(t, truncation=True, max_length=512))
+                for t in batch
+            ]
+            results = self.ct2_translator.translate_batch(
+                tokens,
+                max_batch_size=max_tokens,
+                batch_type="tokens",
+                beam_size=2,
+                max_decoding_length=512,
+            )
+            for r in results:
+                ids = self.tokenizer.convert_tokens_to_ids(r.hypotheses[0])
+                translated.append(self.tokenizer.decode(ids, skip_special_tokens=True))
+            
+            if progress_cb:
+                try:
+                    progress_cb(min(1.0, (i + len(batch)) / total))
+                except Exception:
+                    pass
+        return translated
 
-        if TORCH_AVAILABLE and not torch.cuda.is_available():
-            batch_size = min(batch_size, 2)
+    def _translate_uncached(self, texts: List[str], max_tokens: int, max_sentences: int,
+                            progress_cb: Optional[Callable] = None) -> List[str]:
+        """Translate a batch of texts with pipeline-first approach and fallbacks."""
 
         def _norm(t: str) -> str:
             return (t or "").strip().lower()
@@ -172,32 +418,20 @@ class MarianTranslator:
                     pass
             return batch_list
 
-        def _pipeline_translate(batch_list, model_name_override=None):
+        def _pipeline_translate(batch_list, use_fallback=False):
             try:
-                from transformers import pipeline
-                if model_name_override is None:
+                if not use_fallback:
                     if self._pipeline is None:
-                        src = self.lang_mapping.get(self.src_lang, self.src_lang)
-                        tgt = self.lang_mapping.get(self.tgt_lang, self.tgt_lang)
-                        task = f"translation_{src}_to_{tgt}"
-                        mn = self._get_model_name()
-                        device = 0 if (TORCH_AVAILABLE and torch.cuda.is_available() and next(self.model.parameters()).is_cuda) else -1
-                        try:
-                            self._pipeline = pipeline(task, model=mn, device=device)
-                        except Exception:
-                            self._pipeline = pipeline("translation", model=mn, device=device)
-                    results = self._pipeline(batch_list, clean_up_tokenization_spaces=True)
+                        self._pipeline = self._build_pipeline(self.model, self.tokenizer)
+                    results = self._pipeline(batch_list, batch_size=len(batch_list), clean_up_tokenization_spaces=True)
                 else:
                     if self._fallback_pipeline is None:
-                        device = 0 if (TORCH_AVAILABLE and torch.cuda.is_available()) else -1
-                        try:
-                            self._fallback_pipeline = pipeline("translation", model=model_name_override, device=device)
-                        except Exception:
-                            src = self.lang_mapping.get(self.src_lang, self.src_lang)
-                            tgt = self.lang_mapping.get(self.tgt_lang, self.tgt_lang)
-                            task = f"translation_{src}_to_{tgt}"
-                            self._fallback_pipeline = pipeline(task, model=model_name_override, device=device)
-                    results = self._fallback_pipeline(batch_list, clean_up_tokenization_spaces=True)
+                        fb_model, fb_tokenizer = self._load_fallback_components()
+                        if fb_model is self.model and self._pipeline is not None:
+                            self._fallback_pipeline = self._pipeline
+                        else:
+                            self._fallback_pipeline = self._build_pipeline(fb_model, fb_tokenizer)
+                    results = self._fallback_pipeline(batch_list, batch_size=len(batch_list), clean_up_tokenization_spaces=True)
                 return [r.get('translation_text', '') for r in results]
             except Exception as e:
                 print(f"Pipeline translate failed: {e}")
@@ -223,10 +457,17 @@ class MarianTranslator:
                 )
             return self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
 
+        # Length-sorted batches: similar lengths share a batch, so little padding is wasted
+        prefixed = _apply_target_prefix(texts)
+        lengths = [len(ids) for ids in self.tokenizer(prefixed, truncation=True, max_length=512)["input_ids"]]
+        batches = plan_length_batches(lengths, max_tokens, max_sentences)
+        translated = [""] * len(texts)
         total = max(1, len(texts))
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            batch_pref = _apply_target_prefix(batch)
+        done = 0
+
+        for batch_no, indices in enumerate(batches):
+            batch = [texts[k] for k in indices]
+            batch_pref = [prefixed[k] for k in indices]
             try:
                 batch_translated = _pipeline_translate(batch_pref)
                 
@@ -245,23 +486,16 @@ class MarianTranslator:
                         same_count2 = 0
                     if same_count2 >= max(2, int(0.6 * len(batch))):
                         print("Still identity; trying multilingual fallback")
-                        fb_name = self._fallback_model_name or self._get_fallback_model_name()
-                        self._fallback_model_name = fb_name
-                        batch_translated = _pipeline_translate(batch_pref, model_name_override=fb_name)
-                
-                translated.extend(batch_translated)
-                
-                if progress_cb:
-                    try:
-                        progress_cb(min(1.0, (i + len(batch)) / total))
-                    except Exception:
-                        pass
+                        self._fallback_model_name = self._get_fallback_model_name()
+                        batch_translated = _pipeline_translate(batch_pref, use_fallback=True)
                         
             except RuntimeError as e:
                 if "out of memory" in str(e).lower():
-                    print(f"GPU OOM; falling back to CPU for batch {i}")
+                    print(f"GPU OOM; falling back to CPU for batch {batch_no}")
                     if TORCH_AVAILABLE and torch.cuda.is_available():
                         self.model = self.model.to('cpu')
+                        # The shared pipeline was built for the GPU; rebuild it for CPU
+                        self._pipeline = None
                         torch.cuda.empty_cache()
                     batch_translated = _generate_translate(batch_pref, beams=1)
                     try:
@@ -270,13 +504,18 @@ class MarianTranslator:
                         same_count = 0
                     if same_count >= max(2, int(0.8 * len(batch))):
                         batch_translated = _pipeline_translate(batch_pref)
-                    translated.extend(batch_translated)
-                    if progress_cb:
-                        try:
-                            progress_cb(min(1.0, (i + len(batch)) / total))
-                        except Exception:
-                            pass
                 else:
                     raise e
 
+            # Restore original order
+            for k, text in zip(indices, batch_translated):
+                translated[k] = text
+            
+            done += len(indices)
+            if progress_cb:
+                try:
+                    progress_cb(min(1.0, done / total))
+                except Exception:
+                    pass
+
         return translated
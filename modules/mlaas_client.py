@@ -9,13 +9,21 @@ Auth: x-api-key header with embedded API key (obfuscated).
 """
 
 import base64
+import http.client
 import json
 import os
 import re
+import ssl
+import threading
+import time
+import urllib.parse
 import urllib.request
 import urllib.error
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import Callable, List, Optional
+from typing import Callable, List, Optional, Tuple
+
+from modules.translation_memory import get_translation_memory, translate_with_memory
 
 
 # ── API Configuration ───────────────────────────────────────────
@@ -27,8 +35,18 @@ MLAAS_APP_NAME = "DogeAutoSub"
 ANTHROPIC_MODEL_TRANSLATION = "claude-sonnet-4-20250514"   # Fast, cheap, great at translation
 ANTHROPIC_MODEL_SUMMARIZATION = "claude-sonnet-4-20250514"  # Quality summarization
 
-# Batching config
-TRANSLATION_BATCH_SIZE = 10  # Segments per API call
+# Batching config — batches are packed by estimated tokens, up to a segment cap
+TRANSLATION_BATCH_SIZE = 40            # Max segments per API call
+TRANSLATION_INPUT_TOKEN_BUDGET = 1500  # Estimated source tokens per call
+TRANSLATION_OUTPUT_TOKEN_BUDGET = 4096 # max_tokens per call
+TRANSLATION_OUTPUT_EXPANSION = 2.0     # Worst-case target/source token ratio
+TRANSLATION_LINE_OVERHEAD_TOKENS = 4   # "[N] " prefix and newline
+
+# Concurrency config — in-flight batch requests adapt between MIN and MAX
+TRANSLATION_CONCURRENCY = 4
+TRANSLATION_MIN_CONCURRENCY = 1
+TRANSLATION_MAX_CONCURRENCY = 8
+RATE_LIMIT_MAX_RETRIES = 5
 
 # ── Embedded API Key (obfuscated) ───────────────────────────────
 # The key is base64-encoded to prevent casual reading in source code.
@@ -111,8 +129,141 @@ class MLAASConfig:
 
 # ── API Calls ───────────────────────────────────────────────────
 
-def _mlaas_request(endpoint: str, payload: dict, config: MLAASConfig, timeout: int = 120) -> dict:
-    """Make a POST request to MLAAS API using x-api-key auth."""
+class MLAASRateLimitError(RuntimeError):
+    """HTTP 429 from MLAAS. retry_after is the server hint in seconds, if any."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
+
+
+def _raise_for_status(code: int, body: str, retry_after: Optional[str] = None):
+    """Translate an HTTP error status into the client's exception types."""
+    if code == 401:
+        raise RuntimeError(
+            "Authentication failed (401). The API key may be invalid or expired."
+        )
+    elif code == 429:
+        raise MLAASRateLimitError(
+            "Rate limit exceeded (429). Please wait and try again.",
+            retry_after=_parse_retry_after(retry_after),
+        )
+    else:
+        detail = ""
+        try:
+            detail = json.loads(body).get("detail", body)
+        except Exception:
+            detail = body
+        raise RuntimeError(f"MLAAS API error (HTTP {code}): {detail}")
+
+
+class MLAASConnectionPool:
+    """
+    Keep-alive HTTP(S) connections to the MLAAS host, shared across threads.
+
+    urllib opens a new TCP + TLS connection per request; reusing connections
+    removes that handshake from every batch when many batches are in flight.
+    """
+
+    def __init__(self, base_url: str, max_idle: int = TRANSLATION_MAX_CONCURRENCY):
+        parts = urllib.parse.urlsplit(base_url)
+        self.scheme = parts.scheme or "https"
+        self.host = parts.hostname or ""
+        self.port = parts.port
+        self.base_path = parts.path.rstrip("/")
+        self.max_idle = max_idle
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context() if self.scheme == "https" else None
+
+    def _new_connection(self, timeout: float) -> http.client.HTTPConnection:
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(
+                self.host, self.port, timeout=timeout, context=self._ssl_context,
+            )
+        return http.client.HTTPConnection(self.host, self.port, timeout=timeout)
+
+    def _checkout(self, timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            if self._idle:
+                conn = self._idle.pop()
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+        return self._new_connection(timeout), False
+
+    def _checkin(self, conn: http.client.HTTPConnection):
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def post(
+        self, endpoint: str, body: bytes, headers: dict, timeout: float,
+    ) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        """
+        POST to endpoint on a pooled connection.
+
+        Returns:
+            Tuple of (status code, response headers, response body)
+        """
+        path = f"{self.base_path}{endpoint}"
+        conn, reused = self._checkout(timeout)
+        try:
+            conn.request("POST", path, body=body, headers=headers)
+            response = conn.getresponse()
+        except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+            conn.close()
+            if not reused:
+                raise
+            # The server closed an idle keep-alive connection; retry once on a fresh one
+            conn = self._new_connection(timeout)
+            try:
+                conn.request("POST", path, body=body, headers=headers)
+                response = conn.getresponse()
+            except Exception:
+                conn.close()
+                raise
+        except Exception:
+            conn.close()
+            raise
+
+        try:
+            data = response.read()
+        except Exception:
+            conn.close()
+            raise
+
+        if response.will_close:
+            conn.close()
+        else:
+            self._checkin(conn)
+        return response.status, response.headers, data
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+def _mlaas_request(
+    endpoint: str,
+    payload: dict,
+    config: MLAASConfig,
+    timeout: int = 120,
+    pool: Optional[MLAASConnectionPool] = None,
+) -> dict:
+    """Make a POST request to MLAAS API using x-api-key auth (pooled connection if given)."""
     if not config.is_configured():
         raise ValueError(
             "MLAAS API key not available. Contact the app developer."
@@ -126,10 +277,21 @@ def _mlaas_request(endpoint: str, payload: dict, config: MLAASConfig, timeout: i
         "x-api-key": config.api_key,
         "x-application-name": MLAAS_APP_NAME,
     }
+    data = json.dumps(payload).encode("utf-8")
+
+    if pool is not None:
+        try:
+            status, resp_headers, body = pool.post(endpoint, data, headers, timeout)
+        except (OSError, http.client.HTTPException) as e:
+            raise RuntimeError(f"Cannot connect to MLAAS API: {e}")
+        text = body.decode("utf-8", errors="replace")
+        if status >= 400:
+            _raise_for_status(status, text, resp_headers.get("Retry-After"))
+        return json.loads(text)
 
     req = urllib.request.Request(
         url,
-        data=json.dumps(payload).encode("utf-8"),
+        data=data,
         headers=headers,
         method="POST",
     )
@@ -139,19 +301,7 @@ def _mlaas_request(endpoint: str, payload: dict, config: MLAASConfig, timeout: i
             return json.loads(response.read().decode("utf-8"))
     except urllib.error.HTTPError as e:
         body = e.read().decode("utf-8", errors="replace") if e.fp else ""
-        if e.code == 401:
-            raise RuntimeError(
-                "Authentication failed (401). The API key may be invalid or expired."
-            )
-        elif e.code == 429:
-            raise RuntimeError("Rate limit exceeded (429). Please wait and try again.")
-        else:
-            detail = ""
-            try:
-                detail = json.loads(body).get("detail", body)
-            except Exception:
-                detail = body
-            raise RuntimeError(f"MLAAS API error (HTTP {e.code}): {detail}")
+        _raise_for_status(e.code, body, e.headers.get("Retry-After") if e.headers else None)
     except urllib.error.URLError as e:
         raise RuntimeError(f"Cannot connect to MLAAS API: {e.reason}")
 
@@ -205,19 +355,84 @@ def translate_text_mlaas(
     return _parse_anthropic_response(result)
 
 
+class MLAASIncompleteBatchError(RuntimeError):
+    """A batch response was truncated or had fewer lines than requested."""
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate for batching.
+    
+    CJK / Thai / other wide scripts are roughly one token per character;
+    Latin-script text is roughly four characters per token.
+    """
+    wide = sum(1 for ch in text if ord(ch) >= 0x0E00)
+    return max(1, wide + (len(text) - wide + 3) // 4)
+
+
+def pack_token_batches(
+    texts: List[str],
+    input_budget: int = TRANSLATION_INPUT_TOKEN_BUDGET,
+    output_budget: int = TRANSLATION_OUTPUT_TOKEN_BUDGET,
+    max_items: int = TRANSLATION_BATCH_SIZE,
+) -> List[List[int]]:
+    """
+    Greedily pack texts (in order) into batches under the token budgets.
+    
+    Args:
+        texts: Source texts
+        input_budget: Max estimated source tokens per batch
+        output_budget: Max estimated translated tokens per batch
+        max_items: Max texts per batch
+        
+    Returns:
+        List of batches, each a list of indices into texts
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    in_tokens = 0
+    out_tokens = 0.0
+    
+    for i, text in enumerate(texts):
+        cost = estimate_tokens(text) + TRANSLATION_LINE_OVERHEAD_TOKENS
+        out_cost = cost * TRANSLATION_OUTPUT_EXPANSION
+        if current and (
+            len(current) >= max_items
+            or in_tokens + cost > input_budget
+            or out_tokens + out_cost > output_budget
+        ):
+            batches.append(current)
+            current, in_tokens, out_tokens = [], 0, 0.0
+        current.append(i)
+        in_tokens += cost
+        out_tokens += out_cost
+    
+    if current:
+        batches.append(current)
+    return batches
+
+
 def _translate_batch_mlaas(
     texts: List[str],
     target_language: str,
     config: MLAASConfig,
+    pool: Optional[MLAASConnectionPool] = None,
+    max_tokens: int = TRANSLATION_OUTPUT_TOKEN_BUDGET,
+    strict: bool = False,
 ) -> List[str]:
-    """Translate a batch of numbered texts in a single API call."""
+    """
+    Translate a batch of numbered texts in a single API call.
+    
+    With strict=True a truncated or short response raises
+    MLAASIncompleteBatchError instead of padding with the originals.
+    """
     target_lang_name = MLAAS_LANGUAGE_MAP.get(target_language.lower(), target_language.lower())
 
     numbered = "\n".join(f"[{i+1}] {t}" for i, t in enumerate(texts))
 
     payload = {
         "model": ANTHROPIC_MODEL_TRANSLATION,
-        "max_tokens": 2048,
+        "max_tokens": max_tokens,
         "messages": [
             {
                 "role": "user",
@@ -231,11 +446,19 @@ def _translate_batch_mlaas(
         ],
     }
 
-    result = _mlaas_request("/proxy/anthropic/v1/messages", payload, config, timeout=60)
+    result = _mlaas_request("/proxy/anthropic/v1/messages", payload, config, timeout=60, pool=pool)
     response_text = _parse_anthropic_response(result)
 
     translations = _parse_numbered_response(response_text, len(texts))
 
+    if strict:
+        missing = sum(1 for i in range(len(texts)) if i >= len(translations) or not translations[i])
+        if missing or result.get("stop_reason") == "max_tokens":
+            raise MLAASIncompleteBatchError(
+                f"Expected {len(texts)} translations, {missing} missing"
+                + (" (output truncated)" if result.get("stop_reason") == "max_tokens" else "")
+            )
+
     if len(translations) != len(texts):
         print(f"Warning: Expected {len(texts)} translations, got {len(translations)}. Padding with originals.")
         while len(translations) < len(texts):
@@ -269,59 +492,237 @@ def _parse_numbered_response(response: str, expected_count: int) -> List[str]:
     return [results.get(i, "") for i in range(max(len(results), 0))]
 
 
+class AdaptiveConcurrency:
+    """
+    AIMD limit on in-flight requests: halve on 429, grow by one after a
+    streak of successes, never outside [minimum, maximum].
+    """
+
+    def __init__(
+        self,
+        initial: int = TRANSLATION_CONCURRENCY,
+        minimum: int = TRANSLATION_MIN_CONCURRENCY,
+        maximum: int = TRANSLATION_MAX_CONCURRENCY,
+        increase_after: int = 4,
+    ):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(max(initial, self.minimum), self.maximum)
+        self.increase_after = increase_after
+        self._in_flight = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self, rate_limited: bool = False):
+        with self._cond:
+            self._in_flight -= 1
+            if rate_limited:
+                new_limit = max(self.minimum, self.limit // 2)
+                if new_limit != self.limit:
+                    print(f"MLAAS rate limited, concurrency {self.limit} -> {new_limit}")
+                self.limit = new_limit
+                self._successes = 0
+            else:
+                self._successes += 1
+                if self._successes >= self.increase_after and self.limit < self.maximum:
+                    self.limit += 1
+                    self._successes = 0
+            self._cond.notify_all()
+
+
+def _translate_batch_with_retry(
+    texts: List[str],
+    target_language: str,
+    config: MLAASConfig,
+    pool: MLAASConnectionPool,
+    limiter: AdaptiveConcurrency,
+) -> List[str]:
+    """Run one batch under the concurrency limiter, backing off on 429."""
+    for attempt in range(RATE_LIMIT_MAX_RETRIES + 1):
+        limiter.acquire()
+        try:
+            result = _translate_batch_mlaas(texts, target_language, config, pool=pool, strict=True)
+        except MLAASRateLimitError as e:
+            limiter.release(rate_limited=True)
+            if attempt == RATE_LIMIT_MAX_RETRIES:
+                raise
+            time.sleep(e.retry_after if e.retry_after is not None else min(30.0, 2.0 ** attempt))
+            continue
+        except Exception:
+            limiter.release()
+            raise
+        limiter.release()
+        return result
+    return texts
+
+
+def _translate_batch_splitting(
+    texts: List[str],
+    target_language: str,
+    config: MLAASConfig,
+    pool: MLAASConnectionPool,
+    limiter: AdaptiveConcurrency,
+) -> List[str]:
+    """
+    Translate a batch; if the response comes back short or truncated, split it
+    in half and retry each half. A single line that still fails is sent on its
+    own with the plain single-text prompt.
+    """
+    try:
+        return _translate_batch_with_retry(texts, target_language, config, pool, limiter)
+    except MLAASIncompleteBatchError as e:
+        if len(texts) == 1:
+            print(f"Warning: {e}; retrying line on its own")
+            limiter.acquire()
+            try:
+                return [translate_text_mlaas(texts[0], target_language, config) or texts[0]]
+            finally:
+                limiter.release()
+        print(f"Warning: {e}; splitting batch of {len(texts)} and retrying")
+        mid = len(texts) // 2
+        return (
+            _translate_batch_splitting(texts[:mid], target_language, config, pool, limiter)
+            + _translate_batch_splitting(texts[mid:], target_language, config, pool, limiter)
+        )
+
+
+def translate_texts_mlaas(
+    texts: List[str],
+    target_language: str,
+    config: MLAASConfig,
+    progress_callback: Optional[Callable[[int], None]] = None,
+    batch_size: int = TRANSLATION_BATCH_SIZE,
+    max_concurrency: int = TRANSLATION_MAX_CONCURRENCY,
+    input_token_budget: int = TRANSLATION_INPUT_TOKEN_BUDGET,
+    output_token_budget: int = TRANSLATION_OUTPUT_TOKEN_BUDGET,
+) -> List[str]:
+    """
+    Translate non-empty lines using batched MLAAS calls.
+
+    Lines are packed into batches by estimated token count (at most
+    batch_size per call), dispatched concurrently over keep-alive connections
+    with an adaptive in-flight limit (starting at TRANSLATION_CONCURRENCY,
+    capped at max_concurrency), then reassembled in the original order.
+    Short or truncated responses are split and retried; lines of a batch that
+    still fails are returned untranslated.
+    """
+    if not texts:
+        return []
+
+    batches = pack_token_batches(
+        texts,
+        input_budget=input_token_budget,
+        output_budget=output_token_budget,
+        max_items=batch_size,
+    )
+
+    print(f"Translating {len(texts)} lines in {len(batches)} batched API calls "
+          f"(max {batch_size}/call, ~{input_token_budget} input tokens/call, concurrency<={max_concurrency})")
+
+    pool = MLAASConnectionPool(config.base_url)
+    limiter = AdaptiveConcurrency(
+        initial=min(TRANSLATION_CONCURRENCY, max_concurrency),
+        maximum=max_concurrency,
+    )
+    translations = list(texts)
+    done_texts = 0
+
+    try:
+        with ThreadPoolExecutor(max_workers=limiter.maximum) as executor:
+            futures = {
+                executor.submit(
+                    _translate_batch_splitting,
+                    [texts[k] for k in batch], target_language, config, pool, limiter,
+                ): batch_idx
+                for batch_idx, batch in enumerate(batches)
+            }
+
+            for future in as_completed(futures):
+                batch_idx = futures[future]
+                batch = batches[batch_idx]
+                try:
+                    batch_out = future.result()
+                except Exception as e:
+                    print(f"MLAAS batch translate error (batch {batch_idx + 1}): {e}")
+                    batch_out = [texts[k] for k in batch]
+
+                for k, text in zip(batch, batch_out):
+                    translations[k] = text
+
+                done_texts += len(batch)
+                if progress_callback:
+                    progress_callback(int((done_texts / len(texts)) * 100))
+    finally:
+        pool.close()
+
+    return translations
+
+
 def translate_segments_mlaas(
     segments: list,
     target_language: str,
     config: MLAASConfig,
     progress_callback: Optional[Callable[[int], None]] = None,
     batch_size: int = TRANSLATION_BATCH_SIZE,
+    max_concurrency: int = TRANSLATION_MAX_CONCURRENCY,
+    input_token_budget: int = TRANSLATION_INPUT_TOKEN_BUDGET,
+    output_token_budget: int = TRANSLATION_OUTPUT_TOKEN_BUDGET,
+    use_memory: bool = True,
 ) -> list:
-    """Translate subtitle segments using batched MLAAS calls."""
+    """
+    Translate subtitle segments using batched MLAAS calls.
+
+    Identical lines are translated once and lines found in the translation
+    memory are not sent at all; see translate_texts_mlaas for batching.
+    Empty segments pass through unchanged.
+    """
     total = len(segments)
     if total == 0:
         return []
 
-    translated = []
-    batch_count = (total + batch_size - 1) // batch_size
-
-    print(f"Translating {total} segments in {batch_count} batched API calls (batch_size={batch_size})")
-
-    for batch_idx in range(batch_count):
-        start = batch_idx * batch_size
-        end = min(start + batch_size, total)
-        batch_segs = segments[start:end]
-
-        texts = []
-        text_indices = []
-
-        for i, seg in enumerate(batch_segs):
-            text = seg.get("text", "").strip()
-            if text:
-                texts.append(text)
-                text_indices.append(i)
+    seg_indices = []
+    texts = []
+    for i, seg in enumerate(segments):
+        text = seg.get("text", "").strip()
+        if text:
+            seg_indices.append(i)
+            texts.append(text)
+
+    translations = translate_with_memory(
+        texts,
+        lambda pending: translate_texts_mlaas(
+            pending, target_language, config,
+            progress_callback=progress_callback,
+            batch_size=batch_size,
+            max_concurrency=max_concurrency,
+            input_token_budget=input_token_budget,
+            output_token_budget=output_token_budget,
+        ),
+        engine="mlaas",
+        model=ANTHROPIC_MODEL_TRANSLATION,
+        src="auto",
+        dst=target_language.lower(),
+        memory=get_translation_memory() if use_memory else None,
+    )
 
-        translations = []
-        if texts:
-            try:
-                translations = _translate_batch_mlaas(texts, target_language, config)
-            except Exception as e:
-                print(f"MLAAS batch translate error (batch {batch_idx + 1}): {e}")
-                translations = texts
-
-        trans_idx = 0
-        for i, seg in enumerate(batch_segs):
-            if i in text_indices and trans_idx < len(translations):
-                translated.append({
-                    "start": seg["start"],
-                    "end": seg["end"],
-                    "text": translations[trans_idx],
-                })
-                trans_idx += 1
-            else:
-                translated.append(seg)
+    # Ordered reassembly
+    translated = list(segments)
+    for seg_idx, text in zip(seg_indices, translations):
+        seg = segments[seg_idx]
+        translated[seg_idx] = {
+            "start": seg["start"],
+            "end": seg["end"],
+            "text": text,
+        }
 
-        if progress_callback and total > 0:
-            progress_callback(int((end / total) * 100))
+    if progress_callback:
+        progress_callback(100)
 
     return translated
 
@@ -0,0 +1,290 @@
+"""
+Process-wide faster-whisper model pool for DogeAutoSub.
+Keeps loaded WhisperModel instances warm between jobs so consecutive
+transcriptions skip the model load and VRAM re-allocation.
+
+Models are keyed by (model_size, device, compute_type), reference counted
+while in use, evicted after an idle timeout, and kept under a per-device
+memory budget by evicting the least recently used idle models first.
+"""
+
+import gc
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+try:
+    from faster_whisper import WhisperModel, BatchedInferencePipeline
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False
+
+try:
+    import torch
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+
+# Idle models are unloaded after this many seconds without a user
+DEFAULT_IDLE_TIMEOUT = 600.0
+
+ModelKey = Tuple[str, str, str]  # (model_size, device, compute_type)
+
+
+def model_key(model_size: str, device: str, compute_type: str) -> ModelKey:
+    """Key a model is pooled under; equal keys share one loaded model."""
+    return (model_size, device, compute_type)
+
+
+@dataclass
+class PooledModel:
+    """A loaded model shared between recognizers."""
+    key: ModelKey
+    model: object
+    batched_model: Optional[object] = None
+    memory_gb: float = 0.0
+    refcount: int = 0
+    last_used: float = field(default_factory=time.time)
+
+    @property
+    def device(self) -> str:
+        return self.key[1]
+
+
+class WhisperModelPool:
+    """
+    Thread-safe registry of loaded faster-whisper models.
+
+    Usage:
+        entry = pool.acquire("large-v3-turbo", "cuda", "float16")
+        ...use entry.model / entry.batched_model...
+        pool.release(entry)
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        memory_budget_gb: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Initialize WhisperModelPool.
+
+        Args:
+            idle_timeout: Seconds an unused model stays loaded (0 disables caching)
+            memory_budget_gb: Per-device budget, e.g. {"cuda": 7.5, "cpu": 16.0}.
+                              Devices without an entry are unbounded.
+        """
+        self.idle_timeout = idle_timeout
+        self.memory_budget_gb = dict(memory_budget_gb or {})
+        self._entries: Dict[ModelKey, PooledModel] = {}
+        self._lock = threading.RLock()
+        self._load_locks: Dict[ModelKey, threading.Lock] = {}
+        self._reaper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # ── Public API ──────────────────────────────────────────────
+
+    def acquire(
+        self,
+        model_size: str,
+        device: str,
+        compute_type: str,
+        download_root: Optional[str] = None,
+        memory_gb: float = 0.0,
+        cpu_threads: int = 0,
+    ) -> PooledModel:
+        """
+        Get a loaded model for the key, loading it if needed.
+
+        Args:
+            model_size: faster-whisper model name (e.g. "large-v3-turbo")
+            device: "cuda" or "cpu"
+            compute_type: CTranslate2 compute type
+            download_root: Model download directory
+            memory_gb: Estimated memory footprint, used for budget accounting
+            cpu_threads: CTranslate2 intra-op threads when the model is loaded
+                         (0 = library default; a warm model keeps its own)
+
+        Returns:
+            PooledModel with its reference count incremented
+        """
+        if not FASTER_WHISPER_AVAILABLE:
+            raise ImportError(
+                "faster-whisper is not installed. "
+                "Install with: pip install faster-whisper"
+            )
+
+        key = model_key(model_size, device, compute_type)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refcount += 1
+                entry.last_used = time.time()
+                print(f"Reusing warm faster-whisper model: {model_size} ({device}, {compute_type})")
+                return entry
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Load outside the registry lock so other keys are not blocked,
+        # but serialize loads of the same key
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refcount += 1
+                    entry.last_used = time.time()
+                    return entry
+                self._make_room(device, memory_gb)
+
+            print(f"Loading faster-whisper model: {model_size}")
+            print(f"  Device: {device}, Compute type: {compute_type}")
+            model = WhisperModel(
+                model_size,
+                device=device,
+                compute_type=compute_type,
+                cpu_threads=cpu_threads,
+                download_root=download_root,
+            )
+            batched = BatchedInferencePipeline(model=model) if device == "cuda" else None
+
+            entry = PooledModel(
+                key=key,
+                model=model,
+                batched_model=batched,
+                memory_gb=memory_gb,
+                refcount=1,
+            )
+            with self._lock:
+                self._entries[key] = entry
+            print("faster-whisper model loaded successfully")
+
+        self._ensure_reaper()
+        return entry
+
+    def release(self, entry: PooledModel):
+        """Return a model to the pool. It stays loaded until idle eviction."""
+        with self._lock:
+            entry.refcount = max(0, entry.refcount - 1)
+            entry.last_used = time.time()
+            if entry.refcount == 0 and self.idle_timeout <= 0:
+                self._unload(entry.key)
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """
+        Unload models that have been unused for longer than idle_timeout.
+
+        Returns:
+            Number of models unloaded
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            expired = [
+                key for key, entry in self._entries.items()
+                if entry.refcount == 0 and now - entry.last_used >= self.idle_timeout
+            ]
+            for key in expired:
+                self._unload(key)
+        return len(expired)
+
+    def clear(self):
+        """Unload every idle model (models in use are left alone)."""
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if e.refcount == 0]:
+                self._unload(key)
+
+    def stats(self) -> Dict[str, dict]:
+        """Snapshot of loaded models for diagnostics."""
+        with self._lock:
+            return {
+                "/".join(key): {
+                    "refcount": entry.refcount,
+                    "memory_gb": entry.memory_gb,
+                    "idle_seconds": round(time.time() - entry.last_used, 1),
+                }
+                for key, entry in self._entries.items()
+            }
+
+    def shutdown(self):
+        """Stop the idle reaper and unload idle models."""
+        self._stop.set()
+        self.clear()
+
+    # ── Internals ───────────────────────────────────────────────
+
+    def _used_gb(self, device: str) -> float:
+        return sum(e.memory_gb for e in self._entries.values() if e.device == device)
+
+    def _make_room(self, device: str, needed_gb: float):
+        """Evict least recently used idle models until needed_gb fits the budget."""
+        budget = self.memory_budget_gb.get(device)
+        if budget is None:
+            return
+
+        idle = sorted(
+            (e for e in self._entries.values() if e.device == device and e.refcount == 0),
+            key=lambda e: e.last_used,
+        )
+        while idle and self._used_gb(device) + needed_gb > budget:
+            victim = idle.pop(0)
+            print(f"Model pool over budget on {device}, evicting: {victim.key[0]}")
+            self._unload(victim.key)
+
+        if self._used_gb(device) + needed_gb > budget:
+            print(f"Warning: {device} model budget ({budget:.1f} GB) exceeded by models in use")
+
+    def _unload(self, key: ModelKey):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        print(f"Unloading faster-whisper model: {key[0]} ({key[1]}, {key[2]})")
+        entry.batched_model = None
+        entry.model = None
+        gc.collect()
+        if key[1] == "cuda" and TORCH_AVAILABLE:
+            try:
+                torch.cuda.empty_cache()
+            except Exception:
+                pass
+
+    def _ensure_reaper(self):
+        if self.idle_timeout <= 0:
+            return
+        if self._reaper is not None and self._reaper.is_alive():
+            return
+        self._stop.clear()
+        self._reaper = threading.Thread(
+            target=self._reap_loop, name="WhisperModelPoolReaper", daemon=True,
+        )
+        self._reaper.start()
+
+    def _reap_loop(self):
+        interval = max(1.0, min(self.idle_timeout / 2, 60.0))
+        while not self._stop.wait(interval):
+            self.evict_idle()
+            with self._lock:
+                if not self._entries:
+                    self._reaper = None
+                    return
+
+
+_POOL: Optional[WhisperModelPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_model_pool() -> WhisperModelPool:
+    """Get the process-wide model pool, creating it on first use."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            budget = {}
+            if TORCH_AVAILABLE:
+                try:
+                    if torch.cuda.is_available():
+                        total = torch.cuda.get_device_properties(0).total_memory / (1024**3)
+                        budget["cuda"] = total * 0.9
+                except Exception:
+                    pass
+            _POOL = WhisperModelPool(memory_budget_gb=budget)
+        return _POOL
@@ -0,0 +1,171 @@
+"""
+Streaming translation for DogeAutoSub.
+Translates finalized transcription segments on a background thread while
+Whisper is still transcribing, so the network-bound translation step overlaps
+the GPU-bound one and a job takes roughly max(transcribe, translate) instead
+of transcribe + translate.
+
+Segments are submitted as they are finalized, grouped into micro-batches and
+handed to a text-level engine function. finish() aligns the results with the
+final (merged) segment list and translates anything that was not streamed.
+"""
+
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from modules.telemetry import timed
+
+# Send a micro-batch once this many lines are pending...
+STREAM_BATCH_LINES = 40
+# ...or once the oldest pending line has waited this long (seconds)
+STREAM_MAX_WAIT = 3.0
+
+_CLOSE = object()
+
+
+def _segment_key(seg: dict) -> Tuple[float, float, str]:
+    return (round(seg["start"], 3), round(seg["end"], 3), seg.get("text", "").strip())
+
+
+class StreamingTranslator:
+    """Background translator fed with finalized segments during transcription."""
+
+    def __init__(
+        self,
+        translate_fn: Callable[[List[str]], List[str]],
+        batch_lines: int = STREAM_BATCH_LINES,
+        max_wait: float = STREAM_MAX_WAIT,
+        telemetry=None,
+    ):
+        """
+        Initialize StreamingTranslator.
+
+        Args:
+            translate_fn: Engine call mapping source lines to translations (same order)
+            batch_lines: Pending lines that trigger a micro-batch
+            max_wait: Seconds the oldest pending line may wait before a micro-batch is sent
+            telemetry: RunTelemetry for the "translate_stream" span (optional)
+        """
+        self.translate_fn = translate_fn
+        self.batch_lines = batch_lines
+        self.max_wait = max_wait
+        self.telemetry = telemetry
+        self.streamed_lines = 0
+        self._results: Dict[Tuple[float, float, str], str] = {}
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._aborted = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="StreamingTranslator", daemon=True)
+        self._thread.start()
+
+    def submit(self, segments: List[dict]):
+        """Queue finalized segments for translation (non-blocking)."""
+        for seg in segments:
+            if seg.get("text", "").strip():
+                self._queue.put(seg)
+
+    def _run(self):
+        pending: List[dict] = []
+        oldest = 0.0
+        closed = False
+        while not closed:
+            timeout = None
+            if pending:
+                timeout = max(0.0, self.max_wait - (time.time() - oldest))
+            try:
+                item = self._queue.get(timeout=timeout)
+                if item is _CLOSE:
+                    closed = True
+                else:
+                    if not pending:
+                        oldest = time.time()
+                    pending.append(item)
+            except queue.Empty:
+                pass
+            if self._aborted.is_set():
+                return
+
+            due = pending and (
+                closed
+                or len(pending) >= self.batch_lines
+                or time.time() - oldest >= self.max_wait
+            )
+            if due:
+                self._translate(pending)
+                pending = []
+
+    def _translate(self, segments: List[dict]):
+        texts = [seg["text"].strip() for seg in segments]
+        try:
+            # Runs during transcription, so it is not part of the "translate" stage time
+            with timed(self.telemetry, "translate_stream"):
+                translations = self.translate_fn(texts)
+        except Exception as e:
+            # Left untranslated here; finish() retries them
+            print(f"Streaming translation error ({len(texts)} lines deferred): {e}")
+            return
+        with self._lock:
+            for seg, text in zip(segments, translations):
+                self._results[_segment_key(seg)] = text
+            self.streamed_lines += len(texts)
+
+    def close(self, drain: bool = True):
+        """
+        Stop the worker.
+
+        Args:
+            drain: Translate what is already queued first; False drops pending
+                   batches (job failed or was cancelled), waiting at most for
+                   the batch in flight
+        """
+        if not drain:
+            self._aborted.set()
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+        if self._thread.is_alive():
+            self._queue.put(_CLOSE)
+            self._thread.join()
+
+    def finish(self, segments: List[dict]) -> List[dict]:
+        """
+        Wait for streamed batches and return translated copies of segments.
+
+        Segments the stream did not see (or that changed while merging)
+        are translated now in one call.
+
+        Args:
+            segments: Final transcription segments
+
+        Returns:
+            Translated segments aligned with segments
+        """
+        self.close()
+
+        with self._lock:
+            results = dict(self._results)
+
+        missing = [
+            seg for seg in segments
+            if seg.get("text", "").strip() and _segment_key(seg) not in results
+        ]
+        if missing:
+            print(f"Streaming translation: {self.streamed_lines} lines streamed, {len(missing)} translated at the end")
+            translations = self.translate_fn([seg["text"].strip() for seg in missing])
+            for seg, text in zip(missing, translations):
+                results[_segment_key(seg)] = text
+        else:
+            print(f"Streaming translation: all {self.streamed_lines} lines translated during transcription")
+
+        return [
+            {
+                "start": seg["start"],
+                "end": seg["end"],
+                "text": results.get(_segment_key(seg), seg.get("text", "")),
+            }
+            for seg in segments
+        ]
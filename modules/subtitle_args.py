@@ -4,6 +4,7 @@ Replaces the argparse-based approach for cleaner code.
 """
 
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass
@@ -16,3 +17,15 @@ class SubtitleArgs:
     model_size: str = "turbo"
     translate_engine: str = "google"
     volume: int = 3
+    batched: bool = True  # BatchedInferencePipeline on CUDA; False = sequential decode
+    use_cache: bool = True  # Reuse cached transcription of the same source + settings
+    use_translation_memory: bool = True  # Reuse stored translations of repeated lines
+    marian_backend: str = "transformers"  # "transformers" or "ctranslate2" (int8)
+    stream_translation: bool = True  # Translate finalized segments while transcription runs
+    resume: bool = True  # Resume an interrupted transcription from its job journal
+    multilingual: bool = False  # Detect language per chunk (code-switched audio); translate only non-target lines
+    language_candidates: str = ""  # Multilingual mode: comma-separated languages to expect, e.g. "vi,en"
+    cpu_farm: bool = False  # Without CUDA: transcribe chunks in parallel worker processes
+    cpu_farm_workers: Optional[int] = None  # CPU farm processes (None = one per 4 cores)
+    write_report: bool = True  # Write <name>.report.json (stage timings, RTF, peak memory) next to the SRT
+    telemetry_log: str = ""  # Also append each run's report to this JSONL file ("" = off)
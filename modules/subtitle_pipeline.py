@@ -0,0 +1,767 @@
+"""
+Qt-free subtitle generation pipeline for DogeAutoSub.
+Runs probe → extract → transcribe → save → translate for one SubtitleArgs job.
+Shared by the GUI worker thread (SubtitleThread) and the headless batch CLI.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from contextlib import ExitStack, nullcontext
+from dataclasses import asdict, dataclass
+from typing import Callable, Hashable, List, Optional
+
+# ── Paths ───────────────────────────────────────────────────────
+SCRIPT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FFMPEG_PATH = os.path.join(SCRIPT_DIR, "modules", "ffmpeg", "bin", "ffmpeg.exe")
+TEMP_DIR = os.path.join(SCRIPT_DIR, "modules", "temp")
+
+from modules.subtitle_args import SubtitleArgs
+from modules.mlaas_client import MLAASConfig, translate_segments_mlaas
+from modules.constants import LANGUAGE_CODES_AI
+from modules.translation_memory import get_translation_memory, translate_with_memory
+from modules.streaming_translation import StreamingTranslator
+from modules.telemetry import RunTelemetry, append_report_log, timed, write_report
+
+from modules.google_translator import translate_texts_google
+
+# Try importing optional translation engines
+try:
+    from deep_translator import GoogleTranslator
+    GOOGLE_TRANSLATE_AVAILABLE = True
+except ImportError:
+    GOOGLE_TRANSLATE_AVAILABLE = False
+
+try:
+    from modules.marian_translator import MarianTranslator, MARIAN_AVAILABLE
+except ImportError:
+    MARIAN_AVAILABLE = False
+
+
+def _lang_code(name: str, default: str = "auto") -> str:
+    """Convert a display name like 'English' to a language code like 'en'."""
+    if not name:
+        return default
+    for code, disp in LANGUAGE_CODES_AI:
+        if disp.lower() == name.lower():
+            return code
+    return name.lower()
+
+
+def format_timestamp(seconds: float) -> str:
+    """Format seconds to SRT timestamp: HH:MM:SS,mmm"""
+    h = int(seconds // 3600)
+    m = int((seconds % 3600) // 60)
+    s = int(seconds % 60)
+    ms = int((seconds - int(seconds)) * 1000)
+    return f"{h:02}:{m:02}:{s:02},{ms:03}"
+
+
+def save_as_srt(segments: list, output_path: str):
+    """Save transcription segments as an SRT file."""
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        for i, seg in enumerate(segments, start=1):
+            start = format_timestamp(seg["start"])
+            end = format_timestamp(seg["end"])
+            text = seg.get("text", "").strip()
+            f.write(f"{i}\n{start} --> {end}\n{text}\n\n")
+    print(f"Subtitles saved to {output_path}")
+
+
+class IncrementalSrtWriter:
+    """
+    Writes SRT cues as they are finalized during transcription.
+    
+    Cues are appended to "<path>.partial" and flushed after every batch, so a
+    crash or cancel leaves everything transcribed so far on disk. finalize()
+    atomically renames the partial file to the real path.
+    """
+    
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self.partial_path = f"{output_path}.partial"
+        self.cues = 0
+        self._keys = []
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        self._file = open(self.partial_path, "w", encoding="utf-8")
+    
+    def append(self, segments: list):
+        """Append finalized segments and flush them to disk."""
+        if self._file is None:
+            return
+        for seg in segments:
+            self.cues += 1
+            self._keys.append((seg["start"], seg["end"], seg.get("text", "").strip()))
+            self._file.write(
+                f"{self.cues}\n{format_timestamp(seg['start'])} --> {format_timestamp(seg['end'])}\n"
+                f"{seg.get('text', '').strip()}\n\n"
+            )
+        self._file.flush()
+    
+    def finalize(self, segments: list) -> bool:
+        """
+        Complete the file with the final segment list.
+        
+        If merging changed the segments (e.g. overlap deduplication), the
+        partial file is rewritten from the final list before the rename.
+        
+        Returns:
+            True if the SRT was written, False if there were no segments
+        """
+        self._close()
+        if not segments:
+            os.remove(self.partial_path)
+            return False
+        final_keys = [(seg["start"], seg["end"], seg.get("text", "").strip()) for seg in segments]
+        if final_keys != self._keys:
+            save_as_srt(segments, self.partial_path)
+        os.replace(self.partial_path, self.output_path)
+        print(f"Subtitles saved to {self.output_path}")
+        return True
+    
+    def abort(self):
+        """Close without renaming; the .partial file keeps the cues written so far."""
+        if self._file is not None:
+            self._close()
+            if self.cues:
+                print(f"Partial subtitles kept at {self.partial_path} ({self.cues} cues)")
+            else:
+                os.remove(self.partial_path)
+    
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def translate_segments_google(
+    segments: list, src_lang: str, dst_lang: str, use_memory: bool = True,
+    progress_callback: Optional[Callable[[int], None]] = None,
+) -> list:
+    """Translate segments using batched, concurrent Google Translate requests."""
+    if not GOOGLE_TRANSLATE_AVAILABLE:
+        print("Google Translate not available, returning original segments")
+        return segments
+
+    source = 'auto' if src_lang == 'auto' else src_lang
+    try:
+        # Handle Chinese variants: Google wants zh-CN / zh-TW
+        if src_lang == 'zh':
+            source = 'zh-CN'
+            if segments:
+                try:
+                    GoogleTranslator(source='zh-CN', target=dst_lang).translate(segments[0].get("text", "test")[:50])
+                except Exception:
+                    source = 'zh-TW'
+        # Validates the language pair before any work is queued
+        GoogleTranslator(source=source, target=dst_lang)
+    except Exception as e:
+        print(f"Error initializing translator: {e}")
+        return segments
+
+    texts = [seg.get("text", "").strip() for seg in segments]
+    results = translate_with_memory(
+        texts,
+        lambda pending: translate_texts_google(pending, source, dst_lang, progress_callback=progress_callback),
+        engine="google", model="", src=src_lang, dst=dst_lang,
+        memory=get_translation_memory() if use_memory else None,
+    )
+    return [
+        {"start": seg["start"], "end": seg["end"], "text": text}
+        for seg, text in zip(segments, results)
+    ]
+
+
+class ThroughputTracker:
+    """Track real-time processing speed for accurate ETA calculation."""
+    
+    def __init__(self):
+        self.start_time = time.time()
+        self._stage_start = time.time()
+        self._audio_processed = 0.0
+        self._total_audio = 0.0
+    
+    @property
+    def elapsed(self) -> float:
+        return time.time() - self.start_time
+    
+    def set_total_audio(self, duration: float):
+        self._total_audio = duration
+    
+    def update(self, audio_seconds_done: float):
+        """Update with amount of audio processed so far."""
+        self._audio_processed = audio_seconds_done
+    
+    def eta_string(self) -> str:
+        """Get formatted ETA string."""
+        elapsed = time.time() - self._stage_start
+        if self._audio_processed <= 0 or elapsed < 2:
+            return "Calculating..."
+        throughput = self._audio_processed / elapsed  # audio seconds per wall second
+        remaining_audio = max(0, self._total_audio - self._audio_processed)
+        if throughput > 0:
+            eta_seconds = remaining_audio / throughput
+            return time.strftime("%H:%M:%S", time.gmtime(eta_seconds))
+        return "Calculating..."
+    
+    def elapsed_string(self) -> str:
+        return time.strftime("%H:%M:%S", time.gmtime(self.elapsed))
+    
+    def start_stage(self):
+        self._stage_start = time.time()
+        self._audio_processed = 0.0
+
+
+@dataclass
+class PipelineResult:
+    """Outcome and stage timings of one subtitle job."""
+    source_path: str
+    srt_path: Optional[str] = None
+    translated_srt_path: Optional[str] = None
+    report_path: Optional[str] = None
+    language: Optional[str] = None
+    video_duration: float = 0.0
+    transcribe_time: float = 0.0
+    translate_time: float = 0.0
+    total_time: float = 0.0
+    segments: int = 0
+    cached: bool = False
+    error: Optional[str] = None
+    
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class SubtitlePipeline:
+    """
+    Runs the subtitle generation pipeline for one job.
+    
+    Progress is reported through optional plain callbacks so the same code
+    drives the Qt worker thread (via signals) and the command line.
+    """
+    
+    def __init__(
+        self,
+        args: SubtitleArgs,
+        status_callback: Optional[Callable[[str], None]] = None,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        duration_callback: Optional[Callable[[str], None]] = None,
+        ffmpeg_path: Optional[str] = None,
+        resources=None,
+    ):
+        """
+        Initialize SubtitlePipeline.
+        
+        Args:
+            args: Job settings
+            status_callback: Called with status text
+            progress_callback: Called with percent complete (0-100)
+            duration_callback: Called with elapsed / ETA text
+            ffmpeg_path: Path to ffmpeg (default: bundled or PATH)
+            resources: Stage gates shared with other running jobs
+                       (job_queue.StageResources); None runs ungated
+        """
+        self.args = args
+        self.resources = resources
+        # Bundled ffmpeg.exe when present, otherwise ffmpeg from PATH
+        if ffmpeg_path is None and os.path.exists(FFMPEG_PATH):
+            ffmpeg_path = FFMPEG_PATH
+        self.ffmpeg_path = ffmpeg_path
+        self.tracker = ThroughputTracker()
+        self._status_cb = status_callback
+        self._progress_cb = progress_callback
+        self._duration_cb = duration_callback
+    
+    def _status(self, text: str):
+        if self._status_cb:
+            self._status_cb(text)
+    
+    def _progress(self, value: int):
+        if self._progress_cb:
+            self._progress_cb(value)
+    
+    def _duration(self, text: str):
+        if self._duration_cb:
+            self._duration_cb(text)
+    
+    def _stage(self, stage: str, key: Optional[Hashable] = None):
+        """Hold a shared stage resource when running under a job queue."""
+        if self.resources is None:
+            return nullcontext()
+        return self.resources.stage(stage, key)
+    
+    def _text_translator(self, engine: str, src: str, dst: str) -> Optional[Callable[[list], list]]:
+        """
+        Text-level translate function for streaming and per-language translation.
+        
+        Returns:
+            Function mapping source lines to translations, or None when the
+            engine can't translate text incrementally (Whisper re-decodes audio)
+        """
+        use_memory = self.args.use_translation_memory
+        
+        def as_segments(texts):
+            return [{"start": 0.0, "end": 0.0, "text": t} for t in texts]
+        
+        if engine == "whisper":
+            return None
+        if engine == "mlaas":
+            mlaas_config = MLAASConfig.from_env()
+            return lambda texts: [
+                seg["text"] for seg in translate_segments_mlaas(
+                    as_segments(texts), dst, mlaas_config, use_memory=use_memory,
+                )
+            ]
+        if engine == "marian" and MARIAN_AVAILABLE:
+            translator = MarianTranslator(src, dst, backend=self.args.marian_backend)
+            state = {"loaded": None}
+            
+            def marian_translate(texts):
+                # Loaded on the streaming thread so transcription isn't held up
+                if state["loaded"] is None:
+                    state["loaded"] = translator.load_model()
+                if not state["loaded"]:
+                    raise RuntimeError("MarianMT model could not be loaded")
+                return translator.translate_batch(texts, use_memory=use_memory)
+            return marian_translate
+        return lambda texts: [
+            seg["text"] for seg in translate_segments_google(
+                as_segments(texts), src, dst, use_memory=use_memory,
+            )
+        ]
+    
+    def _translate_mixed(
+        self,
+        segments: List[dict],
+        default_src: str,
+        dst: str,
+        engine: str,
+    ) -> List[dict]:
+        """
+        Translate segments tagged with different languages (multilingual mode).
+        
+        Segments already in the target language are kept as they are; the
+        rest are grouped by language and sent to the engine one group at a time.
+        
+        Returns:
+            Translated segments aligned with segments
+        """
+        translated = [{"start": s["start"], "end": s["end"], "text": s.get("text", "")} for s in segments]
+        groups: dict = {}
+        for i, seg in enumerate(segments):
+            lang = seg.get("language") or default_src
+            if lang != dst and seg.get("text", "").strip():
+                groups.setdefault(lang, []).append(i)
+        
+        sent = sum(len(idx) for idx in groups.values())
+        detail = ", ".join(f"{lang}: {len(idx)}" for lang, idx in groups.items())
+        print(f"Multi-language translation: {len(segments) - sent} segments already in {dst}, "
+              f"{sent} sent to {engine}" + (f" ({detail})" if detail else ""))
+        
+        for lang, idx in groups.items():
+            translate_fn = self._text_translator(engine, lang, dst)
+            if translate_fn is None:
+                continue
+            texts = [segments[i]["text"].strip() for i in idx]
+            for i, text in zip(idx, translate_fn(texts)):
+                translated[i]["text"] = text
+        return translated
+    
+    def _save_report(self, report: dict, report_path: str, result: PipelineResult):
+        """Write the run report next to the SRT and append it to the telemetry log."""
+        if self.args.write_report and result.srt_path:
+            try:
+                write_report(report, report_path)
+                result.report_path = report_path
+            except OSError as e:
+                print(f"Warning: Could not write run report: {e}")
+        if self.args.telemetry_log:
+            try:
+                append_report_log(report, self.args.telemetry_log)
+            except OSError as e:
+                print(f"Warning: Could not append to telemetry log: {e}")
+    
+    def run(self) -> PipelineResult:
+        """
+        Process the job end to end.
+        
+        Returns:
+            PipelineResult with output paths and stage timings
+            
+        Raises:
+            Exception: Any pipeline error (the caller decides how to report it)
+        """
+        result = PipelineResult(source_path=self.args.source_path)
+        recognizer = None
+        stream = None
+        # Streaming assumes one source language; multilingual jobs translate per language at the end
+        stream_state = {
+            "src": None,
+            "disabled": not self.args.stream_translation or self.args.multilingual,
+        }
+        srt_writer = None
+        # Stage resources held across several steps (released in finally)
+        held = ExitStack()
+        job_temp_dir = None
+        cpu_farm = None
+        telemetry = RunTelemetry()
+        try:
+            src_code = _lang_code(self.args.src_language or "Auto", "auto")
+            dst_code = _lang_code(self.args.dst_language or "English", "en")
+            os.makedirs(TEMP_DIR, exist_ok=True)
+            
+            base = os.path.splitext(os.path.basename(self.args.source_path))[0]
+            out_dir = self.args.output_folder or os.path.dirname(self.args.source_path)
+            os.makedirs(out_dir, exist_ok=True)
+            orig_srt = os.path.join(out_dir, f"{base}.srt")
+            
+            # ── Step 1: Check cache / Load faster-whisper ───────
+            from modules.faster_whisper_engine import CUDA_AVAILABLE, FasterWhisperRecognizer
+            from modules.chunk_processor import ChunkProcessor
+            from modules.transcription_cache import TranscriptionCache, make_cache_key
+            
+            language_candidates = [
+                c.strip() for c in (self.args.language_candidates or "").split(",") if c.strip()
+            ]
+            if self.resources is not None:
+                # Concurrent jobs must not share chunk / WAV temp files
+                chunks_dir = os.path.join(TEMP_DIR, "chunks")
+                os.makedirs(chunks_dir, exist_ok=True)
+                job_temp_dir = tempfile.mkdtemp(prefix="job_", dir=chunks_dir)
+            
+            use_cpu_farm = self.args.cpu_farm and not CUDA_AVAILABLE
+            if self.args.cpu_farm and CUDA_AVAILABLE:
+                print("CPU farm ignored: CUDA is available")
+            
+            processor = ChunkProcessor(
+                chunk_duration=30.0,
+                temp_dir=job_temp_dir,
+                volume_boost=str(self.args.volume),
+                ffmpeg_path=self.ffmpeg_path,
+                multilingual=self.args.multilingual,
+                language_candidates=language_candidates or None,
+                # The CPU farm fans VAD-aligned chunks out to worker processes
+                use_chunking=use_cpu_farm,
+                telemetry=telemetry,
+            )
+            
+            def load_recognizer(load: bool = True):
+                loaded = FasterWhisperRecognizer(
+                    model_size=self.args.model_size,
+                    language=None if src_code == "auto" else src_code,
+                    batched=self.args.batched,
+                    load=load,
+                )
+                loaded.telemetry = telemetry
+                return loaded
+            
+            # Not loaded yet: a cache hit never needs the model, and the
+            # resolved compute type / beam size are part of the cache key
+            recognizer = load_recognizer(load=False)
+            
+            cache = None
+            cached = None
+            # Identifies this source + transcription settings (cache entry and resume journal)
+            try:
+                cache_key = make_cache_key(
+                    self.args.source_path,
+                    model_size=self.args.model_size,
+                    compute_type=recognizer.compute_type,
+                    beam_size=recognizer.beam_size,
+                    cpu_farm=bool(use_cpu_farm),
+                    language=src_code,
+                    volume=str(self.args.volume),
+                    batched=self.args.batched,
+                    use_chunking=processor.use_chunking,
+                    vad_chunking=processor.vad_chunking,
+                    vad_min_silence_ms=500,
+                    multilingual=processor.multilingual,
+                    language_candidates=processor.language_candidates,
+                )
+            except Exception as e:
+                print(f"Warning: Could not fingerprint source: {e}")
+                cache_key = None
+            if self.args.use_cache and cache_key:
+                try:
+                    cache = TranscriptionCache()
+                    cached = cache.get(cache_key)
+                except Exception as e:
+                    print(f"Warning: Transcription cache unavailable: {e}")
+            
+            transcribe_start = time.time()
+            
+            if cached:
+                # ── Step 2 (cached): Skip extraction + transcription ──
+                segs, detected, processor.total_duration = cached
+                print(f"Using cached transcription: {len(segs)} segments")
+                self._status("Using cached transcription ✓")
+                self._progress(85)
+            else:
+                if self.resources is not None:
+                    # Decode on a CPU slot while another job may still be transcribing
+                    self._status("Waiting to decode audio…")
+                    with self._stage("decode"):
+                        self._status("Decoding audio…")
+                        processor.prefetch_audio(self.args.source_path)
+                    self._status("Waiting for the Whisper model…")
+                # The gate is keyed like the model pool, so aliases of one
+                # model share it and other devices / compute types don't
+                held.enter_context(self._stage("transcribe", recognizer.pool_key))
+                
+                self._status("Loading faster-whisper model…")
+                self._progress(5)
+                
+                # With the CPU farm the workers hold the models; the parent
+                # only loads one if a chunk has to be retried in-process
+                if not use_cpu_farm:
+                    recognizer.ensure_loaded()
+                if use_cpu_farm:
+                    from modules.cpu_farm import acquire_cpu_farm
+                    # CPU recognizer: the tuned compute type, else int8
+                    cpu_farm = acquire_cpu_farm(
+                        recognizer.model_size,
+                        self.args.cpu_farm_workers,
+                        compute_type=recognizer.compute_type,
+                    )
+                    processor.cpu_farm = cpu_farm
+                
+                self._progress(15)
+                
+                # ── Step 2: Extract audio + Transcribe ──────────
+                self._status("Processing audio…")
+                self.tracker.start_stage()
+                
+                transcribe_start = time.time()
+                
+                def chunk_progress_cb(completed, total, stage, eta_seconds):
+                    if total > 0:
+                        # Map to 15-85% range
+                        progress = 15 + int((completed / total) * 70)
+                        self._progress(min(progress, 85))
+                    self._status(stage)
+                    if processor.total_duration > 0:
+                        audio_done = (completed / max(total, 1)) * processor.total_duration
+                        self.tracker.update(audio_done)
+                    eta = self.tracker.eta_string()
+                    elapsed = self.tracker.elapsed_string()
+                    self._duration(f"Elapsed: {elapsed} | ETA: {eta}")
+                
+                # Translate finalized segments while Whisper keeps decoding
+                engine = (self.args.translate_engine or "google").lower()
+                
+                # Cues are written to <name>.srt.partial as they are finalized
+                srt_writer = IncrementalSrtWriter(orig_srt)
+                
+                def on_segments(new_segs, language):
+                    nonlocal stream
+                    try:
+                        srt_writer.append(new_segs)
+                    except Exception as e:
+                        print(f"Warning: Could not append to {srt_writer.partial_path}: {e}")
+                    if stream_state["disabled"]:
+                        return
+                    try:
+                        if stream is None:
+                            src = language if (src_code == "auto" and language) else src_code
+                            translate_fn = None if src == dst_code else self._text_translator(engine, src, dst_code)
+                            if translate_fn is None:
+                                stream_state["disabled"] = True
+                                return
+                            stream = StreamingTranslator(translate_fn, telemetry=telemetry)
+                            stream_state["src"] = src
+                            print(f"Streaming translation started ({engine}, {src} → {dst_code})")
+                        stream.submit(new_segs)
+                    except Exception as e:
+                        print(f"Warning: Streaming translation disabled: {e}")
+                        stream_state["disabled"] = True
+                
+                segs, detected = processor.process_parallel(
+                    self.args.source_path,
+                    recognizer,
+                    progress_callback=chunk_progress_cb,
+                    segment_callback=on_segments,
+                    journal_key=cache_key if self.args.resume else None,
+                )
+                # The next job may use the model while this one saves and translates
+                held.close()
+                
+                if cache is not None and cache_key and segs:
+                    cache.put(cache_key, segs, detected, processor.total_duration)
+            
+            transcribe_time = time.time() - transcribe_start
+            video_duration = processor.total_duration
+            self.tracker.set_total_audio(video_duration)
+            
+            segments_count = len(segs or [])
+            result.video_duration = video_duration
+            result.transcribe_time = transcribe_time
+            result.segments = segments_count
+            result.cached = bool(cached)
+            
+            # Resolve auto-detected language
+            actual_src = detected if (src_code == "auto" and detected) else src_code
+            result.language = actual_src
+            
+            # ── Step 3: Save original transcription ─────────────
+            self._status("Saving transcription…")
+            self._progress(86)
+            with timed(telemetry, "write"):
+                if srt_writer is not None:
+                    if srt_writer.finalize(segs or []):
+                        result.srt_path = orig_srt
+                elif segs:
+                    save_as_srt(segs, orig_srt)
+                    result.srt_path = orig_srt
+            
+            # ── Step 4: Translate if needed ──────────────────────
+            translate_time = 0
+            engine = (self.args.translate_engine or "google").lower()
+            mixed = engine != "whisper" and any(s.get("language") for s in segs or [])
+            if mixed:
+                needs_translation = any(
+                    (s.get("language") or actual_src) != dst_code for s in segs
+                )
+            else:
+                needs_translation = actual_src != dst_code
+            if needs_translation:
+                self._status(f"Translating {actual_src} → {dst_code}…")
+                translate_start = time.time()
+                
+                translated_segments = None
+                # Whisper translation decodes audio again and needs the model
+                if engine == "whisper":
+                    held.enter_context(self._stage("transcribe", recognizer.pool_key))
+                else:
+                    held.enter_context(self._stage("translate"))
+                
+                try:
+                    if mixed:
+                        self._status(f"Translating non-{dst_code} segments…")
+                        translated_segments = self._translate_mixed(segs, actual_src, dst_code, engine)
+                    elif stream is not None and stream_state["src"] == actual_src:
+                        self._status(f"Finishing translation ({actual_src} → {dst_code})…")
+                        translated_segments = stream.finish(segs)
+                    elif engine == "mlaas":
+                        self._status(f"Translating via MLAAS API ({actual_src} → {dst_code})…")
+                        mlaas_config = MLAASConfig.from_env()
+                        translated_segments = translate_segments_mlaas(
+                            segs, dst_code, mlaas_config,
+                            progress_callback=lambda p: self._progress(86 + int(p * 0.13)),
+                            use_memory=self.args.use_translation_memory,
+                        )
+                    elif engine == "marian" and MARIAN_AVAILABLE:
+                        translator = MarianTranslator(actual_src, dst_code, backend=self.args.marian_backend)
+                        if translator.load_model():
+                            texts = [s.get("text", "") for s in segs]
+                            preds = translator.translate_batch(
+                                texts,
+                                progress_cb=lambda f: self._progress(86 + int((f or 0) * 13)),
+                                use_memory=self.args.use_translation_memory,
+                            )
+                            translated_segments = [
+                                {"start": s["start"], "end": s["end"], "text": preds[i] if i < len(preds) else s.get("text", "")}
+                                for i, s in enumerate(segs)
+                            ]
+                    elif engine == "whisper":
+                        # Use the audio already decoded by ChunkProcessor (decode now on a cache hit)
+                        audio_path = processor.audio
+                        if audio_path is None:
+                            audio_path = os.path.join(processor.temp_dir, "full_audio.wav")
+                            if not os.path.exists(audio_path):
+                                audio_path = processor.load_full_audio(self.args.source_path)
+                        if not isinstance(audio_path, str) or os.path.exists(audio_path):
+                            translated_segments = recognizer.translate(audio_path, dst_code) or []
+                        else:
+                            print("Warning: No extracted audio found for whisper translate")
+                            translated_segments = None
+                    else:
+                        # Default: Google Translate
+                        translated_segments = translate_segments_google(
+                            segs, actual_src, dst_code, use_memory=self.args.use_translation_memory,
+                            progress_callback=lambda p: self._progress(86 + int(p * 0.13)),
+                        )
+                except Exception as e:
+                    print(f"Translation error ({engine}): {e}")
+                    translated_segments = None
+                finally:
+                    held.close()
+                
+                translate_time = time.time() - translate_start
+                result.translate_time = translate_time
+                telemetry.add("translate", translate_time)
+                
+                if translated_segments:
+                    tgt_srt = os.path.join(out_dir, f"{base}_{dst_code}.srt")
+                    with timed(telemetry, "write"):
+                        save_as_srt(translated_segments, tgt_srt)
+                    result.translated_srt_path = tgt_srt
+            
+            # ── Step 5: Done ────────────────────────────────────
+            self._progress(100)
+            
+            total_time = time.time() - self.tracker.start_time
+            telemetry.set(
+                source=os.path.basename(self.args.source_path),
+                model_size=getattr(recognizer, "model_size", self.args.model_size),
+                device=getattr(recognizer, "device", None),
+                compute_type=getattr(recognizer, "compute_type", None),
+                beam_size=getattr(recognizer, "beam_size", None),
+                batched=self.args.batched,
+                chunked=processor.use_chunking or processor.multilingual,
+                multilingual=processor.multilingual,
+                cpu_farm=use_cpu_farm,
+                cached=bool(cached),
+                language=actual_src,
+                target_language=dst_code,
+                translate_engine=engine if needs_translation else None,
+                audio_duration=round(video_duration, 3),
+                segments=segments_count,
+                transcribe_time=round(transcribe_time, 3),
+                translate_time=round(translate_time, 3),
+            )
+            report = telemetry.report()
+            self._save_report(report, os.path.join(out_dir, f"{base}.report.json"), result)
+            
+            print(f"\n{'='*50}")
+            print(f"TASK COMPLETED")
+            print(f"{'='*50}")
+            print(f"Video Length:     {time.strftime('%H:%M:%S', time.gmtime(video_duration))} ({video_duration:.1f}s)")
+            print(f"Transcribe Time:  {time.strftime('%H:%M:%S', time.gmtime(transcribe_time))} ({transcribe_time:.1f}s)")
+            if translate_time > 0:
+                print(f"Translate Time:   {time.strftime('%H:%M:%S', time.gmtime(translate_time))} ({translate_time:.1f}s)")
+            print(f"Total Time:       {time.strftime('%H:%M:%S', time.gmtime(total_time))} ({total_time:.1f}s)")
+            print(f"Segments:         {segments_count}")
+            if report["rtf"] is not None:
+                print(f"Real-time Factor: {report['rtf']:.3f} ({1 / max(report['rtf'], 1e-6):.1f}x real time)")
+            if report["peak_rss_mb"] is not None or report["peak_vram_mb"] is not None:
+                memory = [f"RAM {report['peak_rss_mb']:.0f} MB"] if report["peak_rss_mb"] is not None else []
+                if report["peak_vram_mb"] is not None:
+                    memory.append(f"VRAM {report['peak_vram_mb']:.0f} MB")
+                print(f"Peak Memory:      {', '.join(memory)}")
+            print(f"{'='*50}\n")
+            
+            elapsed = self.tracker.elapsed_string()
+            self._duration(f"Completed in {elapsed}")
+            self._status("Completed ✓")
+            
+            result.total_time = total_time
+            return result
+        finally:
+            held.close()
+            telemetry.stop()
+            if cpu_farm is not None:
+                from modules.cpu_farm import release_cpu_farm
+                release_cpu_farm(cpu_farm)
+            if stream is not None:
+                # finish() already drained it on success; otherwise its output
+                # is unused, so don't wait for queued batches
+                stream.close(drain=False)
+            if srt_writer is not None:
+                srt_writer.abort()
+            # Hand the model back to the pool so the next job reuses it warm
+            if recognizer is not None:
+                recognizer.close()
+            if job_temp_dir:
+                shutil.rmtree(job_temp_dir, ignore_errors=True)
@@ -0,0 +1,205 @@
+"""
+Stage-level performance telemetry for DogeAutoSub.
+Collects timed spans (probe, decode, VAD, transcribe, split, translate,
+translate_stream, write), throughput figures and peak memory for one
+subtitle job, and writes them as a JSON report next to the output SRT and,
+optionally, as one line of a JSONL log for trend analysis across runs and
+machines.
+
+Spans with the same name add up (e.g. decode of every chunk). Spans can
+nest: transcribe includes split, and in chunked mode chunk decodes overlap
+transcription, so the spans do not have to add up to the total time.
+translate_stream is translation done while transcription runs; translate
+is the translation stage after it.
+"""
+
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Optional
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+try:
+    import torch
+    CUDA_AVAILABLE = torch.cuda.is_available()
+except ImportError:
+    CUDA_AVAILABLE = False
+
+REPORT_FORMAT_VERSION = 1
+
+# Seconds between memory samples
+MEMORY_SAMPLE_INTERVAL = 0.5
+
+STAGES = ("probe", "decode", "vad", "detect_language", "transcribe", "split", "translate",
+          "translate_stream", "write")
+
+
+def timed(telemetry: Optional["RunTelemetry"], name: str):
+    """Span context for optional telemetry (no-op when telemetry is None)."""
+    return telemetry.span(name) if telemetry is not None else nullcontext()
+
+
+def _os_peak_rss_mb() -> Optional[float]:
+    """Process-lifetime peak RSS from the OS (Unix only)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class RunTelemetry:
+    """Spans, counters and peak memory of one job (thread-safe)."""
+
+    def __init__(self, sample_memory: bool = True):
+        """
+        Initialize RunTelemetry.
+
+        Args:
+            sample_memory: Sample RSS / VRAM on a background thread while running
+        """
+        self.start_time = time.time()
+        self.spans: Dict[str, float] = {}
+        self.span_counts: Dict[str, int] = {}
+        self.metrics: Dict[str, object] = {}
+        self.peak_rss_mb: Optional[float] = None
+        self.peak_vram_mb: Optional[float] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._process = psutil.Process() if PSUTIL_AVAILABLE else None
+        if sample_memory:
+            self._sampler = threading.Thread(target=self._sample_loop, name="TelemetrySampler", daemon=True)
+            self._sampler.start()
+
+    # ── Recording ───────────────────────────────────────────────
+
+    @contextmanager
+    def span(self, name: str):
+        """Time a block and add it to the span of that name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float, count: int = 1):
+        """Add measured seconds to a span."""
+        with self._lock:
+            self.spans[name] = self.spans.get(name, 0.0) + seconds
+            self.span_counts[name] = self.span_counts.get(name, 0) + count
+
+    def set(self, **metrics):
+        """Record job facts and counters (audio duration, segments, engine, ...)."""
+        with self._lock:
+            self.metrics.update(metrics)
+
+    # ── Memory ──────────────────────────────────────────────────
+
+    def _sample_once(self):
+        rss = None
+        if self._process is not None:
+            try:
+                rss = self._process.memory_info().rss / (1024 * 1024)
+            except Exception:
+                rss = None
+        vram = None
+        if CUDA_AVAILABLE:
+            try:
+                # Device-wide: CTranslate2 allocations are invisible to torch's allocator stats
+                free, total = torch.cuda.mem_get_info()
+                vram = (total - free) / (1024 * 1024)
+            except Exception:
+                vram = None
+        with self._lock:
+            if rss is not None:
+                self.peak_rss_mb = max(self.peak_rss_mb or 0.0, rss)
+            if vram is not None:
+                self.peak_vram_mb = max(self.peak_vram_mb or 0.0, vram)
+
+    def _sample_loop(self):
+        while not self._stop.is_set():
+            self._sample_once()
+            self._stop.wait(MEMORY_SAMPLE_INTERVAL)
+
+    def stop(self):
+        """Stop memory sampling (takes a last sample)."""
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join(timeout=2)
+            self._sampler = None
+        self._sample_once()
+
+    # ── Report ──────────────────────────────────────────────────
+
+    def report(self) -> dict:
+        """Build the report dict (stops memory sampling)."""
+        self.stop()
+        total = time.time() - self.start_time
+        with self._lock:
+            spans = {name: round(seconds, 3) for name, seconds in self.spans.items()}
+            counts = dict(self.span_counts)
+            metrics = dict(self.metrics)
+            peak_rss, peak_vram = self.peak_rss_mb, self.peak_vram_mb
+
+        rss_source = "sampled"
+        if peak_rss is None:
+            peak_rss = _os_peak_rss_mb()
+            rss_source = "process_lifetime" if peak_rss is not None else None
+
+        audio = float(metrics.get("audio_duration") or 0.0)
+        segments = int(metrics.get("segments") or 0)
+        transcribe = self.spans.get("transcribe", 0.0)
+        return {
+            "version": REPORT_FORMAT_VERSION,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.start_time)),
+            "host": {
+                "node": platform.node(),
+                "platform": platform.platform(),
+                "python": platform.python_version(),
+                "cpu_count": os.cpu_count(),
+            },
+            **metrics,
+            "total_time": round(total, 3),
+            "spans": spans,
+            "span_counts": counts,
+            # Processing seconds per second of audio (lower is faster)
+            "rtf": round(total / audio, 4) if audio > 0 else None,
+            "transcribe_rtf": round(transcribe / audio, 4) if audio > 0 and transcribe else None,
+            "segments_per_sec": round(segments / transcribe, 2) if transcribe > 0 else None,
+            "peak_rss_mb": round(peak_rss, 1) if peak_rss is not None else None,
+            "peak_rss_source": rss_source,
+            "peak_vram_mb": round(peak_vram, 1) if peak_vram is not None else None,
+        }
+
+
+def write_report(report: dict, path: str):
+    """Write a report as JSON (atomically)."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+_log_lock = threading.Lock()
+
+
+def append_report_log(report: dict, path: str):
+    """Append a report as one line of a JSONL log."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    line = json.dumps(report, ensure_ascii=False, separators=(",", ":")) + "\n"
+    with _log_lock:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
@@ -0,0 +1,154 @@
+"""
+Persistent transcription cache for DogeAutoSub.
+Stores transcribed segments (with word timings) on disk so re-running the same
+video with a different target language or translation engine skips audio
+extraction and transcription entirely.
+
+Entries are keyed by a fast content fingerprint of the source file plus every
+setting that changes the transcription (model, language, volume boost, VAD).
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import List, Optional, Tuple
+
+# Bump when the stored segment format changes
+CACHE_FORMAT_VERSION = 1
+
+# Bytes hashed from the start, middle and end of the file
+FINGERPRINT_SAMPLE_BYTES = 1 << 20
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "cache", "transcripts"
+)
+
+
+def file_fingerprint(path: str, sample_bytes: int = FINGERPRINT_SAMPLE_BYTES) -> str:
+    """
+    Fast content fingerprint of a media file.
+
+    Hashes the file size plus three samples (start, middle, end) instead of the
+    whole file, so multi-GB videos fingerprint in milliseconds.
+
+    Args:
+        path: Path to the file
+        sample_bytes: Bytes read at each sample position
+
+    Returns:
+        Hex digest string
+    """
+    size = os.path.getsize(path)
+    h = hashlib.sha256()
+    h.update(str(size).encode("ascii"))
+    with open(path, "rb") as f:
+        if size <= sample_bytes * 3:
+            h.update(f.read())
+        else:
+            for offset in (0, size // 2 - sample_bytes // 2, size - sample_bytes):
+                f.seek(offset)
+                h.update(f.read(sample_bytes))
+    return h.hexdigest()
+
+
+def make_cache_key(source_path: str, **settings) -> str:
+    """
+    Build a cache key from the source fingerprint and transcription settings.
+
+    Args:
+        source_path: Path to the source media file
+        **settings: Anything that changes the transcription output
+                    (model_size, language, volume, VAD settings, ...)
+
+    Returns:
+        Hex digest string
+    """
+    payload = {
+        "version": CACHE_FORMAT_VERSION,
+        "fingerprint": file_fingerprint(source_path),
+        "settings": settings,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class TranscriptionCache:
+    """On-disk cache of transcription results, one JSON file per key."""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = 200):
+        """
+        Initialize TranscriptionCache.
+
+        Args:
+            cache_dir: Directory for cache files (default: modules/cache/transcripts)
+            max_entries: Oldest entries are pruned beyond this count
+        """
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_entries = max_entries
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Tuple[List[dict], Optional[str], float]]:
+        """
+        Look up a cached transcription.
+
+        Returns:
+            Tuple of (segments, language, duration) or None on miss
+        """
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if entry.get("version") != CACHE_FORMAT_VERSION:
+                return None
+            # Touch so pruning keeps recently used entries
+            os.utime(path, None)
+            return entry["segments"], entry.get("language"), entry.get("duration", 0.0)
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable transcription cache entry {path}: {e}")
+            return None
+
+    def put(self, key: str, segments: List[dict], language: Optional[str], duration: float = 0.0):
+        """Store a transcription result (written atomically)."""
+        entry = {
+            "version": CACHE_FORMAT_VERSION,
+            "created": time.time(),
+            "language": language,
+            "duration": duration,
+            "segments": segments,
+        }
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Warning: Could not write transcription cache: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self._prune()
+
+    def _prune(self):
+        """Remove least recently used entries beyond max_entries."""
+        try:
+            files = [
+                os.path.join(self.cache_dir, name)
+                for name in os.listdir(self.cache_dir)
+                if name.endswith(".json")
+            ]
+        except OSError:
+            return
+        if len(files) <= self.max_entries:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
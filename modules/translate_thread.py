@@ -1,11 +1,10 @@
 import os
+import threading
+
 from PySide6.QtCore import QThread, Signal
 
-try:
-    from deep_translator import GoogleTranslator
-    GOOGLE_TRANSLATE_AVAILABLE = True
-except ImportError:
-    GOOGLE_TRANSLATE_AVAILABLE = False
+from modules.translation_memory import get_translation_memory, translate_with_memory
+from modules.google_translator import GOOGLE_TRANSLATE_AVAILABLE, translate_texts_google
 
 try:
     from modules.marian_translator import MarianTranslator, MARIAN_AVAILABLE
@@ -37,69 +36,129 @@ def _read_file_content(filepath: str) -> str:
 
 def _translate_srt_content(
     srt_text: str, src_lang: str, dst_lang: str, engine: str,
-    api_key: str, progress_cb=None,
+    api_key: str, progress_cb=None, marian_backend: str = "transformers",
 ) -> str:
     """Translate SRT content preserving timestamps and structure."""
     import re as _re
     blocks = _re.split(r"\n\n+", srt_text.strip())
-    translated_blocks = []
-    total = len(blocks)
     
-    for i, block in enumerate(blocks):
+    # Collect every cue text first so the engine sees one batch
+    parsed = []
+    texts = []
+    for block in blocks:
         lines = block.strip().split("\n")
         if len(lines) >= 3:
             # lines[0] = index, lines[1] = timestamp, lines[2:] = text
-            text_lines = "\n".join(lines[2:])
-            translated = _translate_single(text_lines, src_lang, dst_lang, engine, api_key)
-            translated_blocks.append(f"{lines[0]}\n{lines[1]}\n{translated}")
+            parsed.append((lines[0], lines[1], len(texts)))
+            texts.append("\n".join(lines[2:]))
         else:
-            translated_blocks.append(block)
-        
-        if progress_cb and total > 0:
-            progress_cb(int(((i + 1) / total) * 100))
+            parsed.append((block, None, None))
+    
+    translated = _translate_texts(texts, src_lang, dst_lang, engine, progress_cb, marian_backend)
+    
+    translated_blocks = []
+    for head, timestamp, text_idx in parsed:
+        if text_idx is None:
+            translated_blocks.append(head)
+        else:
+            translated_blocks.append(f"{head}\n{timestamp}\n{translated[text_idx]}")
     
     return "\n\n".join(translated_blocks)
 
 
 def _translate_plain_content(
     text: str, src_lang: str, dst_lang: str, engine: str,
-    api_key: str, progress_cb=None,
+    api_key: str, progress_cb=None, marian_backend: str = "transformers",
 ) -> str:
-    """Translate plain text content line by line."""
-    lines = [l for l in text.split("\n") if l.strip()]
-    translated_lines = []
-    total = len(lines)
+    """Translate plain text content line by line (one batch for the whole file)."""
+    lines = [l.strip() for l in text.split("\n") if l.strip()]
+    return "\n".join(_translate_texts(lines, src_lang, dst_lang, engine, progress_cb, marian_backend))
+
+
+# ── Engine dispatch ─────────────────────────────────────────────
+
+# One loaded MarianTranslator per (src, dst, backend), reused across files
+_marian_translators = {}
+_marian_lock = threading.Lock()
+
+
+def _get_marian_translator(src: str, dst: str, backend: str = "transformers"):
+    """
+    Return a loaded MarianTranslator for the pair.
     
-    for i, line in enumerate(lines):
-        translated = _translate_single(line.strip(), src_lang, dst_lang, engine, api_key)
-        translated_lines.append(translated)
-        
-        if progress_cb and total > 0:
-            progress_cb(int(((i + 1) / total) * 100))
+    Only loaded translators are cached, so a transient failure (e.g. a
+    download timeout) is retried on the next file.
     
-    return "\n".join(translated_lines)
+    Raises:
+        RuntimeError: If the model can't be loaded
+    """
+    key = (src, dst, backend)
+    with _marian_lock:
+        if key not in _marian_translators:
+            translator = MarianTranslator(src, dst, backend=backend)
+            if not translator.load_model():
+                raise RuntimeError(f"MarianMT model for {src} → {dst} could not be loaded")
+            _marian_translators[key] = translator
+        return _marian_translators[key]
 
 
-def _translate_single(text: str, src: str, dst: str, engine: str, api_key: str = "") -> str:
-    """Translate a single text string using the selected engine."""
-    if not text.strip():
-        return text
+def _translate_texts(texts: list, src: str, dst: str, engine: str, progress_cb=None,
+                     marian_backend: str = "transformers") -> list:
+    """
+    Translate text units in one batch using the selected engine.
+    
+    Args:
+        texts: Text units (an SRT cue's text or a plain-text line)
+        src: Source language code ("auto" to detect)
+        dst: Target language code
+        engine: "mlaas", "marian" or "google"
+        progress_cb: Optional callback with percent complete (0-100)
+        marian_backend: MarianMT backend ("transformers" or "ctranslate2")
+    
+    Returns:
+        Translations aligned with texts (untranslated text on failure)
+        
+    Raises:
+        RuntimeError: If the MarianMT model can't be loaded
+    """
+    if not texts:
+        return []
     
     if engine == "mlaas":
-        from modules.mlaas_client import translate_text_mlaas, MLAASConfig
+        from modules.mlaas_client import ANTHROPIC_MODEL_TRANSLATION, translate_texts_mlaas, MLAASConfig
         config = MLAASConfig.from_env()
-        return translate_text_mlaas(text, dst, config)
+        # The numbered batch format is one line per unit: send cue lines
+        # separately and rejoin them so multi-line cues keep their breaks
+        cue_lines = [t.split("\n") for t in texts]
+        flat = [line for lines in cue_lines for line in lines]
+        flat_results = translate_with_memory(
+            flat, lambda pending: translate_texts_mlaas(pending, dst, config, progress_callback=progress_cb),
+            engine="mlaas", model=ANTHROPIC_MODEL_TRANSLATION, src="auto", dst=dst.lower(),
+            memory=get_translation_memory(),
+        )
+        results, pos = [], 0
+        for lines in cue_lines:
+            results.append("\n".join(flat_results[pos:pos + len(lines)]))
+            pos += len(lines)
     elif engine == "marian" and MARIAN_AVAILABLE:
-        translator = MarianTranslator(src, dst)
-        if translator.load_model():
-            results = translator.translate_batch([text], batch_size=1)
-            return results[0] if results else text
-        return text
+        translator = _get_marian_translator(src, dst, marian_backend)
+        results = translator.translate_batch(
+            texts,
+            progress_cb=(lambda f: progress_cb(int((f or 0) * 100))) if progress_cb else None,
+        )
+    elif GOOGLE_TRANSLATE_AVAILABLE:
+        results = translate_with_memory(
+            texts,
+            lambda pending: translate_texts_google(pending, src, dst, progress_callback=progress_cb),
+            engine="google", model="", src=src, dst=dst,
+            memory=get_translation_memory(),
+        )
     else:
-        # Google Translate
-        if GOOGLE_TRANSLATE_AVAILABLE:
-            return GoogleTranslator(source=src if src != "auto" else "auto", target=dst).translate(text) or text
-        return text
+        return list(texts)
+    
+    if progress_cb:
+        progress_cb(100)
+    return results
 
 
 class TranslateFileThread(QThread):
@@ -111,12 +170,13 @@ class TranslateFileThread(QThread):
     progress_update = Signal(int)
     
     def __init__(self, filepath: str, src_lang: str, dst_lang: str,
-                 engine: str):
+                 engine: str, marian_backend: str = "transformers"):
         super().__init__()
         self.filepath = filepath
         self.src_lang = src_lang
         self.dst_lang = dst_lang
         self.engine = engine
+        self.marian_backend = marian_backend
     
     def run(self):
         try:
@@ -138,12 +198,12 @@ class TranslateFileThread(QThread):
             if ext == ".srt":
                 result = _translate_srt_content(
                     content, self.src_lang, self.dst_lang,
-                    self.engine, "", on_progress,
+                    self.engine, "", on_progress, self.marian_backend,
                 )
             else:
                 result = _translate_plain_content(
                     content, self.src_lang, self.dst_lang,
-                    self.engine, "", on_progress,
+                    self.engine, "", on_progress, self.marian_backend,
                 )
             
             self.finished.emit(result)
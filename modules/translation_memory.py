@@ -0,0 +1,259 @@
+"""
+Persistent translation memory for DogeAutoSub.
+An SQLite table of previously translated lines shared by every translation
+engine (Google, MLAAS, MarianMT), so recurring lines in game trailers and
+weekly meetings are translated once and then served locally.
+
+Entries are keyed by (engine, model, source language, target language,
+normalized text). The least recently used entries are pruned beyond
+max_entries. Within a job, identical lines are deduplicated so each unique
+string reaches the engine at most once.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_DB_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "cache", "translation_memory.sqlite3"
+)
+
+# Pruning runs every PRUNE_INTERVAL inserts rather than after every write
+PRUNE_INTERVAL = 500
+
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER is 999 on older builds
+_LOOKUP_CHUNK = 500
+
+_HORIZONTAL_WHITESPACE = re.compile(r"[ \t]+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize a source line for translation memory lookup.
+
+    Applies Unicode NFC and collapses runs of spaces and tabs; line breaks
+    (multi-line SRT cues), case and punctuation are kept because they
+    change the translation.
+    """
+    lines = unicodedata.normalize("NFC", text or "").splitlines()
+    return "\n".join(_HORIZONTAL_WHITESPACE.sub(" ", line).strip() for line in lines).strip()
+
+
+class TranslationMemory:
+    """SQLite-backed translation memory with LRU size limit (thread-safe)."""
+
+    def __init__(self, db_path: Optional[str] = None, max_entries: int = 200_000):
+        """
+        Initialize TranslationMemory.
+
+        Args:
+            db_path: SQLite file (default: modules/cache/translation_memory.sqlite3)
+            max_entries: Least recently used entries are pruned beyond this count
+        """
+        self.db_path = db_path or DEFAULT_DB_PATH
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._inserts_since_prune = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS translations (
+                engine      TEXT NOT NULL,
+                model       TEXT NOT NULL,
+                src         TEXT NOT NULL,
+                dst         TEXT NOT NULL,
+                source_text TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                last_used   REAL NOT NULL,
+                PRIMARY KEY (engine, model, src, dst, source_text)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations (last_used)"
+        )
+        self._conn.commit()
+
+    def get_many(self, engine: str, model: str, src: str, dst: str,
+                 texts: List[str]) -> Dict[str, str]:
+        """
+        Look up translations for normalized texts.
+
+        Returns:
+            Dict mapping each found normalized text to its translation
+        """
+        found: Dict[str, str] = {}
+        unique = list(dict.fromkeys(texts))
+        if not unique:
+            return found
+
+        with self._lock:
+            for i in range(0, len(unique), _LOOKUP_CHUNK):
+                chunk = unique[i:i + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT source_text, translation FROM translations "
+                    f"WHERE engine=? AND model=? AND src=? AND dst=? "
+                    f"AND source_text IN ({placeholders})",
+                    (engine, model, src, dst, *chunk),
+                ).fetchall()
+                found.update(rows)
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE translations SET last_used=? "
+                    "WHERE engine=? AND model=? AND src=? AND dst=? AND source_text=?",
+                    [(now, engine, model, src, dst, text) for text in found],
+                )
+                self._conn.commit()
+
+            self.hits += len(found)
+            self.misses += len(unique) - len(found)
+        return found
+
+    def put_many(self, engine: str, model: str, src: str, dst: str,
+                 pairs: Dict[str, str]):
+        """Store translations keyed by normalized source text."""
+        if not pairs:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations "
+                "(engine, model, src, dst, source_text, translation, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(engine, model, src, dst, text, translation, now)
+                 for text, translation in pairs.items()],
+            )
+            self._conn.commit()
+            self._inserts_since_prune += len(pairs)
+            if self._inserts_since_prune >= PRUNE_INTERVAL:
+                self._prune_locked()
+
+    def _prune_locked(self):
+        """Delete least recently used rows beyond max_entries (lock held)."""
+        self._inserts_since_prune = 0
+        count = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        excess = count - self.max_entries
+        if excess <= 0:
+            return
+        self._conn.execute(
+            "DELETE FROM translations WHERE rowid IN "
+            "(SELECT rowid FROM translations ORDER BY last_used ASC LIMIT ?)",
+            (excess,),
+        )
+        self._conn.commit()
+
+    def clear(self):
+        """Delete every stored translation."""
+        with self._lock:
+            self._conn.execute("DELETE FROM translations")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """Entry count and hit/miss counters for this process."""
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        return {"entries": count, "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# ── Shared instance ──────────────────────────────────────────────
+
+_memory: Optional[TranslationMemory] = None
+_memory_failed = False
+_memory_lock = threading.Lock()
+
+
+def get_translation_memory() -> Optional[TranslationMemory]:
+    """Return the process-wide translation memory, or None if it can't be opened."""
+    global _memory, _memory_failed
+    with _memory_lock:
+        if _memory is None and not _memory_failed:
+            try:
+                _memory = TranslationMemory()
+            except Exception as e:
+                _memory_failed = True
+                print(f"Warning: Translation memory unavailable: {e}")
+        return _memory
+
+
+def translate_with_memory(
+    texts: List[str],
+    translate_fn: Callable[[List[str]], List[str]],
+    engine: str,
+    model: str,
+    src: str,
+    dst: str,
+    memory: Optional[TranslationMemory] = None,
+) -> List[str]:
+    """
+    Translate texts through the translation memory with in-job deduplication.
+
+    Identical lines (after normalization) are sent to translate_fn once, as
+    the original text of their first occurrence; the normalized form is only
+    the memory key. Lines already in memory are not sent at all. New
+    translations are stored afterwards. Empty lines pass through unchanged.
+
+    Args:
+        texts: Source lines
+        translate_fn: Engine call mapping a list of unique lines to translations
+        engine: Engine name ("google", "mlaas", "marian", ...)
+        model: Engine model identifier ("" if the engine has none)
+        src: Source language code ("auto" if unknown)
+        dst: Target language code
+        memory: TranslationMemory to consult, or None for deduplication only
+
+    Returns:
+        Translations aligned with texts
+    """
+    normalized = [normalize_text(t) for t in texts]
+    originals: Dict[str, str] = {}
+    for text, norm in zip(texts, normalized):
+        if norm:
+            originals.setdefault(norm, text.strip())
+    unique = list(originals)
+
+    known: Dict[str, str] = {}
+    if memory is not None and unique:
+        try:
+            known = memory.get_many(engine, model, src, dst, unique)
+        except Exception as e:
+            print(f"Warning: Translation memory lookup failed: {e}")
+
+    pending = [t for t in unique if t not in known]
+    if pending:
+        results = translate_fn([originals[t] for t in pending])
+        fresh = {
+            text: out for text, out in zip(pending, results)
+            if out and out.strip()
+        }
+        known.update(fresh)
+
+        if memory is not None:
+            # Engines hand back the source line on failure; don't remember those
+            learned = {text: out for text, out in fresh.items() if normalize_text(out) != text}
+            try:
+                memory.put_many(engine, model, src, dst, learned)
+            except Exception as e:
+                print(f"Warning: Translation memory update failed: {e}")
+
+    if len(texts) > 1 and len(texts) > len(pending):
+        print(f"Translation memory: {len(pending)} of {len(texts)} lines sent to {engine} "
+              f"({len(unique) - len(pending)} remembered, {len(texts) - len(unique)} duplicates/empty)")
+
+    return [known.get(norm, text) if norm else text for text, norm in zip(texts, normalized)]
@@ -379,7 +379,7 @@ def generate_manifest(
 
     skip_dirs = {".venv", "__pycache__", ".git", "build", "dist",
                  "DOCs", "releases", "temp", "models", "CUDA", "ffmpeg",
-                 "marian_cache", "QTDesign", ".no_exist", "snapshots"}
+                 "marian_cache", "cache", "QTDesign", ".no_exist", "snapshots"}
     skip_files = {"updater_config.json", "mlaas_config.json",
                   "Thumbs.db", ".gitignore", "serve_updates.py",
                   "build.bat", "DogeAutoSubApp.spec", "requirements.txt",
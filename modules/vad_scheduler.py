@@ -0,0 +1,139 @@
+"""
+VAD-aligned chunk scheduling for DogeAutoSub.
+Runs the Silero VAD bundled with faster-whisper once over decoded audio and
+places chunk boundaries inside silences, so chunks never split a word and
+need neither overlap nor deduplication.
+"""
+
+from typing import List, Optional, Tuple
+
+try:
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+    VAD_AVAILABLE = True
+except ImportError:
+    VAD_AVAILABLE = False
+
+SAMPLE_RATE = 16000
+
+# Speech closer to a cut than this is padded into the chunk
+SPEECH_PAD_SECONDS = 0.2
+
+
+def get_speech_regions(
+    audio,
+    min_silence_duration_ms: int = 500,
+    sampling_rate: int = SAMPLE_RATE,
+) -> List[Tuple[float, float]]:
+    """
+    Detect speech regions with Silero VAD.
+
+    Args:
+        audio: 1-D float32 samples at sampling_rate
+        min_silence_duration_ms: Minimum silence that separates two regions
+        sampling_rate: Sample rate of audio
+
+    Returns:
+        List of (start, end) tuples in seconds, sorted by start
+    """
+    if not VAD_AVAILABLE:
+        raise ImportError("faster-whisper VAD is not available")
+
+    options = VadOptions(min_silence_duration_ms=min_silence_duration_ms)
+    timestamps = get_speech_timestamps(audio, vad_options=options, sampling_rate=sampling_rate)
+    return [(ts["start"] / sampling_rate, ts["end"] / sampling_rate) for ts in timestamps]
+
+
+def plan_vad_chunks(
+    speech_regions: List[Tuple[float, float]],
+    total_duration: float,
+    target_duration: float = 30.0,
+    max_duration: Optional[float] = None,
+) -> List[Tuple[float, float]]:
+    """
+    Group speech regions into chunks whose boundaries fall inside silences.
+
+    Regions are accumulated until adding the next one would push the chunk
+    past target_duration; the cut is then placed in the middle of the silence
+    between the two regions. Leading and trailing silence is dropped. A single
+    region longer than max_duration is hard-split, which is the only case where
+    a cut can land inside speech.
+
+    Args:
+        speech_regions: (start, end) speech regions in seconds, sorted by start
+        total_duration: Total audio duration in seconds
+        target_duration: Preferred chunk length in seconds
+        max_duration: Hard limit for a chunk (default: 2x target_duration)
+
+    Returns:
+        List of (start, end) chunk bounds in seconds
+    """
+    if not speech_regions:
+        return []
+
+    if max_duration is None:
+        max_duration = target_duration * 2
+
+    # Split regions that are too long to fit any chunk
+    regions: List[Tuple[float, float]] = []
+    for start, end in speech_regions:
+        while end - start > max_duration:
+            regions.append((start, start + max_duration))
+            start += max_duration
+        regions.append((start, end))
+
+    chunks: List[Tuple[float, float]] = []
+    chunk_start = max(0.0, regions[0][0] - SPEECH_PAD_SECONDS)
+    prev_end = regions[0][1]
+
+    for start, end in regions[1:]:
+        if end - chunk_start > target_duration:
+            # Cut in the middle of the silence between prev_end and start
+            cut = prev_end + (start - prev_end) / 2 if start > prev_end else start
+            chunks.append((chunk_start, cut))
+            chunk_start = cut
+        prev_end = max(prev_end, end)
+
+    chunk_end = min(prev_end + SPEECH_PAD_SECONDS, total_duration) if total_duration > 0 else prev_end
+    chunks.append((chunk_start, max(chunk_end, prev_end)))
+    return chunks
+
+
+def plan_speech_windows(
+    speech_regions: List[Tuple[float, float]],
+    window_seconds: float = 30.0,
+    max_windows: int = 3,
+) -> List[List[Tuple[float, float]]]:
+    """
+    Pack the first speech regions into windows of speech for language detection.
+
+    Each window is a list of (start, end) pieces whose durations add up to
+    window_seconds (the last window may be shorter); silence between pieces
+    is left out so every window is a full encoder input of speech.
+
+    Args:
+        speech_regions: (start, end) speech regions in seconds, sorted by start
+        window_seconds: Seconds of speech per window (Whisper's input is 30 s)
+        max_windows: Maximum number of windows
+
+    Returns:
+        Up to max_windows windows, in time order
+    """
+    windows: List[List[Tuple[float, float]]] = []
+    current: List[Tuple[float, float]] = []
+    filled = 0.0
+
+    for start, end in speech_regions:
+        while end - start > 1e-3 and len(windows) < max_windows:
+            take = min(end - start, window_seconds - filled)
+            current.append((start, start + take))
+            filled += take
+            start += take
+            if filled >= window_seconds - 1e-3:
+                windows.append(current)
+                current, filled = [], 0.0
+        if len(windows) >= max_windows:
+            break
+
+    if current and len(windows) < max_windows:
+        windows.append(current)
+    return windows
@@ -0,0 +1,48 @@
+"""Tests for batched Google translation (stub translator, no network)."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import google_translator
+from modules.google_translator import pack_char_batches, translate_texts_google
+from modules.translation_memory import translate_with_memory
+
+
+class StubTranslator:
+    """Stands in for deep_translator.GoogleTranslator; keeps line breaks like the web endpoint."""
+
+    payloads = []
+
+    def __init__(self, source="auto", target="en"):
+        self.target = target
+
+    def translate(self, text):
+        StubTranslator.payloads.append(text)
+        return "\n".join(f"[{self.target}] {line}" for line in text.split("\n"))
+
+
+def _use_stub(monkeypatch):
+    StubTranslator.payloads = []
+    monkeypatch.setattr(google_translator, "GoogleTranslator", StubTranslator, raising=False)
+    monkeypatch.setattr(google_translator, "GOOGLE_TRANSLATE_AVAILABLE", True)
+
+
+def test_multi_line_cue_gets_its_own_batch():
+    texts = ["one", "two\nlines", "three"]
+    assert pack_char_batches(texts) == [[0], [1], [2]]
+
+
+def test_two_line_cue_round_trips(monkeypatch):
+    _use_stub(monkeypatch)
+    texts = ["First cue", "Top line\nBottom line", "Last cue"]
+
+    out = translate_with_memory(
+        texts,
+        lambda pending: translate_texts_google(pending, "en", "vi", max_workers=1),
+        engine="google", model="", src="en", dst="vi", memory=None,
+    )
+
+    assert out == ["[vi] First cue", "[vi] Top line\n[vi] Bottom line", "[vi] Last cue"]
+    assert "Top line\nBottom line" in StubTranslator.payloads
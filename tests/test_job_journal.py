@@ -0,0 +1,78 @@
+"""Tests for the resumable transcription journal."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.job_journal import JobJournal
+
+HEADER = {"mode": "chunked", "chunks": [[0.0, 30.0], [30.0, 60.0], [60.0, 90.0]]}
+
+
+def _segments(start):
+    return [{"start": start, "end": start + 2.0, "text": f"cue at {start}"}]
+
+
+def test_resume_returns_finished_chunks(tmp_path):
+    journal = JobJournal("job", journal_dir=str(tmp_path))
+    assert journal.open(HEADER).chunks == {}
+    journal.record_chunk(0, _segments(0.0), "en")
+    journal.record_chunk(2, _segments(60.0), "en")
+    journal.close()
+
+    state = JobJournal("job", journal_dir=str(tmp_path)).open(HEADER)
+
+    assert sorted(state.chunks) == [0, 2]
+    assert state.chunks[2]["segments"] == _segments(60.0)
+    assert state.language == "en"
+
+
+def test_single_pass_segments_resume_in_order(tmp_path):
+    journal = JobJournal("job", journal_dir=str(tmp_path))
+    journal.open({"mode": "single"})
+    journal.record_segments(_segments(0.0), "vi")
+    journal.record_segments(_segments(5.0), "vi")
+    journal.close()
+
+    state = JobJournal("job", journal_dir=str(tmp_path)).open({"mode": "single"})
+
+    assert state.segments == _segments(0.0) + _segments(5.0)
+
+
+def test_different_header_starts_over(tmp_path):
+    journal = JobJournal("job", journal_dir=str(tmp_path))
+    journal.open(HEADER)
+    journal.record_chunk(0, _segments(0.0), "en")
+    journal.close()
+
+    state = JobJournal("job", journal_dir=str(tmp_path)).open(dict(HEADER, chunks=[[0.0, 45.0]]))
+
+    assert state.chunks == {}
+
+
+def test_torn_last_line_is_ignored_and_appends_continue(tmp_path):
+    journal = JobJournal("job", journal_dir=str(tmp_path))
+    journal.open(HEADER)
+    journal.record_chunk(0, _segments(0.0), "en")
+    journal.close()
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"type": "chunk", "index": 1, "segm')
+
+    resumed = JobJournal("job", journal_dir=str(tmp_path))
+    assert sorted(resumed.open(HEADER).chunks) == [0]
+    resumed.record_chunk(1, _segments(30.0), "en")
+    resumed.close()
+
+    state = JobJournal("job", journal_dir=str(tmp_path)).open(HEADER)
+    assert sorted(state.chunks) == [0, 1]
+
+
+def test_complete_removes_the_journal(tmp_path):
+    journal = JobJournal("job", journal_dir=str(tmp_path))
+    journal.open(HEADER)
+    journal.record_chunk(0, _segments(0.0), "en")
+    journal.complete()
+
+    assert not os.path.exists(journal.path)
+    assert JobJournal("job", journal_dir=str(tmp_path)).open(HEADER).chunks == {}
@@ -0,0 +1,103 @@
+"""Tests for MLAAS translation batching and rate limiting (no network)."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import mlaas_client
+from modules.mlaas_client import (
+    TRANSLATION_LINE_OVERHEAD_TOKENS,
+    AdaptiveConcurrency,
+    MLAASConfig,
+    MLAASIncompleteBatchError,
+    _translate_batch_splitting,
+    estimate_tokens,
+    pack_token_batches,
+)
+
+
+def test_wide_scripts_cost_a_token_per_character():
+    assert estimate_tokens("hello world!") == 3
+    assert estimate_tokens("こんにちは") == 5
+
+
+def test_batches_keep_order_and_respect_the_item_limit():
+    texts = [f"line {i}" for i in range(10)]
+
+    batches = pack_token_batches(texts, max_items=4)
+
+    assert batches == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+
+def test_batches_respect_the_input_token_budget():
+    texts = ["x" * 40] * 6  # 10 tokens + line overhead each
+    cost = estimate_tokens(texts[0]) + TRANSLATION_LINE_OVERHEAD_TOKENS
+
+    batches = pack_token_batches(texts, input_budget=cost * 2, output_budget=10_000)
+
+    assert batches == [[0, 1], [2, 3], [4, 5]]
+
+
+def test_line_over_budget_gets_a_batch_of_its_own():
+    batches = pack_token_batches(["short", "y" * 4000, "short"], input_budget=100)
+
+    assert batches == [[0], [1], [2]]
+
+
+def test_short_response_is_split_and_retried(monkeypatch):
+    sizes = []
+
+    def fake_batch(texts, target_language, config, pool=None, strict=False):
+        sizes.append(len(texts))
+        if len(texts) > 2:
+            raise MLAASIncompleteBatchError("short response")
+        return [t.upper() for t in texts]
+
+    monkeypatch.setattr(mlaas_client, "_translate_batch_mlaas", fake_batch)
+    texts = ["a", "b", "c", "d", "e"]
+
+    out = _translate_batch_splitting(texts, "vi", MLAASConfig(), None, AdaptiveConcurrency())
+
+    assert out == ["A", "B", "C", "D", "E"]
+    assert sizes == [5, 2, 3, 1, 2]
+
+
+def test_rate_limit_halves_the_limit_down_to_the_minimum():
+    limiter = AdaptiveConcurrency(initial=8, minimum=2, maximum=8)
+
+    for expected in (4, 2, 2):
+        limiter.acquire()
+        limiter.release(rate_limited=True)
+        assert limiter.limit == expected
+
+
+def test_limit_grows_by_one_after_a_streak_of_successes():
+    limiter = AdaptiveConcurrency(initial=2, minimum=1, maximum=3, increase_after=4)
+
+    for _ in range(3):
+        limiter.acquire()
+        limiter.release()
+    assert limiter.limit == 2
+
+    limiter.acquire()
+    limiter.release()
+    assert limiter.limit == 3
+
+    for _ in range(8):
+        limiter.acquire()
+        limiter.release()
+    assert limiter.limit == 3
+
+
+def test_rate_limit_resets_the_success_streak():
+    limiter = AdaptiveConcurrency(initial=4, minimum=1, maximum=8, increase_after=2)
+    limiter.acquire()
+    limiter.release()
+    limiter.acquire()
+    limiter.release(rate_limited=True)
+    assert limiter.limit == 2
+
+    limiter.acquire()
+    limiter.release()
+    assert limiter.limit == 2
@@ -0,0 +1,95 @@
+"""Tests for the process-wide WhisperModel pool (stub model, nothing is loaded)."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import model_pool
+from modules.model_pool import WhisperModelPool
+
+
+class StubModel:
+    """Stands in for faster_whisper.WhisperModel; counts loads."""
+
+    loads = 0
+
+    def __init__(self, model_size, **kwargs):
+        StubModel.loads += 1
+        self.model_size = model_size
+
+
+def _pool(monkeypatch, **kwargs) -> WhisperModelPool:
+    StubModel.loads = 0
+    monkeypatch.setattr(model_pool, "WhisperModel", StubModel, raising=False)
+    monkeypatch.setattr(model_pool, "BatchedInferencePipeline", lambda model: model, raising=False)
+    monkeypatch.setattr(model_pool, "FASTER_WHISPER_AVAILABLE", True)
+    pool = WhisperModelPool(**kwargs)
+    # No background reaper; tests call evict_idle themselves
+    monkeypatch.setattr(pool, "_ensure_reaper", lambda: None)
+    return pool
+
+
+def test_same_key_shares_one_model(monkeypatch):
+    pool = _pool(monkeypatch)
+    a = pool.acquire("tiny", "cpu", "int8")
+    b = pool.acquire("tiny", "cpu", "int8")
+
+    assert a is b
+    assert a.refcount == 2
+    assert StubModel.loads == 1
+
+
+def test_other_compute_type_loads_separately(monkeypatch):
+    pool = _pool(monkeypatch)
+    a = pool.acquire("tiny", "cpu", "int8")
+    b = pool.acquire("tiny", "cpu", "float32")
+
+    assert a is not b
+    assert StubModel.loads == 2
+
+
+def test_released_model_stays_warm_until_idle_timeout(monkeypatch):
+    pool = _pool(monkeypatch, idle_timeout=60.0)
+    entry = pool.acquire("tiny", "cpu", "int8")
+    pool.release(entry)
+
+    assert entry.refcount == 0
+    assert pool.evict_idle(now=entry.last_used + 30) == 0
+    assert pool.acquire("tiny", "cpu", "int8") is entry
+    assert StubModel.loads == 1
+
+    pool.release(entry)
+    assert pool.evict_idle(now=entry.last_used + 61) == 1
+    assert pool.stats() == {}
+
+
+def test_model_in_use_is_never_evicted(monkeypatch):
+    pool = _pool(monkeypatch, idle_timeout=1.0)
+    entry = pool.acquire("tiny", "cpu", "int8")
+
+    assert pool.evict_idle(now=entry.last_used + 3600) == 0
+    pool.clear()
+    assert entry.model is not None
+
+
+def test_zero_idle_timeout_unloads_on_release(monkeypatch):
+    pool = _pool(monkeypatch, idle_timeout=0)
+    entry = pool.acquire("tiny", "cpu", "int8")
+    pool.release(entry)
+
+    assert entry.model is None
+    assert pool.stats() == {}
+
+
+def test_budget_evicts_least_recently_used_idle_model(monkeypatch):
+    pool = _pool(monkeypatch, memory_budget_gb={"cuda": 10.0})
+    old = pool.acquire("small", "cuda", "float16", memory_gb=4.0)
+    new = pool.acquire("medium", "cuda", "float16", memory_gb=4.0)
+    pool.release(old)
+    pool.release(new)
+    old.last_used, new.last_used = 100.0, 200.0
+
+    pool.acquire("large-v3", "cuda", "float16", memory_gb=5.0)
+
+    assert set(pool.stats()) == {"medium/cuda/float16", "large-v3/cuda/float16"}
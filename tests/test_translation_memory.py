@@ -0,0 +1,97 @@
+"""Tests for the SQLite translation memory and in-job deduplication."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import translation_memory
+from modules.translation_memory import TranslationMemory, normalize_text, translate_with_memory
+
+
+class RecordingEngine:
+    """Translation engine stub: uppercases lines and records every call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [t.upper() for t in texts]
+
+
+@pytest.fixture
+def memory(tmp_path):
+    tm = TranslationMemory(db_path=str(tmp_path / "tm.sqlite3"))
+    yield tm
+    tm.close()
+
+
+def _translate(texts, engine, memory, dst="vi"):
+    return translate_with_memory(texts, engine, engine="google", model="", src="en", dst=dst, memory=memory)
+
+
+def test_normalize_collapses_spaces_but_keeps_line_breaks():
+    assert normalize_text("  Hello \t  world  ") == "Hello world"
+    assert normalize_text("Top  line \n  Bottom line") == "Top line\nBottom line"
+    assert normalize_text("Hello") != normalize_text("hello")
+
+
+def test_duplicates_reach_the_engine_once():
+    engine = RecordingEngine()
+
+    out = _translate(["hi there", "bye", "hi  there", "", "bye"], engine, memory=None)
+
+    assert engine.calls == [["hi there", "bye"]]
+    assert out == ["HI THERE", "BYE", "HI THERE", "", "BYE"]
+
+
+def test_remembered_lines_are_not_sent_again(memory):
+    _translate(["one", "two"], RecordingEngine(), memory)
+    engine = RecordingEngine()
+
+    out = _translate(["two", "three", "one"], engine, memory)
+
+    assert engine.calls == [["three"]]
+    assert out == ["TWO", "THREE", "ONE"]
+
+
+def test_memory_is_keyed_by_language_pair(memory):
+    _translate(["one"], RecordingEngine(), memory, dst="vi")
+    engine = RecordingEngine()
+
+    _translate(["one"], engine, memory, dst="ja")
+
+    assert engine.calls == [["one"]]
+
+
+def test_untranslated_echo_is_not_remembered(memory):
+    _translate(["OK"], RecordingEngine(), memory)
+
+    assert memory.stats()["entries"] == 0
+
+
+def test_multi_line_cue_is_sent_with_its_line_break(memory):
+    engine = RecordingEngine()
+
+    out = _translate(["Top line\nBottom line"], engine, memory)
+
+    assert engine.calls == [["Top line\nBottom line"]]
+    assert out == ["TOP LINE\nBOTTOM LINE"]
+    assert memory.get_many("google", "", "en", "vi", ["Top line\nBottom line"])
+
+
+def test_least_recently_used_entries_are_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr(translation_memory, "PRUNE_INTERVAL", 1)
+    tm = TranslationMemory(db_path=str(tmp_path / "tm.sqlite3"), max_entries=2)
+    try:
+        tm.put_many("google", "", "en", "vi", {"old": "OLD"})
+        tm.put_many("google", "", "en", "vi", {"used": "USED"})
+        tm._conn.execute("UPDATE translations SET last_used = 1 WHERE source_text = 'old'")
+        tm.put_many("google", "", "en", "vi", {"new": "NEW"})
+
+        assert sorted(tm.get_many("google", "", "en", "vi", ["old", "used", "new"])) == ["new", "used"]
+    finally:
+        tm.close()
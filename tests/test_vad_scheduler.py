@@ -0,0 +1,69 @@
+"""Tests for VAD chunk and language window planning (precomputed speech regions, no VAD model)."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.vad_scheduler import SPEECH_PAD_SECONDS, plan_speech_windows, plan_vad_chunks
+
+
+def _inside_speech(t, regions):
+    return any(start < t < end for start, end in regions)
+
+
+def test_no_speech_gives_no_chunks():
+    assert plan_vad_chunks([], total_duration=60.0) == []
+
+
+def test_cuts_fall_in_the_middle_of_silences():
+    regions = [(1.0, 5.0), (6.0, 20.0), (22.0, 35.0), (40.0, 50.0)]
+
+    chunks = plan_vad_chunks(regions, total_duration=60.0, target_duration=30.0)
+
+    assert chunks == [(1.0 - SPEECH_PAD_SECONDS, 21.0), (21.0, 50.0 + SPEECH_PAD_SECONDS)]
+    for _, cut in chunks[:-1]:
+        assert not _inside_speech(cut, regions)
+
+
+def test_chunks_are_contiguous_and_cover_all_speech():
+    regions = [(t, t + 4.0) for t in range(0, 300, 6)]
+
+    chunks = plan_vad_chunks(regions, total_duration=300.0, target_duration=30.0)
+
+    assert all(a[1] == b[0] for a, b in zip(chunks, chunks[1:]))
+    assert chunks[0][0] <= regions[0][0]
+    assert chunks[-1][1] >= regions[-1][1]
+    assert all(end - start <= 30.0 + SPEECH_PAD_SECONDS for start, end in chunks)
+    for _, cut in chunks[:-1]:
+        assert not _inside_speech(cut, regions)
+
+
+def test_region_longer_than_max_duration_is_hard_split():
+    chunks = plan_vad_chunks([(0.0, 100.0)], total_duration=120.0, target_duration=30.0)
+
+    assert chunks == [(0.0, 60.0), (60.0, 100.0 + SPEECH_PAD_SECONDS)]
+
+
+def test_trailing_pad_stops_at_the_end_of_the_audio():
+    chunks = plan_vad_chunks([(2.0, 9.95)], total_duration=10.0)
+
+    assert chunks == [(2.0 - SPEECH_PAD_SECONDS, 10.0)]
+
+
+def test_speech_windows_skip_silence_and_fill_30_seconds():
+    regions = [(10.0, 25.0), (40.0, 60.0), (100.0, 200.0)]
+
+    windows = plan_speech_windows(regions, window_seconds=30.0, max_windows=3)
+
+    assert windows == [
+        [(10.0, 25.0), (40.0, 55.0)],
+        [(55.0, 60.0), (100.0, 125.0)],
+        [(125.0, 155.0)],
+    ]
+
+
+def test_speech_windows_keep_a_short_last_window():
+    windows = plan_speech_windows([(0.0, 40.0)], window_seconds=30.0, max_windows=3)
+
+    assert windows == [[(0.0, 30.0)], [(30.0, 40.0)]]